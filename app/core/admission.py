@@ -0,0 +1,213 @@
+# app/core/admission.py
+"""
+적응형 동시 실행 제한(admission control) + 과부하 시 즉시 거절(load shedding)
+- AIMD: 지연/오류 없이 한도까지 사용 중이면 한도 +1/limit, 지연(목표 초과)·오류 시 한도 × backoff
+- 한도 초과 요청은 짧은 대기열(최대 ADMISSION_MAX_QUEUE, ADMISSION_QUEUE_TIMEOUT_MS)만 허용하고
+  그 외에는 OverloadedError → retry-after가 담긴 BaseResponse로 응답 (security_layer)
+- AI 검증 / 문제 생성 각각 별도 limiter
+"""
+
+import math
+import threading
+from contextlib import contextmanager
+from time import monotonic, perf_counter
+
+from app.core.config import (
+    ADMISSION_CONTROL_ENABLED,
+    ADMISSION_MAX_QUEUE,
+    ADMISSION_QUEUE_TIMEOUT_MS,
+    AI_VERIFY_CONCURRENCY_INITIAL,
+    AI_VERIFY_CONCURRENCY_MIN,
+    AI_VERIFY_CONCURRENCY_MAX,
+    AI_VERIFY_LATENCY_TARGET_MS,
+    GENERATION_CONCURRENCY_INITIAL,
+    GENERATION_CONCURRENCY_MIN,
+    GENERATION_CONCURRENCY_MAX,
+    GENERATION_LATENCY_TARGET_MS,
+)
+from app.core.metrics import counter, gauge
+from app.core.tracing import record_span
+
+ADMISSION_LIMIT = gauge("captcha_admission_limit", "현재 동시 실행 한도", ("resource",))
+ADMISSION_INFLIGHT = gauge("captcha_admission_inflight", "실행 중인 작업 수", ("resource",))
+ADMISSION_QUEUE_DEPTH = gauge("captcha_admission_queue_depth", "슬롯 대기 중인 요청 수", ("resource",))
+ADMISSION_SHED = counter("captcha_admission_shed_total", "과부하로 거절된 요청 수", ("resource",))
+
+# 한도 감소 비율 (multiplicative decrease)
+BACKOFF_RATIO = 0.9
+# 지연 EWMA 가중치 (retry-after 추정용)
+LATENCY_EWMA_ALPHA = 0.2
+
+
+class OverloadedError(Exception):
+    """동시 실행 한도 + 대기열이 모두 찬 경우"""
+
+    def __init__(self, resource: str, retry_after: int):
+        super().__init__(f"{resource} overloaded")
+        self.resource = resource
+        self.retry_after = retry_after
+
+
+class AdmissionPermit:
+    """acquire()가 돌려주는 실행 권한. 결과가 과부하 신호(타임아웃 등)면 drop() 호출"""
+
+    __slots__ = ("dropped",)
+
+    def __init__(self):
+        self.dropped = False
+
+    def drop(self):
+        self.dropped = True
+
+
+class AdaptiveLimiter:
+    """
+    AIMD 기반 동시 실행 제한기 (sync 엔드포인트 → threadpool 스레드에서 사용)
+    """
+
+    def __init__(
+        self,
+        name: str,
+        initial_limit: int,
+        min_limit: int,
+        max_limit: int,
+        latency_target_ms: float,
+        max_queue: int = ADMISSION_MAX_QUEUE,
+        queue_timeout_ms: float = ADMISSION_QUEUE_TIMEOUT_MS,
+    ):
+        self.name = name
+        self.limit = float(initial_limit)
+        self.min_limit = min_limit
+        self.max_limit = max_limit
+        self.latency_target_ms = latency_target_ms
+        self.max_queue = max_queue
+        self.queue_timeout = queue_timeout_ms / 1000
+
+        self.inflight = 0
+        self.waiting = 0
+        self.ewma_latency_ms = 0.0
+        self._last_decrease = 0.0
+        self._cond = threading.Condition()
+
+        ADMISSION_LIMIT.set(self.limit, resource=name)
+
+    # -----------------------
+    # 슬롯 획득 / 반환 단계 (외부 스케줄러(FairScheduler)도 사용)
+    # *_locked는 lock() 보유 상태에서 호출
+    # -----------------------
+    def lock(self) -> threading.Condition:
+        """슬롯 상태를 보호하는 lock (with limiter.lock(): ...)"""
+        return self._cond
+
+    def has_slot_locked(self) -> bool:
+        return self.inflight < max(int(self.limit), self.min_limit)
+
+    def _retry_after(self) -> int:
+        return max(1, math.ceil(max(self.ewma_latency_ms, self.latency_target_ms) / 1000))
+
+    def shed(self):
+        """거절 메트릭 기록 후 OverloadedError (lock 없이 호출 가능)"""
+        ADMISSION_SHED.inc(resource=self.name)
+        raise OverloadedError(self.name, self._retry_after())
+
+    def admit_locked(self):
+        self.inflight += 1
+        ADMISSION_INFLIGHT.set(self.inflight, resource=self.name)
+
+    def finish_locked(self, latency_ms: float, dropped: bool):
+        """실행 종료: inflight 감소 + 지연 / 과부하 신호로 한도 조정"""
+        saturated = self.inflight >= int(self.limit)
+        self.inflight -= 1
+
+        if self.ewma_latency_ms == 0.0:
+            self.ewma_latency_ms = latency_ms
+        else:
+            self.ewma_latency_ms += LATENCY_EWMA_ALPHA * (latency_ms - self.ewma_latency_ms)
+
+        now = monotonic()
+        if dropped or latency_ms > self.latency_target_ms:
+            # 같은 혼잡 구간의 연속 신호로 한도가 급락하지 않도록 목표 지연당 1회만 감소
+            if now - self._last_decrease >= self.latency_target_ms / 1000:
+                self.limit = max(self.min_limit, self.limit * BACKOFF_RATIO)
+                self._last_decrease = now
+        elif saturated:
+            self.limit = min(self.max_limit, self.limit + 1 / self.limit)
+
+        ADMISSION_LIMIT.set(self.limit, resource=self.name)
+        ADMISSION_INFLIGHT.set(self.inflight, resource=self.name)
+
+    def _enter(self):
+        with self._cond:
+            if not self.has_slot_locked():
+                if self.waiting >= self.max_queue:
+                    self.shed()
+
+                self.waiting += 1
+                ADMISSION_QUEUE_DEPTH.set(self.waiting, resource=self.name)
+                try:
+                    admitted = self._cond.wait_for(self.has_slot_locked, timeout=self.queue_timeout)
+                finally:
+                    self.waiting -= 1
+                    ADMISSION_QUEUE_DEPTH.set(self.waiting, resource=self.name)
+                if not admitted:
+                    self.shed()
+
+            self.admit_locked()
+
+    def _exit(self, latency_ms: float, dropped: bool):
+        with self._cond:
+            self.finish_locked(latency_ms, dropped)
+            self._cond.notify()
+
+    @contextmanager
+    def acquire(self):
+        """
+        with LIMITER.acquire() as permit:
+            ... (과부하 신호면 permit.drop())
+        블록 내 예외도 과부하 신호로 간주한다.
+        """
+        if not ADMISSION_CONTROL_ENABLED:
+            yield AdmissionPermit()
+            return
+
+        wait_started = perf_counter()
+        self._enter()
+        started = perf_counter()
+        record_span(f"{self.name}_slot_wait", wait_started, started - wait_started)
+
+        permit = AdmissionPermit()
+        try:
+            yield permit
+        except BaseException:
+            permit.drop()
+            raise
+        finally:
+            self._exit((perf_counter() - started) * 1000, permit.dropped)
+
+    def snapshot(self):
+        with self._cond:
+            return {
+                "resource": self.name,
+                "limit": round(self.limit, 2),
+                "inflight": self.inflight,
+                "waiting": self.waiting,
+                "ewma_latency_ms": round(self.ewma_latency_ms, 2),
+            }
+
+
+# 프로세스 전역 limiter
+AI_VERIFY_LIMITER = AdaptiveLimiter(
+    "ai_verify",
+    AI_VERIFY_CONCURRENCY_INITIAL,
+    AI_VERIFY_CONCURRENCY_MIN,
+    AI_VERIFY_CONCURRENCY_MAX,
+    AI_VERIFY_LATENCY_TARGET_MS,
+)
+
+GENERATION_LIMITER = AdaptiveLimiter(
+    "problem_generation",
+    GENERATION_CONCURRENCY_INITIAL,
+    GENERATION_CONCURRENCY_MIN,
+    GENERATION_CONCURRENCY_MAX,
+    GENERATION_LATENCY_TARGET_MS,
+)
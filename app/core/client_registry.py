@@ -0,0 +1,188 @@
+# app/core/client_registry.py
+"""
+고객사(tenant) 레지스트리 - 요청 경로에서 I/O 없이 client_id → 정책 조회
+- 원본: CLIENT_REGISTRY_PATH (JSON 파일 또는 SQLite), 미설정 시 코드 내 기본 목록
+- 메모리 인덱스(dict)를 통째로 교체하는 방식의 버전 관리 hot reload (폴링 스레드)
+- 기본 정책과의 병합은 로드 시점에 끝내 두므로 조회는 dict 조회 1회
+- 미등록 client_id는 negative cache에 기록 (반복 조회 시 로그/메트릭 중복 방지, reload 시 초기화)
+
+JSON 형식:
+    {"version": 3, "clients": {"cust_alpha": {"status": "Active", "rate_per_sec": 50, ...}}}
+SQLite 형식:
+    CREATE TABLE clients (client_id TEXT PRIMARY KEY, status TEXT NOT NULL, policy TEXT);
+    -- policy: 정책 JSON, 버전은 PRAGMA user_version
+"""
+
+import json
+import os
+import sqlite3
+import threading
+from collections import OrderedDict
+from time import monotonic, sleep
+from typing import Dict, Any, Optional, Tuple
+
+from app.core.config import (
+    CLIENT_REGISTRY_PATH,
+    CLIENT_REGISTRY_RELOAD_SECONDS,
+    CLIENT_REGISTRY_NEGATIVE_CACHE_SIZE,
+    CLIENT_REGISTRY_NEGATIVE_TTL_SECONDS,
+)
+from app.core.metrics import counter, gauge
+from app.services.logging_service import log_event, LogLevel
+
+REGISTRY_CLIENTS = gauge("captcha_client_registry_clients", "레지스트리에 등록된 고객사 수")
+REGISTRY_RELOADS = counter("captcha_client_registry_reloads_total", "레지스트리 reload 결과", ("result",))
+REGISTRY_UNKNOWN = counter("captcha_client_registry_unknown_total", "처음 조회된 미등록 client_id 수")
+
+
+class RegistrySnapshot:
+    """한 번 만들어지면 변경하지 않는 레지스트리 버전 (교체만 함)"""
+
+    __slots__ = ("version", "clients")
+
+    def __init__(self, version: Any, clients: Dict[str, Dict[str, Any]]):
+        self.version = version
+        self.clients = clients
+
+
+def _load_json(path: str) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    with open(path, "r", encoding="utf-8") as f:
+        data = json.load(f)
+    return data.get("version"), data["clients"]
+
+
+def _load_sqlite(path: str) -> Tuple[Any, Dict[str, Dict[str, Any]]]:
+    conn = sqlite3.connect(f"file:{path}?mode=ro", uri=True)
+    try:
+        version = conn.execute("PRAGMA user_version").fetchone()[0]
+        clients = {}
+        for client_id, status, policy in conn.execute("SELECT client_id, status, policy FROM clients"):
+            clients[client_id] = {**json.loads(policy or "{}"), "status": status}
+        return version, clients
+    finally:
+        conn.close()
+
+
+class ClientRegistry:
+
+    def __init__(
+        self,
+        defaults: Dict[str, Any],
+        builtin_clients: Dict[str, Dict[str, Any]],
+        path: Optional[str] = CLIENT_REGISTRY_PATH,
+        reload_seconds: float = CLIENT_REGISTRY_RELOAD_SECONDS,
+    ):
+        self.defaults = defaults
+        self.builtin_clients = builtin_clients
+        self.path = path
+        self.reload_seconds = reload_seconds
+
+        self._file_stamp: Optional[Tuple[int, int]] = None
+        self._negative: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+        self._reload_thread: Optional[threading.Thread] = None
+
+        self._snapshot = RegistrySnapshot("builtin", self._index(builtin_clients))
+        if path:
+            self.reload()
+        REGISTRY_CLIENTS.set(len(self._snapshot.clients))
+
+    # -----------------------
+    # 로드 / 교체
+    # -----------------------
+    def _index(self, clients: Dict[str, Dict[str, Any]]) -> Dict[str, Dict[str, Any]]:
+        return {client_id: {**self.defaults, **policy} for client_id, policy in clients.items()}
+
+    def reload(self, force: bool = False) -> bool:
+        """
+        원본 파일이 바뀌었으면 새 인덱스를 만들어 교체. 교체했으면 True.
+        실패 시 기존 인덱스를 유지한다.
+        """
+        try:
+            stat = os.stat(self.path)
+            stamp = (stat.st_mtime_ns, stat.st_size)
+            if not force and stamp == self._file_stamp:
+                return False
+
+            if self.path.endswith((".db", ".sqlite", ".sqlite3")):
+                version, clients = _load_sqlite(self.path)
+            else:
+                version, clients = _load_json(self.path)
+            snapshot = RegistrySnapshot(version if version is not None else stamp[0], self._index(clients))
+        except Exception as e:
+            REGISTRY_RELOADS.inc(result="error")
+            log_event(
+                "CLIENT_REGISTRY_RELOAD_FAILED",
+                {"path": self.path, "error": repr(e), "version": self._snapshot.version},
+                level=LogLevel.ERROR
+            )
+            return False
+
+        with self._lock:
+            self._file_stamp = stamp
+            self._snapshot = snapshot      # 참조 교체는 원자적 → 조회 측은 lock 불필요
+            self._negative.clear()
+
+        REGISTRY_RELOADS.inc(result="ok")
+        REGISTRY_CLIENTS.set(len(snapshot.clients))
+        log_event("CLIENT_REGISTRY_RELOADED", {"version": snapshot.version, "clients": len(snapshot.clients)})
+        return True
+
+    def _ensure_reloader(self):
+        if not self.path or self.reload_seconds <= 0 or self._reload_thread is not None:
+            return
+
+        with self._lock:
+            if self._reload_thread is not None:
+                return
+            self._reload_thread = threading.Thread(
+                target=self._reload_loop,
+                name="client-registry-reload",
+                daemon=True
+            )
+            self._reload_thread.start()
+
+    def _reload_loop(self):
+        while True:
+            sleep(self.reload_seconds)
+            self.reload()
+
+    # -----------------------
+    # 조회 (요청 경로, I/O 없음)
+    # -----------------------
+    @property
+    def version(self) -> Any:
+        return self._snapshot.version
+
+    def get(self, client_id: str) -> Optional[Dict[str, Any]]:
+        """등록된 고객사의 정책 (기본값 병합 완료), 미등록이면 None"""
+        self._ensure_reloader()
+        policy = self._snapshot.clients.get(client_id)
+        if policy is None:
+            self._remember_unknown(client_id)
+        return policy
+
+    def policy(self, client_id: str) -> Dict[str, Any]:
+        """미등록이면 기본 정책"""
+        return self.get(client_id) or self.defaults
+
+    def is_registered(self, client_id: str) -> bool:
+        return self.get(client_id) is not None
+
+    def _remember_unknown(self, client_id: str):
+        now = monotonic()
+        with self._lock:
+            expires_at = self._negative.get(client_id)
+            if expires_at is not None and expires_at > now:
+                return
+            self._negative[client_id] = now + CLIENT_REGISTRY_NEGATIVE_TTL_SECONDS
+            self._negative.move_to_end(client_id)
+            if len(self._negative) > CLIENT_REGISTRY_NEGATIVE_CACHE_SIZE:
+                self._negative.popitem(last=False)
+
+        REGISTRY_UNKNOWN.inc()
+        log_event(
+            "UNKNOWN_CLIENT_ID",
+            {"client_id": client_id[:64], "registry_version": self._snapshot.version},
+            level=LogLevel.WARNING
+        )
@@ -0,0 +1,189 @@
+# app/core/completion_token.py
+"""
+COMPLETED 세션에 발급하는 서명 토큰 (고객사 서버 간 /verify 용)
+- 형식: "v1.<kid>.<payload(base64url JSON)>.<signature(base64url HMAC-SHA256)>"
+- payload: {"sid": session_id, "cid": client_id, "exp": 만료(unix sec), "nonce": ...}
+- 키 회전: COMPLETION_TOKEN_KEYS의 첫 키로 서명, 나머지 키는 검증만 허용
+- 고객사 정책에 token_keys가 있으면 해당 고객사 키로 서명 (kid = "<client_id>/<kid>")
+  → 고객사 서버가 자체적으로 서명 검증 가능
+- 1회용: 검증에 성공한 nonce는 만료 시각까지 재사용 불가
+  (기본은 워커 단위 replay set, 여러 워커 / 노드에서 보장하려면 REPLAY_STORE_BACKEND=redis)
+→ 세션 저장소 조회 없이 어느 노드에서든 해시 1회로 검증 가능
+"""
+
+import base64
+import hashlib
+import hmac
+import json
+import secrets
+from time import time
+from typing import Dict, Any, Optional, Tuple
+
+from app.core.config import (
+    COMPLETION_TOKEN_KEYS,
+    COMPLETION_TOKEN_TTL_SECONDS,
+    COMPLETION_TOKEN_SINGLE_USE,
+    WORKER_COUNT,
+)
+from app.core.metrics import counter
+from app.core.replay_store import create_replay_set, is_shared
+from app.services.client_validation import CLIENT_REGISTRY
+from app.services.logging_service import log_event, LogLevel
+
+TOKEN_VERSION = "v1"
+
+TOKEN_VERIFICATIONS = counter(
+    "captcha_completion_token_verifications_total",
+    "완료 토큰 검증 결과 (result=valid|malformed|unknown_kid|bad_signature|expired|replayed)",
+    ("result",),
+)
+
+
+class CompletionTokenError(ValueError):
+    """토큰 검증 실패 (reason: malformed / unknown_kid / bad_signature / expired / replayed)"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+# -----------------------
+# 서명 키
+# -----------------------
+if COMPLETION_TOKEN_KEYS:
+    _KEYS: Dict[str, bytes] = {kid: secret.encode("utf-8") for kid, secret in COMPLETION_TOKEN_KEYS}
+    _SIGNING_KID = COMPLETION_TOKEN_KEYS[0][0]
+else:
+    # 키 미설정 시 프로세스 전용 임시 키 (다른 워커/노드에서는 검증 불가)
+    _SIGNING_KID = "ephemeral"
+    _KEYS = {_SIGNING_KID: secrets.token_bytes(32)}
+
+
+def check_completion_token_keys():
+    """
+    lifespan 시작 시 호출 (import 시점에는 로그를 남기지 않음 → log writer 스레드가 import 중 시작되지 않도록)
+    워커가 여러 개인데 키가 없으면 워커마다 임시 키가 달라 다른 워커로 간 /verify가 실패 → 시작 중단
+    """
+    if not COMPLETION_TOKEN_KEYS:
+        if WORKER_COUNT > 1:
+            raise RuntimeError(
+                f"COMPLETION_TOKEN_KEYS가 설정되지 않았습니다 (WEB_CONCURRENCY={WORKER_COUNT}). "
+                "여러 워커에서는 모든 워커가 같은 서명 키를 사용해야 합니다."
+            )
+        log_event(
+            "COMPLETION_TOKEN_EPHEMERAL_KEY",
+            {"message": "COMPLETION_TOKEN_KEYS가 설정되지 않아 임시 키를 사용합니다."},
+            level=LogLevel.WARNING
+        )
+
+    if COMPLETION_TOKEN_SINGLE_USE and WORKER_COUNT > 1 and not is_shared():
+        log_event(
+            "COMPLETION_TOKEN_SINGLE_USE_PER_PROCESS",
+            {"message": "REPLAY_STORE_BACKEND=memory에서는 같은 토큰이 워커마다 한 번씩 검증될 수 있습니다.",
+             "workers": WORKER_COUNT},
+            level=LogLevel.WARNING
+        )
+
+
+def _b64encode(raw: bytes) -> str:
+    return base64.urlsafe_b64encode(raw).rstrip(b"=").decode("ascii")
+
+
+def _b64decode(text: str) -> bytes:
+    return base64.urlsafe_b64decode(text + "=" * (-len(text) % 4))
+
+
+def _sign(key: bytes, signing_input: str) -> bytes:
+    return hmac.new(key, signing_input.encode("ascii"), hashlib.sha256).digest()
+
+
+def _signing_key(client_id: str) -> Tuple[str, bytes]:
+    """고객사 전용 키(첫 번째)가 있으면 그 키, 없으면 공용 서명 키"""
+    token_keys = CLIENT_REGISTRY.policy(client_id).get("token_keys")
+    if token_keys:
+        return f"{client_id}/{token_keys[0]['kid']}", token_keys[0]["secret"].encode("utf-8")
+    return _SIGNING_KID, _KEYS[_SIGNING_KID]
+
+
+def _verification_key(kid: str) -> Tuple[Optional[str], Optional[bytes]]:
+    """kid → (키 소유 고객사 또는 None, 키). 고객사 키는 레지스트리 메모리 인덱스에서 조회"""
+    if "/" not in kid:
+        return None, _KEYS.get(kid)
+
+    client_id, client_kid = kid.split("/", 1)
+    policy = CLIENT_REGISTRY.get(client_id) or {}
+    for item in policy.get("token_keys") or ():
+        if item["kid"] == client_kid:
+            return client_id, item["secret"].encode("utf-8")
+    return client_id, None
+
+
+# -----------------------
+# 1회용 nonce 기록 (REPLAY_STORE_BACKEND=redis면 워커 / 노드 간 공유)
+# -----------------------
+USED_NONCES = create_replay_set("token")
+
+
+# -----------------------
+# 발급 / 검증
+# -----------------------
+def issue_completion_token(session_id: str, client_id: str) -> str:
+    """COMPLETED 전이 시 호출"""
+    payload = {
+        "sid": session_id,
+        "cid": client_id,
+        "exp": int(time()) + COMPLETION_TOKEN_TTL_SECONDS,
+        "nonce": secrets.token_urlsafe(12),
+    }
+    body = _b64encode(json.dumps(payload, separators=(",", ":")).encode("utf-8"))
+    kid, key = _signing_key(client_id)
+    signing_input = f"{TOKEN_VERSION}.{kid}.{body}"
+    return f"{signing_input}.{_b64encode(_sign(key, signing_input))}"
+
+
+def _verify(token: str, single_use: bool) -> Dict[str, Any]:
+    parts = token.split(".")
+    if len(parts) != 4 or parts[0] != TOKEN_VERSION:
+        raise CompletionTokenError("malformed")
+
+    version, kid, body, signature = parts
+    key_owner, key = _verification_key(kid)
+    if key is None:
+        raise CompletionTokenError("unknown_kid")
+
+    try:
+        expected = _sign(key, f"{version}.{kid}.{body}")
+        if not hmac.compare_digest(expected, _b64decode(signature)):
+            raise CompletionTokenError("bad_signature")
+        claims = json.loads(_b64decode(body))
+        sid, exp, nonce = claims["sid"], float(claims["exp"]), str(claims["nonce"])
+    except CompletionTokenError:
+        raise
+    except (ValueError, KeyError, TypeError):
+        raise CompletionTokenError("malformed")
+
+    # 고객사 키로는 그 고객사의 토큰만 검증
+    if key_owner is not None and claims.get("cid") != key_owner:
+        raise CompletionTokenError("bad_signature")
+
+    if exp < time():
+        raise CompletionTokenError("expired")
+
+    if single_use and not USED_NONCES.consume(nonce, exp):
+        raise CompletionTokenError("replayed")
+
+    return {"session_id": sid, "client_id": claims.get("cid"), "expires_at": int(exp)}
+
+
+def verify_completion_token(token: str, single_use: bool = COMPLETION_TOKEN_SINGLE_USE) -> Dict[str, Any]:
+    """
+    토큰 서명 / 만료 / 재사용 여부 확인.
+    성공 시 {"session_id", "client_id", "expires_at"}, 실패 시 CompletionTokenError
+    """
+    try:
+        claims = _verify(token, single_use)
+    except CompletionTokenError as e:
+        TOKEN_VERIFICATIONS.inc(result=e.reason)
+        raise
+    TOKEN_VERIFICATIONS.inc(result="valid")
+    return claims
@@ -1,5 +1,7 @@
 # app/core/config.py
 
+import os
+
 # 서비스 정책 / 시간 / 임계값 / 전역 상수
 SESSION_TTL_SECONDS = 15 * 60  # 15분
 
@@ -12,4 +14,278 @@ SESSION_TTL_SECONDS = 15 * 60  # 15분
 # PHASE_B_MAX_FAIL_COUNT = 2
 
 # # Behavior Model
-# PHASE_A_ANOMALY_THRESHOLD = 0.5  # 정책으로 확정되면
\ No newline at end of file
+# PHASE_A_ANOMALY_THRESHOLD = 0.5  # 정책으로 확정되면
+
+
+# -----------------------
+# AI 추론 서버 (다중 엔드포인트)
+# -----------------------
+# 콤마로 구분된 AI 서버 목록. 없으면 기존 단일 AI_SERVER_URL 사용
+AI_SERVER_URLS = [
+    url.strip().rstrip("/")
+    for url in os.getenv(
+        "AI_SERVER_URLS",
+        os.getenv("AI_SERVER_URL", "http://10.0.83.48:9000"),
+    ).split(",")
+    if url.strip()
+]
+
+AI_REQUEST_TIMEOUT = float(os.getenv("AI_REQUEST_TIMEOUT", "10"))
+
+# 엔드포인트 선택 방식: "least_outstanding" | "latency_weighted"
+AI_LB_STRATEGY = os.getenv("AI_LB_STRATEGY", "least_outstanding")
+
+# 액티브 헬스체크 (INTERVAL 0 또는 PATH 빈 값이면 비활성, 경로가 404/405/501이면 해당 엔드포인트만 제외)
+AI_HEALTH_CHECK_PATH = os.getenv("AI_HEALTH_CHECK_PATH", "/health")
+AI_HEALTH_CHECK_INTERVAL = float(os.getenv("AI_HEALTH_CHECK_INTERVAL", "5"))
+AI_HEALTH_CHECK_TIMEOUT = float(os.getenv("AI_HEALTH_CHECK_TIMEOUT", "2"))
+
+# 연속 실패 N회 → 일정 시간 동안 라우팅 대상에서 제외(eject)
+AI_EJECT_CONSECUTIVE_FAILURES = int(os.getenv("AI_EJECT_CONSECUTIVE_FAILURES", "3"))
+AI_EJECT_SECONDS = float(os.getenv("AI_EJECT_SECONDS", "30"))
+
+# 궤적 전송 포맷: "json" | "packed" | "auto"(헬스체크에서 packed 지원을 광고한 서버에만 packed)
+AI_WIRE_FORMAT = os.getenv("AI_WIRE_FORMAT", "json")
+
+
+# -----------------------
+# 궤적(points) 크기 제한
+# -----------------------
+# AI 서버로 보내는 최대 포인트 수 (초과 시 축소)
+TRAJECTORY_MAX_POINTS = int(os.getenv("TRAJECTORY_MAX_POINTS", "512"))
+
+# 축소 방식: "time_bucket"(시간 구간별 샘플 유지) | "rdp"(Ramer–Douglas–Peucker) | "none"
+TRAJECTORY_REDUCTION = os.getenv("TRAJECTORY_REDUCTION", "time_bucket")
+
+# 제출 1건당 허용하는 원본 포인트 수 상한 (초과 시 INVALID_PAYLOAD)
+TRAJECTORY_HARD_LIMIT_POINTS = int(os.getenv("TRAJECTORY_HARD_LIMIT_POINTS", "20000"))
+
+# 요청 body 크기 상한 (bytes, 초과 시 413)
+MAX_REQUEST_BODY_BYTES = int(os.getenv("MAX_REQUEST_BODY_BYTES", str(2 * 1024 * 1024)))
+
+
+# -----------------------
+# Phase A 로컬 기하 사전검사 (target_path 대비)
+# -----------------------
+# 거리 단위는 원본 문제 이미지 픽셀 (tcurity_ticket.png: 1920x1080)
+PHASE_A_PRESCREEN_ENABLED = os.getenv("PHASE_A_PRESCREEN_ENABLED", "1") == "1"
+
+# 사용자 포인트 → 절취선 최근접 거리의 중앙값이 이 값을 넘으면 거절
+PHASE_A_PRESCREEN_MAX_MEDIAN_DISTANCE_PX = float(os.getenv("PHASE_A_PRESCREEN_MAX_MEDIAN_DISTANCE_PX", "120"))
+
+# 절취선 포인트 중 반경 안에 사용자 포인트가 있는 비율이 최소값 미만이면 거절
+PHASE_A_PRESCREEN_COVERAGE_RADIUS_PX = float(os.getenv("PHASE_A_PRESCREEN_COVERAGE_RADIUS_PX", "60"))
+PHASE_A_PRESCREEN_MIN_COVERAGE = float(os.getenv("PHASE_A_PRESCREEN_MIN_COVERAGE", "0.3"))
+
+
+# -----------------------
+# 운동학 휴리스틱 룰 (AI 모델 호출 전 명백한 봇 차단)
+# -----------------------
+BOT_HEURISTICS_ENABLED = os.getenv("BOT_HEURISTICS_ENABLED", "1") == "1"
+
+# 비활성화할 룰 이름 (콤마 구분, 예: "constant_velocity,zero_jitter")
+BOT_HEURISTICS_DISABLED_RULES = {
+    name.strip()
+    for name in os.getenv("BOT_HEURISTICS_DISABLED_RULES", "").split(",")
+    if name.strip()
+}
+
+# 룰 적중 시: "flag"(로그 / 메트릭만 남기고 AI 판정) | "reject"(봇 처리)
+# 임계값이 실제 트래픽으로 검증되기 전까지는 flag로 적중률만 수집
+BOT_HEURISTICS_MODE = os.getenv("BOT_HEURISTICS_MODE", "flag")
+
+
+# -----------------------
+# 궤적 재사용(replay) 지문 캐시
+# -----------------------
+REPLAY_CACHE_ENABLED = os.getenv("REPLAY_CACHE_ENABLED", "1") == "1"
+REPLAY_CACHE_TTL_SECONDS = float(os.getenv("REPLAY_CACHE_TTL_SECONDS", "3600"))
+# 항목당 약 850B (near 시그니처 포함) → 기본 상한에서 워커당 약 17MB
+# 필요 용량 ≈ 워커당 Phase A AI 판정 수/초 × TTL (기본값은 워커당 약 5.5건/초 × 1시간)
+REPLAY_CACHE_MAX_ENTRIES = int(os.getenv("REPLAY_CACHE_MAX_ENTRIES", "20000"))
+# 다른 세션에서 같은 궤적이 들어왔을 때: "reject"(봇 처리) | "flag"(로그만 남기고 AI 판정)
+REPLAY_CACHE_MODE = os.getenv("REPLAY_CACHE_MODE", "reject")
+
+
+# -----------------------
+# 워커 구성
+# -----------------------
+# uvicorn / gunicorn이 --workers 기본값으로 읽는 값 (여러 워커는 이 변수로 지정)
+# 1보다 크면 키 미설정(워커별 임시 키) 상태로는 시작하지 않음
+WORKER_COUNT = int(os.getenv("WEB_CONCURRENCY", "1"))
+
+
+# -----------------------
+# 완료 토큰 (고객사 서버 → /verify)
+# -----------------------
+# "kid:secret" 콤마 구분. 첫 번째 키로 서명하고, 나머지는 키 회전 중 검증용으로만 사용
+COMPLETION_TOKEN_KEYS = [
+    tuple(item.strip().split(":", 1))
+    for item in os.getenv("COMPLETION_TOKEN_KEYS", "").split(",")
+    if ":" in item
+]
+COMPLETION_TOKEN_TTL_SECONDS = int(os.getenv("COMPLETION_TOKEN_TTL_SECONDS", "300"))
+# 1이면 같은 토큰은 한 번만 검증 성공 (nonce replay set)
+COMPLETION_TOKEN_SINGLE_USE = os.getenv("COMPLETION_TOKEN_SINGLE_USE", "1") == "1"
+
+# 1회용 ID(토큰 nonce / 봉인 상태 jti) 기록 위치
+# "memory": 워커(프로세스) 단위 | "redis": REDIS_URL 공유 (오류 시 memory로 fallback)
+REPLAY_STORE_BACKEND = os.getenv("REPLAY_STORE_BACKEND", "memory")
+
+# /verify/batch 1회 요청당 최대 항목 수 (session_ids + tokens)
+VERIFY_BATCH_MAX_ITEMS = int(os.getenv("VERIFY_BATCH_MAX_ITEMS", "500"))
+
+
+# -----------------------
+# 세션 상태 저장 방식
+# -----------------------
+# "server": SESSION_STORE 사용 (기본)
+# "stateless": 세션 상태를 암호화 토큰(X-Session-State 헤더)으로 클라이언트에 보관 → 어느 노드든 처리 가능
+SESSION_STATE_MODE = os.getenv("SESSION_STATE_MODE", "server")
+
+# "kid:secret" 콤마 구분 (첫 키로 봉인, 나머지는 키 회전 중 복원용)
+SESSION_STATE_KEYS = [
+    tuple(item.strip().split(":", 1))
+    for item in os.getenv("SESSION_STATE_KEYS", "").split(",")
+    if ":" in item
+]
+
+
+# -----------------------
+# 요청 제한 (token bucket, /session/init · /captcha/request · /captcha/submit)
+# -----------------------
+# 기본 꺼짐: 프록시 뒤에서는 RATE_LIMIT_TRUST_FORWARDED_FOR=1과 함께 켤 것
+RATE_LIMIT_ENABLED = os.getenv("RATE_LIMIT_ENABLED", "0") == "1"
+
+# "memory"(프로세스 내) | "redis"(REDIS_URL 공유, 오류 시 memory로 fail-open)
+RATE_LIMIT_BACKEND = os.getenv("RATE_LIMIT_BACKEND", "memory")
+REDIS_URL = os.getenv("REDIS_URL", "redis://localhost:6379")
+
+# 미등록 client_id 기본 정책, client_id별 bucket (등록된 고객사는 고객사 레지스트리의 정책 사용)
+RATE_LIMIT_CLIENT_PER_SEC = float(os.getenv("RATE_LIMIT_CLIENT_PER_SEC", "10"))
+RATE_LIMIT_CLIENT_BURST = float(os.getenv("RATE_LIMIT_CLIENT_BURST", "20"))
+
+# IP별 제한 (엔드포인트 구분별로 별도 bucket)
+RATE_LIMIT_IP_PER_SEC = float(os.getenv("RATE_LIMIT_IP_PER_SEC", "5"))
+RATE_LIMIT_IP_BURST = float(os.getenv("RATE_LIMIT_IP_BURST", "20"))
+
+# 1이면 X-Forwarded-For 첫 번째 주소를 클라이언트 IP로 사용
+# LB / reverse proxy 뒤에서는 1 필수 (0이면 모든 사용자가 프록시 주소의 IP bucket 하나를 공유),
+# 프록시 없이 직접 노출될 때는 0 (클라이언트가 헤더를 위조할 수 있음)
+RATE_LIMIT_TRUST_FORWARDED_FOR = os.getenv("RATE_LIMIT_TRUST_FORWARDED_FOR", "0") == "1"
+
+# 프로세스 내 bucket 최대 개수 (LRU, 초과 시 가장 오래된 bucket 제거)
+RATE_LIMIT_MAX_KEYS = int(os.getenv("RATE_LIMIT_MAX_KEYS", "100000"))
+
+
+# -----------------------
+# 적응형 동시 실행 제한 (AI 검증 / 문제 생성)
+# -----------------------
+# 기본 꺼짐: 한도 / 목표 지연을 실제 부하(AI 서버 지연 포함)로 조정한 뒤 켬 (켜면 초과 요청은 즉시 거절)
+ADMISSION_CONTROL_ENABLED = os.getenv("ADMISSION_CONTROL_ENABLED", "0") == "1"
+
+# 한도 초과 시 대기 허용 요청 수 / 최대 대기 시간 (초과 시 즉시 과부하 응답)
+ADMISSION_MAX_QUEUE = int(os.getenv("ADMISSION_MAX_QUEUE", "8"))
+ADMISSION_QUEUE_TIMEOUT_MS = float(os.getenv("ADMISSION_QUEUE_TIMEOUT_MS", "50"))
+
+# AI 서버 검증 호출 (지연이 목표를 넘으면 한도 감소)
+AI_VERIFY_CONCURRENCY_INITIAL = int(os.getenv("AI_VERIFY_CONCURRENCY_INITIAL", "16"))
+AI_VERIFY_CONCURRENCY_MIN = int(os.getenv("AI_VERIFY_CONCURRENCY_MIN", "2"))
+AI_VERIFY_CONCURRENCY_MAX = int(os.getenv("AI_VERIFY_CONCURRENCY_MAX", "128"))
+AI_VERIFY_LATENCY_TARGET_MS = float(os.getenv("AI_VERIFY_LATENCY_TARGET_MS", "1500"))
+
+# 문제 생성 (Phase A 이미지 합성 / Phase B 이미지 디코딩 + 워터마크, CPU 작업만 - AI 서버 호출은 제외)
+GENERATION_CONCURRENCY_INITIAL = int(os.getenv("GENERATION_CONCURRENCY_INITIAL", str(os.cpu_count() or 1)))
+GENERATION_CONCURRENCY_MIN = int(os.getenv("GENERATION_CONCURRENCY_MIN", "1"))
+GENERATION_CONCURRENCY_MAX = int(os.getenv("GENERATION_CONCURRENCY_MAX", str(4 * (os.cpu_count() or 1))))
+GENERATION_LATENCY_TARGET_MS = float(os.getenv("GENERATION_LATENCY_TARGET_MS", "1000"))
+
+# AI 검증 슬롯 tenant별 공정 분배 (가중치 / 대기 가능 수는 client_validation 정책)
+AI_FAIR_QUEUE_TIMEOUT_MS = float(os.getenv("AI_FAIR_QUEUE_TIMEOUT_MS", "1000"))
+AI_FAIR_DEFAULT_QUEUE_BURST = int(os.getenv("AI_FAIR_DEFAULT_QUEUE_BURST", "8"))
+# 전체 tenant 합산 대기 수 상한 (대기 요청은 threadpool 스레드를 점유, 0이면 threadpool 크기의 1/4)
+AI_FAIR_MAX_WAITERS = int(os.getenv("AI_FAIR_MAX_WAITERS", "0"))
+
+
+# -----------------------
+# 고객사 레지스트리
+# -----------------------
+# JSON 파일 또는 SQLite(.db / .sqlite) 경로. 비어 있으면 client_validation의 기본 목록 사용
+CLIENT_REGISTRY_PATH = os.getenv("CLIENT_REGISTRY_PATH", "")
+# 원본 변경 확인 주기 (0이면 hot reload 비활성)
+CLIENT_REGISTRY_RELOAD_SECONDS = float(os.getenv("CLIENT_REGISTRY_RELOAD_SECONDS", "10"))
+# 미등록 client_id 기록 (같은 ID 반복 시 로그/메트릭 중복 방지)
+CLIENT_REGISTRY_NEGATIVE_CACHE_SIZE = int(os.getenv("CLIENT_REGISTRY_NEGATIVE_CACHE_SIZE", "10000"))
+CLIENT_REGISTRY_NEGATIVE_TTL_SECONDS = float(os.getenv("CLIENT_REGISTRY_NEGATIVE_TTL_SECONDS", "300"))
+
+
+# -----------------------
+# 로깅 (log_event → QueueHandler → listener 스레드 → "captcha" logger handler)
+# -----------------------
+# "debug" | "info" | "warning" | "error"
+LOG_LEVEL = os.getenv("LOG_LEVEL", "info").lower()
+LOG_QUEUE_MAX = int(os.getenv("LOG_QUEUE_MAX", "50000"))          # 초과분은 버리고 개수만 기록
+
+# 대량 이벤트 샘플링 비율 ("EVENT:비율" 콤마 구분, 예: "SESSION_STATE_TRANSITION:0.1")
+LOG_SAMPLE_RATES = {
+    name.strip(): float(rate)
+    for name, rate in (
+        item.split(":", 1) for item in os.getenv("LOG_SAMPLE_RATES", "").split(",") if ":" in item
+    )
+}
+
+
+# -----------------------
+# 메트릭 (/metrics, Prometheus text format)
+# -----------------------
+# 기본 꺼짐: CAPTCHA API와 같은 앱 / 포트로 노출되며 AI 엔드포인트 URL / 고객사 ID를 포함
+# ADMIN_TOKEN이 설정되어 있으면 X-Admin-Token 헤더 필요 (scrape 설정에 헤더 추가)
+METRICS_ENABLED = os.getenv("METRICS_ENABLED", "0") == "1"
+
+
+# -----------------------
+# 요청 tracing (X-Request-Id / Server-Timing)
+# -----------------------
+# 1이면 세션 생성 / 문제 요청 / 제출 응답에 Server-Timing 헤더(단계별 소요 시간) 포함
+SERVER_TIMING_ENABLED = os.getenv("SERVER_TIMING_ENABLED", "0") == "1"
+# 이 시간(ms)을 넘긴 요청은 span 목록과 함께 SLOW_REQUEST 로그 (0이면 비활성)
+TRACE_SLOW_REQUEST_MS = float(os.getenv("TRACE_SLOW_REQUEST_MS", "1000"))
+
+
+# -----------------------
+# 관리자 API (/admin, 운영 워커 on-demand 프로파일링)
+# -----------------------
+# 미설정 시 관리자 API 자체를 등록하지 않음 (404)
+ADMIN_TOKEN = os.getenv("ADMIN_TOKEN") or None
+PROFILE_MAX_SECONDS = float(os.getenv("PROFILE_MAX_SECONDS", "30"))        # 1회 프로파일링 최대 시간
+PROFILE_MAX_CALLS = int(os.getenv("PROFILE_MAX_CALLS", "200"))             # cProfile 측정 호출 수 상한
+PROFILE_SAMPLE_INTERVAL_MS = float(os.getenv("PROFILE_SAMPLE_INTERVAL_MS", "10"))
+
+
+# -----------------------
+# event loop / threadpool 모니터
+# -----------------------
+RUNTIME_MONITOR_ENABLED = os.getenv("RUNTIME_MONITOR_ENABLED", "1") == "1"
+RUNTIME_MONITOR_INTERVAL_MS = float(os.getenv("RUNTIME_MONITOR_INTERVAL_MS", "500"))
+EVENT_LOOP_LAG_WARN_MS = float(os.getenv("EVENT_LOOP_LAG_WARN_MS", "100"))
+THREADPOOL_WAITING_WARN = int(os.getenv("THREADPOOL_WAITING_WARN", "1"))   # 스레드 대기 요청 수
+# sync endpoint threadpool 크기 (0이면 anyio 기본값 40 유지)
+THREADPOOL_SIZE = int(os.getenv("THREADPOOL_SIZE", "0"))
+
+
+# -----------------------
+# 트래픽 샘플 기록 (benchmarks/replay.py로 재생)
+# -----------------------
+# 미설정 시 비활성, .gz로 끝나면 gzip으로 기록
+TRAFFIC_CAPTURE_PATH = os.getenv("TRAFFIC_CAPTURE_PATH") or None
+TRAFFIC_CAPTURE_SAMPLE_RATE = float(os.getenv("TRAFFIC_CAPTURE_SAMPLE_RATE", "0.01"))     # 세션 단위
+TRAFFIC_CAPTURE_MAX_BYTES = int(os.getenv("TRAFFIC_CAPTURE_MAX_BYTES", str(100 * 1024 * 1024)))   # 디스크상 크기
+# 샘플링 / session_id 익명화 HMAC 키 (모든 워커 / 노드가 같은 값, 여러 워커에서는 필수)
+TRAFFIC_CAPTURE_KEY = os.getenv("TRAFFIC_CAPTURE_KEY") or None
+
+
+# -----------------------
+# startup warmup / readiness (/health, /ready)
+# -----------------------
+# 1이면 lifespan 시작 시 템플릿 / 폰트 / 이미지 경로 / AI 연결을 미리 준비하고 완료 전까지 /ready 503
+WARMUP_ENABLED = os.getenv("WARMUP_ENABLED", "1") == "1"
@@ -0,0 +1,198 @@
+# app/core/fair_scheduler.py
+"""
+고객사(client_id)별 공정 스케줄링 - AI 검증 동시 실행 슬롯을 tenant 간 가중 분배
+- AdaptiveLimiter(ai_verify)의 한도를 그대로 사용하고, 슬롯이 없을 때만 tenant별 대기열에 넣음
+- 빈 슬롯은 Deficit Round Robin(가중치 = 정책 "weight")으로 다음 tenant에게 배정
+- tenant별 대기 가능 수 = 정책 "ai_queue_burst" (초과 / 대기 시간 초과 시 OverloadedError)
+- 전체 대기 수 상한 = AI_FAIR_MAX_WAITERS (기본: threadpool 크기의 1/4)
+  대기 요청은 threadpool 스레드를 점유하므로, 대기열이 /session/init · /verify의 스레드를 빼앗지 않도록
+- tenant별 대기 시간 histogram 기록 (결과별: granted / shed / timeout, 고객사별 SLA 확인용)
+"""
+
+import threading
+from collections import deque
+from contextlib import contextmanager
+from time import perf_counter
+from typing import Dict, Optional
+
+from app.core.admission import (
+    ADMISSION_QUEUE_DEPTH,
+    AI_VERIFY_LIMITER,
+    AdaptiveLimiter,
+    AdmissionPermit,
+)
+from app.core.config import (
+    ADMISSION_CONTROL_ENABLED,
+    AI_FAIR_MAX_WAITERS,
+    AI_FAIR_QUEUE_TIMEOUT_MS,
+    THREADPOOL_SIZE,
+)
+from app.core.metrics import gauge, histogram
+from app.core.tracing import record_span
+from app.services.client_validation import get_client_policy, is_registered_client
+
+TENANT_WAIT_SECONDS = histogram(
+    "captcha_ai_tenant_wait_seconds",
+    "AI 검증 슬롯 대기 시간 (tenant별, outcome=granted|shed|timeout)",
+    ("client_id", "outcome"),
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5),
+)
+TENANT_QUEUE_DEPTH = gauge("captcha_ai_tenant_queue_depth", "AI 검증 슬롯 대기 중인 요청 수 (tenant별)", ("client_id",))
+
+# 미등록 client_id는 하나의 tenant로 묶음 (메트릭 라벨 / 대기열 수 제한)
+UNREGISTERED_TENANT = "_unregistered"
+
+# THREADPOOL_SIZE=0일 때 anyio 기본 threadpool 크기
+DEFAULT_THREADPOOL_SIZE = 40
+
+
+def default_max_waiters() -> int:
+    """AI_FAIR_MAX_WAITERS 미설정(0) 시 threadpool 크기의 1/4"""
+    if AI_FAIR_MAX_WAITERS > 0:
+        return AI_FAIR_MAX_WAITERS
+    return max(1, (THREADPOOL_SIZE or DEFAULT_THREADPOOL_SIZE) // 4)
+
+
+class _Waiter:
+    __slots__ = ("event", "granted")
+
+    def __init__(self):
+        self.event = threading.Event()
+        self.granted = False
+
+
+class FairScheduler:
+    """
+    with AI_FAIR_SCHEDULER.acquire(client_id) as permit:
+        ... (AdaptiveLimiter.acquire와 동일하게 과부하 신호면 permit.drop())
+    """
+
+    def __init__(
+        self,
+        limiter: AdaptiveLimiter,
+        queue_timeout_ms: float = AI_FAIR_QUEUE_TIMEOUT_MS,
+        max_waiters: Optional[int] = None,
+    ):
+        self.limiter = limiter
+        self.queue_timeout = queue_timeout_ms / 1000
+        self.max_waiters = max_waiters if max_waiters is not None else default_max_waiters()
+        self._queues: Dict[str, deque] = {}
+        self._deficit: Dict[str, float] = {}
+        self._active: deque = deque()   # 대기 요청이 있는 tenant (round robin 순서)
+        self._waiting = 0
+
+    # -----------------------
+    # 내부 헬퍼 (limiter.lock() 보유 상태에서 호출)
+    # -----------------------
+    def _set_queue_gauges(self, tenant: str):
+        TENANT_QUEUE_DEPTH.set(len(self._queues.get(tenant, ())), client_id=tenant)
+        ADMISSION_QUEUE_DEPTH.set(self._waiting, resource=self.limiter.name)
+
+    def _deactivate(self, tenant: str):
+        self._active.remove(tenant)
+        del self._deficit[tenant]
+        del self._queues[tenant]
+
+    def _dispatch_locked(self):
+        """빈 슬롯을 DRR 순서로 대기 중인 tenant에게 배정"""
+        while self._active and self.limiter.has_slot_locked():
+            tenant = self._active[0]
+
+            if self._deficit[tenant] < 1:
+                self._deficit[tenant] += max(float(get_client_policy(tenant).get("weight", 1)), 0.01)
+                if self._deficit[tenant] < 1:
+                    self._active.rotate(-1)
+                    continue
+
+            queue = self._queues[tenant]
+            waiter = queue.popleft()
+            self._deficit[tenant] -= 1
+            self._waiting -= 1
+
+            self.limiter.admit_locked()
+            waiter.granted = True
+            waiter.event.set()
+
+            if not queue:
+                self._deactivate(tenant)
+            elif self._deficit[tenant] < 1:
+                self._active.rotate(-1)
+
+            self._set_queue_gauges(tenant)
+
+    def _enter(self, tenant: str) -> Optional[str]:
+        """슬롯을 얻으면 None, 거절되면 사유("shed" / "timeout")"""
+        limiter = self.limiter
+
+        with limiter.lock():
+            # 대기 중인 tenant가 없고 슬롯이 있으면 바로 실행
+            if not self._active and limiter.has_slot_locked():
+                limiter.admit_locked()
+                return None
+
+            # 전체 대기 수 / tenant별 대기 가능 수 초과 시 대기 없이 거절
+            queue = self._queues.get(tenant)
+            if self._waiting >= self.max_waiters:
+                return "shed"
+            if queue is not None and len(queue) >= get_client_policy(tenant).get("ai_queue_burst", 1):
+                return "shed"
+
+            waiter = _Waiter()
+            if queue is None:
+                queue = self._queues[tenant] = deque()
+                self._deficit[tenant] = 0.0
+                self._active.append(tenant)
+            queue.append(waiter)
+            self._waiting += 1
+            self._set_queue_gauges(tenant)
+            self._dispatch_locked()
+
+        if waiter.event.wait(self.queue_timeout):
+            return None
+
+        with limiter.lock():
+            if waiter.granted:  # 시간 초과 직후 배정된 경우
+                return None
+            queue.remove(waiter)
+            self._waiting -= 1
+            if not queue:
+                self._deactivate(tenant)
+            self._set_queue_gauges(tenant)
+        return "timeout"
+
+    def _exit(self, latency_ms: float, dropped: bool):
+        with self.limiter.lock():
+            self.limiter.finish_locked(latency_ms, dropped)
+            self._dispatch_locked()
+
+    # -----------------------
+    # 공개 API
+    # -----------------------
+    @contextmanager
+    def acquire(self, client_id: str):
+        if not ADMISSION_CONTROL_ENABLED:
+            yield AdmissionPermit()
+            return
+
+        tenant = client_id if is_registered_client(client_id) else UNREGISTERED_TENANT
+
+        wait_started = perf_counter()
+        rejected = self._enter(tenant)
+        started = perf_counter()
+        TENANT_WAIT_SECONDS.observe(started - wait_started, client_id=tenant, outcome=rejected or "granted")
+        record_span("ai_slot_wait", wait_started, started - wait_started)
+        if rejected is not None:
+            self.limiter.shed()
+
+        permit = AdmissionPermit()
+        try:
+            yield permit
+        except BaseException:
+            permit.drop()
+            raise
+        finally:
+            self._exit((perf_counter() - started) * 1000, permit.dropped)
+
+
+# AI 검증 호출은 이 스케줄러를 거쳐 AI_VERIFY_LIMITER 슬롯을 사용
+AI_FAIR_SCHEDULER = FairScheduler(AI_VERIFY_LIMITER)
@@ -0,0 +1,250 @@
+# app/core/metrics.py
+"""
+프로세스 내 경량 메트릭 레지스트리
+- Counter: 누적 카운트 (prescreen 거절 수, 룰 적중 수 등)
+- Gauge: 현재 값 (대기열 길이 등)
+- Histogram: 누적 bucket 분포 (대기 시간 / 단계별 소요 시간)
+- 라벨 조합별로 값을 보관하며 snapshot() / render_prometheus()로 조회
+- stage_timer(): 요청 처리 단계별 소요 시간 측정 (captcha_stage_duration_seconds + 현재 요청 trace span)
+"""
+
+import math
+import threading
+from bisect import bisect_left
+from time import perf_counter
+from typing import Callable, Dict, Any, List, Tuple
+
+from app.core.tracing import record_span
+
+_LOCK = threading.Lock()
+_REGISTRY: Dict[str, "Metric"] = {}
+_COLLECTORS: List[Callable[[], None]] = []
+
+
+class Metric:
+    kind = "untyped"
+
+    def __init__(self, name: str, help_text: str, labelnames: Tuple[str, ...] = ()):
+        self.name = name
+        self.help = help_text
+        self.labelnames = labelnames
+        self._values: Dict[Tuple[str, ...], float] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: Dict[str, Any]) -> Tuple[str, ...]:
+        return tuple(str(labels.get(name, "")) for name in self.labelnames)
+
+    def get(self, **labels) -> float:
+        return self._values.get(self._key(labels), 0.0)
+
+    def samples(self) -> List[Tuple[Dict[str, str], float]]:
+        with self._lock:
+            items = list(self._values.items())
+        return [(dict(zip(self.labelnames, key)), value) for key, value in items]
+
+
+class Counter(Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+
+class Gauge(Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = value
+
+    def inc(self, amount: float = 1.0, **labels):
+        key = self._key(labels)
+        with self._lock:
+            self._values[key] = self._values.get(key, 0.0) + amount
+
+    def dec(self, amount: float = 1.0, **labels):
+        self.inc(-amount, **labels)
+
+
+# 기본 bucket 상한 (초 단위)
+DEFAULT_BUCKETS = (0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0, 10.0)
+
+
+class Histogram(Metric):
+    kind = "histogram"
+
+    def __init__(
+        self,
+        name: str,
+        help_text: str,
+        labelnames: Tuple[str, ...] = (),
+        buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+    ):
+        super().__init__(name, help_text, labelnames)
+        self.buckets = tuple(sorted(buckets))
+        # 라벨 조합별 [bucket별 개수..., +Inf 개수, 합계]
+        self._values: Dict[Tuple[str, ...], List[float]] = {}
+
+    def observe(self, value: float, **labels):
+        key = self._key(labels)
+        index = bisect_left(self.buckets, value)
+        with self._lock:
+            state = self._values.get(key)
+            if state is None:
+                state = self._values[key] = [0.0] * (len(self.buckets) + 2)
+            state[index] += 1
+            state[-1] += value
+
+    def get(self, **labels) -> Dict[str, Any]:
+        with self._lock:
+            state = list(self._values.get(self._key(labels), [0.0] * (len(self.buckets) + 2)))
+        return self._summarize(state)
+
+    def _summarize(self, state: List[float]) -> Dict[str, Any]:
+        cumulative, buckets = 0.0, {}
+        for bound, count in zip(self.buckets + (float("inf"),), state[:-1]):
+            cumulative += count
+            buckets[bound] = cumulative
+        return {"buckets": buckets, "count": cumulative, "sum": state[-1]}
+
+    def samples(self) -> List[Tuple[Dict[str, str], Any]]:
+        with self._lock:
+            items = [(key, list(state)) for key, state in self._values.items()]
+        return [(dict(zip(self.labelnames, key)), self._summarize(state)) for key, state in items]
+
+
+def _register(cls, name: str, help_text: str, labelnames: Tuple[str, ...], **kwargs):
+    with _LOCK:
+        metric = _REGISTRY.get(name)
+        if metric is None:
+            metric = _REGISTRY[name] = cls(name, help_text, tuple(labelnames), **kwargs)
+        return metric
+
+
+def counter(name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Counter:
+    """이름이 같으면 기존 Counter를 반환 (모듈 재import 시에도 값 유지)"""
+    return _register(Counter, name, help_text, labelnames)
+
+
+def gauge(name: str, help_text: str, labelnames: Tuple[str, ...] = ()) -> Gauge:
+    return _register(Gauge, name, help_text, labelnames)
+
+
+def histogram(
+    name: str,
+    help_text: str,
+    labelnames: Tuple[str, ...] = (),
+    buckets: Tuple[float, ...] = DEFAULT_BUCKETS,
+) -> Histogram:
+    return _register(Histogram, name, help_text, labelnames, buckets=buckets)
+
+
+def register_collector(fn: Callable[[], None]):
+    """
+    조회 시점에 값을 채우는 함수 등록 (풀 상태처럼 요청 경로에서 매번 갱신할 필요 없는 gauge용)
+    """
+    with _LOCK:
+        _COLLECTORS.append(fn)
+
+
+def _collect() -> List[Metric]:
+    with _LOCK:
+        collectors = list(_COLLECTORS)
+    for fn in collectors:
+        try:
+            fn()
+        except Exception:
+            pass  # 수집 실패가 조회 자체를 막지 않도록
+    with _LOCK:
+        return list(_REGISTRY.values())
+
+
+def snapshot() -> Dict[str, List[Dict[str, Any]]]:
+    """모든 메트릭의 현재 값 (디버깅/관리용)"""
+    metrics = _collect()
+    return {
+        m.name: [{"labels": labels, "value": value} for labels, value in m.samples()]
+        for m in metrics
+    }
+
+
+# -----------------------
+# Prometheus text format (/metrics)
+# -----------------------
+def _format_value(value: float) -> str:
+    if math.isinf(value):
+        return "+Inf" if value > 0 else "-Inf"
+    if value == int(value):
+        return str(int(value))
+    return repr(float(value))
+
+
+def _escape(value: str) -> str:
+    return value.replace("\\", "\\\\").replace("\n", "\\n").replace('"', '\\"')
+
+
+def _format_labels(labels: Dict[str, str]) -> str:
+    if not labels:
+        return ""
+    return "{" + ",".join(f'{name}="{_escape(value)}"' for name, value in labels.items()) + "}"
+
+
+def render_prometheus() -> str:
+    """모든 메트릭을 Prometheus text exposition format(0.0.4)으로 변환"""
+    lines = []
+    for metric in sorted(_collect(), key=lambda m: m.name):
+        help_text = metric.help.replace("\\", "\\\\").replace("\n", "\\n")
+        lines.append(f"# HELP {metric.name} {help_text}")
+        lines.append(f"# TYPE {metric.name} {metric.kind}")
+
+        if metric.kind != "histogram":
+            for labels, value in metric.samples():
+                lines.append(f"{metric.name}{_format_labels(labels)} {_format_value(value)}")
+            continue
+
+        for labels, summary in metric.samples():
+            for bound, count in summary["buckets"].items():
+                bucket_labels = _format_labels({**labels, "le": _format_value(bound)})
+                lines.append(f"{metric.name}_bucket{bucket_labels} {_format_value(count)}")
+            lines.append(f"{metric.name}_sum{_format_labels(labels)} {_format_value(summary['sum'])}")
+            lines.append(f"{metric.name}_count{_format_labels(labels)} {_format_value(summary['count'])}")
+
+    return "\n".join(lines) + "\n"
+
+
+# -----------------------
+# 단계별 소요 시간
+# -----------------------
+STAGE_SECONDS = histogram(
+    "captcha_stage_duration_seconds",
+    "요청 처리 단계별 소요 시간",
+    ("stage",),
+    buckets=(0.0005, 0.001, 0.0025, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0, 2.5, 5.0),
+)
+
+
+class stage_timer:
+    """
+    with stage_timer("png_encode"):
+        ...
+    예외가 나도 소요 시간은 기록 (contextmanager 데코레이터보다 호출 비용이 작은 클래스 구현)
+    """
+
+    __slots__ = ("stage", "started")
+
+    def __init__(self, stage: str):
+        self.stage = stage
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        duration = perf_counter() - self.started
+        STAGE_SECONDS.observe(duration, stage=self.stage)
+        record_span(self.stage, self.started, duration)
+        return False
@@ -0,0 +1,196 @@
+# app/core/profiling.py
+"""
+운영 워커용 on-demand 프로파일러 (관리자 API에서만 켬, 기본 꺼짐)
+- 샘플링: 호출한 스레드가 일정 간격으로 sys._current_frames()를 읽어 다른 스레드의 collapsed stack 집계
+  (flamegraph.pl / speedscope 입력 형식, "frame;frame;frame count")
+- 결정적(cProfile): @profile_hook을 붙인 함수(문제 생성 / 워터마크 / 인코딩)의
+  다음 N회 호출만 cProfile로 측정 후 pstats 텍스트로 반환
+- 동시에 하나의 세션만 허용, 시간 / 호출 수 / stack 종류 수 상한으로 오버헤드 제한
+"""
+
+import cProfile
+import io
+import pstats
+import sys
+import threading
+from collections import Counter
+from functools import wraps
+from time import monotonic, sleep
+from typing import Dict, List, Optional
+
+from app.core.config import (
+    PROFILE_MAX_SECONDS,
+    PROFILE_MAX_CALLS,
+    PROFILE_SAMPLE_INTERVAL_MS,
+)
+
+# collapsed stack 종류 수 상한 (초과분은 "[truncated]"로 합산)
+MAX_DISTINCT_STACKS = 20000
+MAX_STACK_DEPTH = 64
+
+
+class ProfilerBusyError(RuntimeError):
+    """이미 다른 프로파일링 세션이 실행 중"""
+
+
+_SESSION_LOCK = threading.Lock()
+
+
+def _clamp_seconds(seconds: float) -> float:
+    return max(0.1, min(float(seconds), PROFILE_MAX_SECONDS))
+
+
+# -----------------------
+# 샘플링 프로파일러
+# -----------------------
+def _frame_label(frame) -> str:
+    code = frame.f_code
+    module = frame.f_globals.get("__name__", "?")
+    return f"{module}:{code.co_name}:{frame.f_lineno}"
+
+
+def _collapse(frame) -> str:
+    labels = []
+    while frame is not None and len(labels) < MAX_STACK_DEPTH:
+        labels.append(_frame_label(frame))
+        frame = frame.f_back
+    return ";".join(reversed(labels))
+
+
+def sample_stacks(seconds: float, interval_ms: float = PROFILE_SAMPLE_INTERVAL_MS) -> Dict[str, object]:
+    """
+    seconds 동안 모든 스레드의 stack을 샘플링 (호출한 스레드 자신은 제외).
+    반환: {"samples", "seconds", "interval_ms", "collapsed"}
+    """
+    if not _SESSION_LOCK.acquire(blocking=False):
+        raise ProfilerBusyError("profiling session already running")
+
+    try:
+        seconds = _clamp_seconds(seconds)
+        interval = max(float(interval_ms), 1.0) / 1000
+        me = threading.get_ident()
+        stacks: Counter = Counter()
+        samples = 0
+
+        deadline = monotonic() + seconds
+        while monotonic() < deadline:
+            for thread_id, frame in sys._current_frames().items():
+                if thread_id == me:
+                    continue
+                stack = _collapse(frame)
+                if stack in stacks or len(stacks) < MAX_DISTINCT_STACKS:
+                    stacks[stack] += 1
+                else:
+                    stacks["[truncated]"] += 1
+            samples += 1
+            sleep(interval)
+
+        collapsed = "\n".join(f"{stack} {count}" for stack, count in stacks.most_common())
+        return {"samples": samples, "seconds": seconds, "interval_ms": interval * 1000, "collapsed": collapsed}
+    finally:
+        _SESSION_LOCK.release()
+
+
+# -----------------------
+# 결정적 프로파일러 (cProfile, 대상 함수 한정)
+# -----------------------
+class _DeterministicSession:
+
+    def __init__(self, max_calls: int, targets: Optional[List[str]]):
+        self.max_calls = max_calls
+        self.remaining = max_calls
+        self.targets = set(targets) if targets else None
+        self.profiles: List[cProfile.Profile] = []
+        self.calls: Counter = Counter()
+        self.lock = threading.Lock()
+        self.done = threading.Event()
+
+    def claim(self, name: str) -> bool:
+        if self.targets is not None and name not in self.targets:
+            return False
+        with self.lock:
+            if self.remaining <= 0:
+                return False
+            self.remaining -= 1
+            return True
+
+    def finish_call(self, name: str, profile: cProfile.Profile):
+        with self.lock:
+            self.profiles.append(profile)
+            self.calls[name] += 1
+            if len(self.profiles) >= self.max_calls:
+                self.done.set()
+
+
+# 켜져 있을 때만 설정됨 (꺼져 있으면 hook 비용은 전역 변수 확인 1회)
+_ACTIVE: Optional[_DeterministicSession] = None
+
+# @profile_hook으로 등록된 대상 이름
+HOOK_NAMES = set()
+
+# 측정 중인 호출 안에서 다시 hook 대상이 호출되면 중첩 측정하지 않음 (스레드당 profiler 1개)
+_IN_PROFILE = threading.local()
+
+
+def profile_hook(name: str):
+    """
+    @profile_hook("generate_cutline")
+    결정적 프로파일링이 켜져 있고 대상이면 이 호출을 cProfile로 측정
+    """
+    HOOK_NAMES.add(name)
+
+    def decorator(func):
+        @wraps(func)
+        def wrapper(*args, **kwargs):
+            session = _ACTIVE
+            if session is None or getattr(_IN_PROFILE, "active", False) or not session.claim(name):
+                return func(*args, **kwargs)
+
+            profile = cProfile.Profile()
+            _IN_PROFILE.active = True
+            try:
+                return profile.runcall(func, *args, **kwargs)
+            finally:
+                _IN_PROFILE.active = False
+                session.finish_call(name, profile)
+        return wrapper
+    return decorator
+
+
+def profile_calls(
+    max_calls: int = PROFILE_MAX_CALLS,
+    seconds: float = PROFILE_MAX_SECONDS,
+    targets: Optional[List[str]] = None,
+    sort_by: str = "cumulative",
+    limit: int = 50,
+) -> Dict[str, object]:
+    """
+    @profile_hook 대상 함수의 다음 max_calls회 호출(또는 seconds 경과까지)을 측정.
+    반환: {"calls": {이름: 횟수}, "stats": pstats 텍스트}
+    """
+    global _ACTIVE
+
+    if not _SESSION_LOCK.acquire(blocking=False):
+        raise ProfilerBusyError("profiling session already running")
+
+    try:
+        session = _DeterministicSession(max(1, min(int(max_calls), PROFILE_MAX_CALLS)), targets)
+        _ACTIVE = session
+        session.done.wait(_clamp_seconds(seconds))
+    finally:
+        _ACTIVE = None
+        _SESSION_LOCK.release()
+
+    # 종료 시점에 실행 중이던 호출은 제외 (finish_call 전이면 profiles에 없음)
+    with session.lock:
+        profiles = list(session.profiles)
+        calls = dict(session.calls)
+
+    out = io.StringIO()
+    if profiles:
+        stats = pstats.Stats(profiles[0], stream=out)
+        for profile in profiles[1:]:
+            stats.add(profile)
+        stats.sort_stats(sort_by).print_stats(limit)
+
+    return {"calls": calls, "stats": out.getvalue()}
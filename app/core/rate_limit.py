@@ -0,0 +1,237 @@
+# app/core/rate_limit.py
+"""
+고객사(client_id) / IP별 token bucket 요청 제한 + 일일 세션 발급 쿼터
+- 기본: 프로세스 내 LRU bucket (조회/갱신 O(1))
+- RATE_LIMIT_BACKEND=redis: 여러 노드가 bucket 공유 (Lua 스크립트로 원자적 갱신)
+  Redis 오류 시 프로세스 내 bucket으로 fail-open
+- 초과 시 HTTP 429 + Retry-After
+- 기본 꺼짐: IP bucket은 소켓 peer 주소 기준이므로 LB / reverse proxy 뒤에서 켤 때는
+  RATE_LIMIT_TRUST_FORWARDED_FOR=1 (아니면 모든 사용자가 프록시 주소 하나의 bucket을 공유)
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from datetime import datetime, timezone
+from time import monotonic
+from typing import Optional
+
+from fastapi import HTTPException, Request, status
+
+from app.core.config import (
+    RATE_LIMIT_ENABLED,
+    RATE_LIMIT_BACKEND,
+    REDIS_URL,
+    RATE_LIMIT_IP_PER_SEC,
+    RATE_LIMIT_IP_BURST,
+    RATE_LIMIT_TRUST_FORWARDED_FOR,
+    RATE_LIMIT_MAX_KEYS,
+)
+from app.core.metrics import counter
+from app.schemas.error_codes import ErrorCode
+from app.services.client_validation import get_client_policy
+from app.services.logging_service import log_event, LogLevel
+
+RATE_LIMIT_REJECTIONS = counter(
+    "captcha_rate_limit_rejections_total",
+    "요청 제한으로 거절된 요청 수 (limit=client|ip|quota)",
+    ("scope", "limit"),
+)
+
+# 일일 쿼터 카운터 보관 기간 (UTC 날짜 경계 여유 포함)
+_QUOTA_WINDOW_SECONDS = 2 * 24 * 3600
+
+# Redis 오류 후 이 시간 동안은 바로 프로세스 내 bucket 사용
+_REDIS_RETRY_SECONDS = 5.0
+
+
+# -----------------------
+# 프로세스 내 backend
+# -----------------------
+class LocalRateLimiter:
+    """
+    key → [남은 토큰, 마지막 갱신 시각] LRU
+    bucket이 밀려나면 가득 찬 상태로 다시 시작 (제한이 느슨해지는 방향)
+    """
+
+    def __init__(self, max_keys: int = RATE_LIMIT_MAX_KEYS):
+        self.max_keys = max_keys
+        self._buckets: "OrderedDict[str, list]" = OrderedDict()
+        self._counters: "OrderedDict[str, int]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def acquire(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        """허용되면 0, 거절되면 다시 시도 가능할 때까지의 대기 시간(초)"""
+        now = monotonic()
+        with self._lock:
+            bucket = self._buckets.get(key)
+            if bucket is None:
+                bucket = [burst, now]
+                self._buckets[key] = bucket
+                if len(self._buckets) > self.max_keys:
+                    self._buckets.popitem(last=False)
+            else:
+                self._buckets.move_to_end(key)
+
+            tokens = min(burst, bucket[0] + (now - bucket[1]) * rate)
+            bucket[1] = now
+
+            if tokens >= cost:
+                bucket[0] = tokens - cost
+                return 0.0
+
+            bucket[0] = tokens
+            return (cost - tokens) / rate if rate > 0 else float("inf")
+
+    def incr(self, key: str, window_seconds: int) -> int:
+        """기간 카운터 증가 (key에 기간 구분이 포함되어 있으므로 window는 원격 backend용)"""
+        with self._lock:
+            value = self._counters.get(key, 0) + 1
+            self._counters[key] = value
+            self._counters.move_to_end(key)
+            if len(self._counters) > self.max_keys:
+                self._counters.popitem(last=False)
+            return value
+
+
+# -----------------------
+# Redis backend (선택)
+# -----------------------
+_TOKEN_BUCKET_LUA = """
+local rate = tonumber(ARGV[1])
+local burst = tonumber(ARGV[2])
+local cost = tonumber(ARGV[3])
+local t = redis.call('TIME')
+local now = tonumber(t[1]) + tonumber(t[2]) / 1000000
+
+local state = redis.call('HMGET', KEYS[1], 'tokens', 'ts')
+local tokens = tonumber(state[1]) or burst
+local ts = tonumber(state[2]) or now
+tokens = math.min(burst, tokens + math.max(0, now - ts) * rate)
+
+local wait = 0
+if tokens >= cost then
+    tokens = tokens - cost
+else
+    wait = (cost - tokens) / rate
+end
+
+redis.call('HSET', KEYS[1], 'tokens', tokens, 'ts', now)
+redis.call('EXPIRE', KEYS[1], math.ceil(burst / rate) + 1)
+return tostring(wait)
+"""
+
+
+class RedisRateLimiter:
+    """여러 노드가 공유하는 bucket. 연결/명령 오류 시 fallback(프로세스 내)으로 처리"""
+
+    def __init__(self, url: str, fallback: LocalRateLimiter):
+        import redis  # RATE_LIMIT_BACKEND=redis 일 때만 필요
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self._script = self._client.register_script(_TOKEN_BUCKET_LUA)
+        self._fallback = fallback
+        self._retry_at = 0.0
+
+    def _on_error(self, exc: Exception):
+        if self._retry_at == 0.0:
+            log_event(
+                "RATE_LIMIT_BACKEND_ERROR",
+                {"backend": "redis", "error": repr(exc)},
+                level=LogLevel.WARNING
+            )
+        self._retry_at = monotonic() + _REDIS_RETRY_SECONDS
+
+    def _available(self) -> bool:
+        return monotonic() >= self._retry_at
+
+    def acquire(self, key: str, rate: float, burst: float, cost: float = 1.0) -> float:
+        if not self._available():
+            return self._fallback.acquire(key, rate, burst, cost)
+        try:
+            return float(self._script(keys=[f"rl:{key}"], args=[rate, burst, cost]))
+        except Exception as e:
+            self._on_error(e)
+            return self._fallback.acquire(key, rate, burst, cost)
+
+    def incr(self, key: str, window_seconds: int) -> int:
+        if not self._available():
+            return self._fallback.incr(key, window_seconds)
+        try:
+            pipe = self._client.pipeline()
+            pipe.incr(f"rl:{key}")
+            pipe.expire(f"rl:{key}", window_seconds)
+            return int(pipe.execute()[0])
+        except Exception as e:
+            self._on_error(e)
+            return self._fallback.incr(key, window_seconds)
+
+
+def _create_limiter():
+    local = LocalRateLimiter()
+    if RATE_LIMIT_BACKEND == "redis":
+        return RedisRateLimiter(REDIS_URL, local)
+    return local
+
+
+RATE_LIMITER = _create_limiter()
+
+
+# -----------------------
+# 엔드포인트용 검사
+# -----------------------
+def client_ip(request: Request) -> str:
+    if RATE_LIMIT_TRUST_FORWARDED_FOR:
+        forwarded = request.headers.get("x-forwarded-for")
+        if forwarded:
+            return forwarded.split(",")[0].strip()
+    return request.client.host if request.client else "unknown"
+
+
+def _reject(scope: str, limit: str, retry_after: float):
+    RATE_LIMIT_REJECTIONS.inc(scope=scope, limit=limit)
+    raise HTTPException(
+        status_code=status.HTTP_429_TOO_MANY_REQUESTS,
+        detail={
+            "error": ErrorCode.RATE_LIMITED.value,
+            "message": "요청이 너무 많습니다. 잠시 후 다시 시도해 주세요."
+        },
+        headers={"Retry-After": str(max(1, math.ceil(retry_after)))},
+    )
+
+
+def enforce_rate_limit(scope: str, request: Request, client_id: Optional[str]):
+    """
+    scope("init" | "request" | "submit")별 IP / client_id bucket 검사.
+    미등록 client_id도 ID별 bucket (기본 정책 값)을 사용 → 고객사끼리 서로의 한도를 소진하지 않음
+    (임의 ID 생성 우회는 IP bucket이 막으므로, 프록시 뒤에서는 RATE_LIMIT_TRUST_FORWARDED_FOR=1 필요)
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+
+    wait = RATE_LIMITER.acquire(f"ip:{scope}:{client_ip(request)}", RATE_LIMIT_IP_PER_SEC, RATE_LIMIT_IP_BURST)
+    if wait > 0:
+        _reject(scope, "ip", wait)
+
+    policy = get_client_policy(client_id)
+    wait = RATE_LIMITER.acquire(f"client:{scope}:{client_id or '_anonymous'}", policy["rate_per_sec"], policy["burst"])
+    if wait > 0:
+        _reject(scope, "client", wait)
+
+
+def enforce_session_quota(client_id: str):
+    """
+    고객사별 일일(UTC) 세션 발급 쿼터 검사 (/session/init)
+    """
+    if not RATE_LIMIT_ENABLED:
+        return
+
+    quota = get_client_policy(client_id).get("daily_session_quota")
+    if quota is None:
+        return
+
+    now = datetime.now(timezone.utc)
+    used = RATE_LIMITER.incr(f"quota:{client_id}:{now:%Y%m%d}", _QUOTA_WINDOW_SECONDS)
+    if used > quota:
+        midnight_seconds = 86400 - (now.hour * 3600 + now.minute * 60 + now.second)
+        _reject("init", "quota", midnight_seconds)
@@ -0,0 +1,123 @@
+# app/core/readiness.py
+"""
+워커 startup warmup / readiness 상태
+- 새 워커의 첫 요청이 템플릿 / 폰트 로드, cv2·PIL 첫 호출 초기화, AI 서버 첫 연결 비용을 떠안지 않도록
+  lifespan 시작 시 백그라운드 스레드에서 미리 실행
+- warmup이 끝나기 전과 종료(drain) 중에는 /ready가 503 → 롤링 배포 시 LB가 준비된 워커로만 라우팅
+- /health는 프로세스 생존 여부만 (warmup과 무관)
+- 단계가 실패해도 warmup은 계속 진행 (해당 경로의 첫 요청이 느려질 뿐 서비스 불가는 아님)
+"""
+
+import threading
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from app.core.config import WARMUP_ENABLED
+from app.core.metrics import gauge
+from app.services.logging_service import log_event, LogLevel
+
+READY = gauge("captcha_ready", "readiness 상태 (warmup 완료 후 1, warmup 중 / 종료 중 0)")
+WARMUP_SECONDS = gauge("captcha_warmup_duration_seconds", "startup warmup 단계별 소요 시간", ("step",))
+
+
+# -----------------------
+# warmup 단계
+# -----------------------
+def _warm_templates():
+    from app.utils.image_tools import TICKET_TEMPLATE_PATH, load_template
+    load_template(TICKET_TEMPLATE_PATH)
+
+
+def _warm_fonts():
+    from app.utils.image_tools import load_font
+    load_font(20)   # Phase B 워터마크 최소 크기
+
+
+def _warm_phase_a():
+    # cutline 렌더 / PNG 인코딩 첫 호출 초기화 (결과는 버림)
+    from app.utils.image_tools import generate_phase_a_problem
+    generate_phase_a_problem()
+
+
+def _warm_phase_b():
+    from PIL import Image
+    from app.utils.image_tools import apply_watermark_and_noise, to_base64
+    to_base64(apply_watermark_and_noise(Image.new("RGB", (128, 128)), 1, 0))
+
+
+def _warm_ai_endpoints():
+    # 헬스체크 1회: DNS 조회 / 첫 연결 / 전송 포맷 협상
+    # (연결 실패는 기존 규칙대로 eject, 헬스체크 경로가 없는 서버(404 등)는 eject 없이 액티브 체크에서 제외)
+    from app.services.ai_endpoint_pool import AI_ENDPOINT_POOL
+    AI_ENDPOINT_POOL.check_health_once()
+
+
+WARMUP_STEPS: List[Tuple[str, Callable[[], Any]]] = [
+    ("templates", _warm_templates),
+    ("fonts", _warm_fonts),
+    ("phase_a", _warm_phase_a),
+    ("phase_b", _warm_phase_b),
+    ("ai_endpoints", _warm_ai_endpoints),
+]
+
+
+class Readiness:
+
+    def __init__(self, steps: List[Tuple[str, Callable[[], Any]]]):
+        self.steps = steps
+        self.warmed_up = False
+        self.draining = False
+        self.step_ms: Dict[str, float] = {}
+        self.failed: Dict[str, str] = {}
+        self._thread: Optional[threading.Thread] = None
+
+    def is_ready(self) -> bool:
+        return self.warmed_up and not self.draining
+
+    def status(self) -> Dict[str, Any]:
+        return {
+            "ready": self.is_ready(),
+            "warmed_up": self.warmed_up,
+            "draining": self.draining,
+            "warmup_ms": dict(self.step_ms),
+            "warmup_failed": dict(self.failed),
+        }
+
+    def run_warmup(self):
+        started = perf_counter()
+        for name, step in self.steps:
+            step_started = perf_counter()
+            try:
+                step()
+            except Exception as e:
+                self.failed[name] = repr(e)
+                log_event("WARMUP_STEP_FAILED", {"step": name, "error": repr(e)}, level=LogLevel.WARNING)
+            elapsed = perf_counter() - step_started
+            self.step_ms[name] = round(elapsed * 1000, 2)
+            WARMUP_SECONDS.set(elapsed, step=name)
+
+        self.warmed_up = True
+        READY.set(0 if self.draining else 1)
+        log_event(
+            "WARMUP_COMPLETED",
+            {"elapsed_ms": round((perf_counter() - started) * 1000, 2), "steps": self.step_ms, "failed": self.failed}
+        )
+
+    def start(self):
+        """lifespan 시작 시 호출 (WARMUP_ENABLED=0이면 즉시 ready)"""
+        self.draining = False
+        if not WARMUP_ENABLED:
+            self.warmed_up = True
+            READY.set(1)
+            return
+        if self._thread is None:
+            self._thread = threading.Thread(target=self.run_warmup, name="warmup", daemon=True)
+            self._thread.start()
+
+    def drain(self):
+        """lifespan 종료 시 호출 → 이후 /ready는 503"""
+        self.draining = True
+        READY.set(0)
+
+
+READINESS = Readiness(WARMUP_STEPS)
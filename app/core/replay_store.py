@@ -0,0 +1,89 @@
+# app/core/replay_store.py
+"""
+1회용 ID 기록 (완료 토큰 nonce / 봉인 세션 상태 jti)
+- 기본: 프로세스 내 set → 1회용 보장이 워커(프로세스) 단위
+- REPLAY_STORE_BACKEND=redis: 모든 워커 / 노드가 REDIS_URL의 같은 집합을 공유 (SET NX + 만료)
+  Redis 오류 시 프로세스 내 set으로 fallback (rate limit backend와 같은 방식)
+"""
+
+import math
+import threading
+from collections import OrderedDict
+from time import monotonic, time
+
+from app.core.config import REPLAY_STORE_BACKEND, REDIS_URL
+from app.services.logging_service import log_event, LogLevel
+
+# Redis 오류 후 이 시간 동안은 바로 프로세스 내 set 사용
+_REDIS_RETRY_SECONDS = 5.0
+
+
+class NonceReplaySet:
+    """
+    사용된 nonce → 만료 시각 (TTL이 동일하므로 삽입 순서 = 만료 순서)
+    """
+
+    def __init__(self):
+        self._used: "OrderedDict[str, float]" = OrderedDict()
+        self._lock = threading.Lock()
+
+    def consume(self, nonce: str, expires_at: float) -> bool:
+        """처음 사용되는 nonce면 기록 후 True, 이미 사용됐으면 False"""
+        now = time()
+        with self._lock:
+            while self._used:
+                oldest, exp = next(iter(self._used.items()))
+                if exp >= now:
+                    break
+                del self._used[oldest]
+
+            if nonce in self._used:
+                return False
+            self._used[nonce] = expires_at
+            return True
+
+    def __len__(self) -> int:
+        return len(self._used)
+
+
+class RedisNonceReplaySet:
+    """여러 워커 / 노드가 공유하는 1회용 ID 집합. 연결/명령 오류 시 fallback(프로세스 내)으로 처리"""
+
+    def __init__(self, url: str, namespace: str, fallback: NonceReplaySet):
+        import redis  # REPLAY_STORE_BACKEND=redis 일 때만 필요
+
+        self._client = redis.Redis.from_url(url, socket_timeout=0.05, socket_connect_timeout=0.05)
+        self._namespace = namespace
+        self._fallback = fallback
+        self._retry_at = 0.0
+
+    def consume(self, nonce: str, expires_at: float) -> bool:
+        if monotonic() < self._retry_at:
+            return self._fallback.consume(nonce, expires_at)
+        try:
+            ttl = max(1, math.ceil(expires_at - time()))
+            return bool(self._client.set(f"used:{self._namespace}:{nonce}", 1, nx=True, ex=ttl))
+        except Exception as e:
+            if self._retry_at == 0.0:
+                log_event(
+                    "REPLAY_STORE_BACKEND_ERROR",
+                    {"backend": "redis", "namespace": self._namespace, "error": repr(e)},
+                    level=LogLevel.WARNING
+                )
+            self._retry_at = monotonic() + _REDIS_RETRY_SECONDS
+            return self._fallback.consume(nonce, expires_at)
+
+    def __len__(self) -> int:
+        return len(self._fallback)
+
+
+def create_replay_set(namespace: str):
+    """namespace: 용도별 key 구분 ("token" / "state")"""
+    local = NonceReplaySet()
+    if REPLAY_STORE_BACKEND == "redis":
+        return RedisNonceReplaySet(REDIS_URL, namespace, local)
+    return local
+
+
+def is_shared() -> bool:
+    return REPLAY_STORE_BACKEND == "redis"
@@ -0,0 +1,122 @@
+# app/core/runtime_monitor.py
+"""
+event loop / threadpool 포화 모니터 (lifespan 동안 백그라운드 task)
+- sync endpoint는 anyio 기본 threadpool에서 실행되고 AI 호출이 그 스레드를 붙잡으므로
+  실제 장애 양상은 "스레드 고갈 → 요청이 스레드를 기다리며 쌓임"
+- 주기마다 측정: event loop 지연(lag), threadpool 사용 중 / 전체 스레드 수,
+  스레드를 기다리는 요청 수, 진행 중인 AI 호출 수
+- gauge로 노출하고, 임계값을 넘거나 회복될 때 log_event (상태 변화 시에만 기록)
+"""
+
+import asyncio
+from time import perf_counter
+from typing import Callable, Dict, Any, Optional
+
+import anyio.to_thread
+
+from app.core.config import (
+    RUNTIME_MONITOR_INTERVAL_MS,
+    EVENT_LOOP_LAG_WARN_MS,
+    THREADPOOL_WAITING_WARN,
+)
+from app.core.metrics import gauge, histogram
+from app.services.logging_service import log_event, LogLevel
+
+EVENT_LOOP_LAG = gauge("captcha_event_loop_lag_seconds", "event loop 스케줄링 지연 (최근 측정값)")
+EVENT_LOOP_LAG_HIST = histogram(
+    "captcha_event_loop_lag_distribution_seconds",
+    "event loop 스케줄링 지연 분포",
+    buckets=(0.001, 0.005, 0.01, 0.025, 0.05, 0.1, 0.25, 0.5, 1.0),
+)
+THREADPOOL_BUSY = gauge("captcha_threadpool_busy_threads", "sync endpoint threadpool에서 사용 중인 스레드 수")
+THREADPOOL_TOTAL = gauge("captcha_threadpool_total_threads", "sync endpoint threadpool 최대 스레드 수")
+THREADPOOL_WAITING = gauge("captcha_threadpool_waiting_tasks", "스레드를 기다리는 요청 수")
+AI_INFLIGHT = gauge("captcha_ai_inflight_calls", "진행 중인 AI 서버 호출 수")
+
+# 연속 N회 정상이어야 회복으로 기록 (경계값에서 로그가 반복되지 않도록)
+RESOLVE_AFTER_SAMPLES = 5
+
+
+class RuntimeMonitor:
+
+    def __init__(
+        self,
+        ai_inflight: Callable[[], int],
+        interval_ms: float = RUNTIME_MONITOR_INTERVAL_MS,
+        lag_warn_ms: float = EVENT_LOOP_LAG_WARN_MS,
+        waiting_warn: int = THREADPOOL_WAITING_WARN,
+    ):
+        self.ai_inflight = ai_inflight
+        self.interval = interval_ms / 1000
+        self.lag_warn = lag_warn_ms / 1000
+        self.waiting_warn = waiting_warn
+        # 알림별 상태: None이면 정상, 숫자면 발생 중 (연속 정상 샘플 수)
+        self._alerts: Dict[str, Optional[int]] = {"event_loop_lag": None, "threadpool_saturated": None}
+        self._task: Optional[asyncio.Task] = None
+
+    def sample(self, lag: float) -> Dict[str, Any]:
+        """event loop 스레드에서 호출 (anyio limiter 조회는 loop 안에서만 가능)"""
+        stats = anyio.to_thread.current_default_thread_limiter().statistics()
+        try:
+            ai_inflight = self.ai_inflight()
+        except Exception:
+            ai_inflight = 0
+
+        state = {
+            "event_loop_lag_ms": round(lag * 1000, 2),
+            "threadpool_busy": stats.borrowed_tokens,
+            "threadpool_total": stats.total_tokens,
+            "threadpool_waiting": stats.tasks_waiting,
+            "ai_inflight": ai_inflight,
+        }
+
+        EVENT_LOOP_LAG.set(lag)
+        EVENT_LOOP_LAG_HIST.observe(lag)
+        THREADPOOL_BUSY.set(stats.borrowed_tokens)
+        THREADPOOL_TOTAL.set(stats.total_tokens)
+        THREADPOOL_WAITING.set(stats.tasks_waiting)
+        AI_INFLIGHT.set(ai_inflight)
+
+        self._check("event_loop_lag", lag >= self.lag_warn, state)
+        self._check("threadpool_saturated", stats.tasks_waiting >= self.waiting_warn, state)
+        return state
+
+    def _check(self, alert: str, firing: bool, state: Dict[str, Any]):
+        # 임계값을 넘는 순간 / 회복되는 순간에만 기록 (매 주기 로그 방지)
+        healthy_samples = self._alerts[alert]
+
+        if firing:
+            if healthy_samples is None:
+                log_event("RUNTIME_ALERT", {"alert": alert, **state}, level=LogLevel.WARNING)
+            self._alerts[alert] = 0
+            return
+
+        if healthy_samples is None:
+            return
+        healthy_samples += 1
+        if healthy_samples < RESOLVE_AFTER_SAMPLES:
+            self._alerts[alert] = healthy_samples
+            return
+        self._alerts[alert] = None
+        log_event("RUNTIME_ALERT_RESOLVED", {"alert": alert, **state})
+
+    async def run(self):
+        while True:
+            expected = perf_counter() + self.interval
+            await asyncio.sleep(self.interval)
+            # 예정보다 늦게 깨어난 시간 = 다른 작업이 loop를 붙잡고 있던 시간
+            self.sample(max(0.0, perf_counter() - expected))
+
+    def start(self):
+        if self._task is None:
+            self._task = asyncio.get_running_loop().create_task(self.run(), name="runtime-monitor")
+
+    async def stop(self):
+        if self._task is None:
+            return
+        self._task.cancel()
+        try:
+            await self._task
+        except asyncio.CancelledError:
+            pass
+        self._task = None
@@ -0,0 +1,301 @@
+# app/core/security_layer.py
+
+import json
+from time import perf_counter, time
+
+from fastapi import Request
+from fastapi.responses import JSONResponse, Response
+from starlette.datastructures import Headers
+
+from app.core.admission import OverloadedError
+from app.core.config import MAX_REQUEST_BODY_BYTES, SERVER_TIMING_ENABLED, TRACE_SLOW_REQUEST_MS
+from app.core.session_store import REQUEST_SESSIONS
+from app.core.session_state import (
+    SESSION_STATE_HEADER,
+    SessionStateError,
+    seal_session_state,
+    unseal_session_state,
+)
+from app.core.traffic_capture import CAPTURED_PATHS, TRAFFIC_RECORDER, token_session_id
+from app.core.tracing import (
+    CURRENT_TRACE,
+    REQUEST_ID_HEADER,
+    RequestTrace,
+    format_server_timing,
+    new_request_id,
+)
+from app.schemas.common import BaseResponse, ErrorInfo
+from app.schemas.error_codes import ErrorCode
+from app.services.logging_service import log_event, LogLevel
+
+# Server-Timing을 붙이는 사용자 대면 API (서버 간 /verify 응답에는 미포함)
+SERVER_TIMING_PATHS = ("/api/v1/session/init", "/api/v1/captcha/request", "/api/v1/captcha/submit")
+
+
+# -----------------------
+# 요청 tracing (X-Request-Id / Server-Timing / 느린 요청 로그)
+# -----------------------
+async def trace_request(request: Request, call_next):
+    """
+    요청마다 trace를 열어 stage_timer / span 구간을 모으고,
+    응답에 X-Request-Id (+ 설정 시 Server-Timing)를 붙인다.
+    """
+    trace = RequestTrace(new_request_id(request.headers.get(REQUEST_ID_HEADER)))
+    token = CURRENT_TRACE.set(trace)
+    try:
+        response = await call_next(request)
+    finally:
+        CURRENT_TRACE.reset(token)
+
+    response.headers[REQUEST_ID_HEADER] = trace.request_id
+    if SERVER_TIMING_ENABLED and request.url.path in SERVER_TIMING_PATHS:
+        response.headers["Server-Timing"] = format_server_timing(trace)
+
+    elapsed_ms = trace.elapsed() * 1000
+    if TRACE_SLOW_REQUEST_MS > 0 and elapsed_ms > TRACE_SLOW_REQUEST_MS:
+        log_event(
+            "SLOW_REQUEST",
+            {
+                "request_id": trace.request_id,
+                "path": request.url.path,
+                "status_code": response.status_code,
+                "elapsed_ms": round(elapsed_ms, 2),
+                "spans": [
+                    {"name": name, "start_ms": round(start * 1000, 2), "duration_ms": round(duration * 1000, 2)}
+                    for name, start, duration in trace.spans
+                ],
+            },
+            level=LogLevel.WARNING
+        )
+    return response
+
+
+# -----------------------
+# 요청 body 크기 제한
+# -----------------------
+class _RequestBodyTooLarge(Exception):
+    pass
+
+
+def _body_too_large_response() -> JSONResponse:
+    body = BaseResponse(
+        success=False,
+        error=ErrorInfo(
+            code=ErrorCode.INVALID_PAYLOAD,
+            message=f"요청 크기는 최대 {MAX_REQUEST_BODY_BYTES} bytes까지 허용됩니다.",
+        ),
+    )
+    return JSONResponse(status_code=413, content=body.model_dump(mode="json"))
+
+
+class RequestBodySizeLimit:
+    """
+    요청 body가 MAX_REQUEST_BODY_BYTES를 넘으면 413으로 거절.
+    (과도하게 큰 points 제출로부터 CPU / AI 서버 보호)
+    - Content-Length가 한도를 넘으면 body를 읽기 전에 바로 거절
+    - Content-Length가 없는 요청(chunked)도 receive를 감싸 도착한 bytes를 세고,
+      한도를 넘는 순간 읽기를 중단 → 전체 body를 버퍼링 / 파싱하지 않음
+    - body를 읽는 쪽(FastAPI body 파싱 등)이 예외를 다른 응답으로 바꿔도 413으로 대체
+      (app.middleware("http") 방식으로는 receive를 감쌀 수 없어 ASGI middleware로 구현)
+    """
+
+    def __init__(self, app):
+        self.app = app
+
+    async def __call__(self, scope, receive, send):
+        if scope["type"] != "http":
+            await self.app(scope, receive, send)
+            return
+
+        content_length = Headers(scope=scope).get("content-length")
+        if content_length is not None and content_length.isdigit() \
+                and int(content_length) > MAX_REQUEST_BODY_BYTES:
+            await _body_too_large_response()(scope, receive, send)
+            return
+
+        received = 0
+        exceeded = False
+        response_started = False
+
+        async def limited_receive():
+            nonlocal received, exceeded
+            message = await receive()
+            if message["type"] == "http.request":
+                received += len(message.get("body", b""))
+                if received > MAX_REQUEST_BODY_BYTES:
+                    exceeded = True
+                    raise _RequestBodyTooLarge()
+            return message
+
+        async def guarded_send(message):
+            nonlocal response_started
+            if exceeded and not response_started:
+                return   # 한도 초과 후 안쪽에서 만든 응답(400 / 500 등)은 버리고 아래에서 413 전송
+            response_started = True
+            await send(message)
+
+        try:
+            await self.app(scope, limited_receive, guarded_send)
+        except Exception:
+            # 한도 초과로 중단된 읽기가 안쪽 middleware에서 다른 예외로 감싸져 올라올 수 있음
+            if not exceeded:
+                raise
+
+        if exceeded and not response_started:
+            await _body_too_large_response()(scope, receive, send)
+
+
+# -----------------------
+# 과부하 응답 (admission control)
+# -----------------------
+async def overloaded_exception_handler(request: Request, exc: OverloadedError):
+    """
+    동시 실행 한도 초과로 거절된 요청 → 503 + Retry-After (대기열에 쌓지 않고 즉시 응답)
+    """
+    body = BaseResponse(
+        success=False,
+        error=ErrorInfo(
+            code=ErrorCode.OVERLOADED,
+            message="요청이 많아 잠시 처리할 수 없습니다. 잠시 후 다시 시도해 주세요.",
+            detail={"resource": exc.resource, "retry_after": exc.retry_after},
+        ),
+    )
+    return JSONResponse(
+        status_code=503,
+        content=body.model_dump(mode="json"),
+        headers={"Retry-After": str(exc.retry_after)},
+    )
+
+
+# -----------------------
+# stateless 세션 상태 (SESSION_STATE_MODE=stateless)
+# -----------------------
+async def bind_session_state(request: Request, call_next):
+    """
+    X-Session-State 헤더의 봉인된 세션을 복원해 이번 요청의 세션 저장소로 사용하고,
+    처리 후 갱신된 세션을 다시 봉인해 응답 헤더로 돌려준다. (SESSION_STORE 미사용)
+    - 복원 시 jti를 먼저 소비하므로(동시 재제출 차단) 처리 중 예외가 나면
+      요청 전 세션을 새 jti로 다시 봉인해 500 응답과 함께 돌려줌 → 클라이언트가 같은 단계부터 재시도 가능
+    """
+    sessions = {}
+    sealed = request.headers.get(SESSION_STATE_HEADER)
+
+    if sealed:
+        try:
+            session = unseal_session_state(sealed)
+        except SessionStateError as e:
+            body = BaseResponse(
+                success=False,
+                error=ErrorInfo(
+                    code=ErrorCode.INVALID_SESSION_STATE,
+                    message="세션 상태가 유효하지 않습니다.",
+                    detail={"reason": e.reason},
+                ),
+            )
+            return JSONResponse(status_code=403, content=body.model_dump(mode="json"))
+        sessions[session["session_id"]] = session
+
+    token = REQUEST_SESSIONS.set(sessions)
+    try:
+        response = await call_next(request)
+    except Exception as e:
+        if not sealed:
+            raise
+        log_event(
+            "SESSION_STATE_HANDLER_ERROR",
+            {"path": request.url.path, "error": repr(e)},
+            level=LogLevel.ERROR
+        )
+        # 처리 중 일부만 반영됐을 수 있는 세션 대신 요청 전 세션을 복원 (jti는 이미 소비됨)
+        body = BaseResponse(
+            success=False,
+            error=ErrorInfo(
+                code=ErrorCode.INTERNAL_ERROR,
+                message="요청을 처리하지 못했습니다. 다시 시도해 주세요.",
+            ),
+        )
+        return JSONResponse(
+            status_code=500,
+            content=body.model_dump(mode="json"),
+            headers={SESSION_STATE_HEADER: seal_session_state(unseal_session_state(sealed, consume=False))},
+        )
+    finally:
+        REQUEST_SESSIONS.reset(token)
+
+    # 세션은 요청당 하나 (init으로 생성됐거나 헤더로 복원된 세션)
+    if len(sessions) == 1:
+        response.headers[SESSION_STATE_HEADER] = seal_session_state(next(iter(sessions.values())))
+    return response
+
+
+# -----------------------
+# 트래픽 샘플 기록 (TRAFFIC_CAPTURE_PATH 설정 시, 재생용)
+# -----------------------
+async def capture_traffic(request: Request, call_next):
+    """
+    샘플링된 세션의 init → request → submit → verify 요청을 기록.
+    stateless 모드에서도 세션을 볼 수 있도록 bind_session_state 안쪽에 등록한다.
+    """
+    phase = CAPTURED_PATHS.get(request.url.path)
+    recorder = TRAFFIC_RECORDER
+    if phase is None or recorder is None or recorder.stopped:
+        return await call_next(request)
+
+    body = None
+    if phase == "init":
+        session_id = None   # 샘플링 여부는 응답의 session_id로 결정
+    elif phase == "verify":
+        try:
+            body = json.loads(await request.body() or b"null")
+        except ValueError:
+            return await call_next(request)
+        body = body if isinstance(body, dict) else {}
+        session_id = body.get("session_id") or token_session_id(str(body.get("token") or ""))
+    else:
+        session_id = request.headers.get("x-session-id")
+
+    if phase != "init" and not recorder.is_sampled(session_id):
+        return await call_next(request)
+
+    # submit: A / B 구분과 정답 여부는 처리 전 세션 기준
+    record_body = None
+    if phase == "submit":
+        phase = recorder.submit_phase(session_id)
+        try:
+            body = json.loads(await request.body() or b"null")
+        except ValueError:
+            body = None
+    if phase != "init":
+        record_body = recorder.build_body(phase, session_id, body)
+
+    started_at, started = time(), perf_counter()
+    response = await call_next(request)
+    latency_ms = (perf_counter() - started) * 1000
+
+    if phase == "init":
+        # 새 session_id는 응답 body에서 확인 (body를 읽었으므로 응답을 다시 구성)
+        content = b"".join([chunk async for chunk in response.body_iterator])
+        response = Response(
+            content=content,
+            status_code=response.status_code,
+            headers=dict(response.headers),
+            media_type=response.media_type,
+        )
+        try:
+            session_id = (json.loads(content).get("data") or {}).get("session_id")
+        except (ValueError, AttributeError):
+            session_id = None
+        if not recorder.is_sampled(session_id):
+            return response
+
+    recorder.record(
+        phase=phase,
+        path=request.url.path,
+        session_id=session_id,
+        headers=dict(request.headers),
+        body=record_body,
+        status_code=response.status_code,
+        started_at=started_at,
+        latency_ms=latency_ms,
+    )
+    return response
@@ -0,0 +1,138 @@
+# app/core/session_state.py
+"""
+stateless 모드용 세션 상태 봉인(seal) / 복원(unseal)
+- 세션 dict 전체(target_path, correct_uuids, fail_count 등)를 AES-256-GCM으로 암호화 + 인증
+- 형식: "v1.<kid>.<base64url(nonce 12B + ciphertext)>", 평문은 zlib 압축 JSON
+- 상태마다 1회용 jti를 넣고, 복원 시 소비 → 이전 단계 상태 재제출(replay) 차단
+  (서버에 남는 것은 세션 만료 시각까지의 jti 집합뿐, 어느 워커 / 노드로 재제출해도 차단되도록
+   여러 워커에서는 REPLAY_STORE_BACKEND=redis 공유 집합 필수)
+- cryptography 패키지는 stateless 모드에서만 필요하므로 지연 import
+"""
+
+import base64
+import hashlib
+import json
+import secrets
+import zlib
+from typing import Dict, Any, Optional
+
+from app.core.config import SESSION_STATE_KEYS, SESSION_STATE_MODE, WORKER_COUNT
+from app.core.replay_store import create_replay_set, is_shared
+from app.services.logging_service import log_event, LogLevel
+
+STATE_VERSION = "v1"
+SESSION_STATE_HEADER = "X-Session-State"
+
+_NONCE_BYTES = 12
+
+
+class SessionStateError(ValueError):
+    """상태 토큰 복원 실패 (reason: malformed / unknown_kid / decrypt_failed / replayed)"""
+
+    def __init__(self, reason: str):
+        super().__init__(reason)
+        self.reason = reason
+
+
+# 사용된 jti (세션 만료 시각까지 보관, REPLAY_STORE_BACKEND=redis면 워커 / 노드 간 공유)
+USED_STATE_IDS = create_replay_set("state")
+
+_CIPHERS: Optional[Dict[str, Any]] = None
+_SEALING_KID: Optional[str] = None
+
+
+def _load_ciphers():
+    """첫 사용 시 키별 AESGCM 객체 생성 (secret 문자열 → SHA-256 → 256bit 키)"""
+    global _CIPHERS, _SEALING_KID
+    if _CIPHERS is not None:
+        return
+
+    from cryptography.hazmat.primitives.ciphers.aead import AESGCM
+
+    keys = SESSION_STATE_KEYS
+    if not keys:
+        # stateless 모드는 시작 시 check_session_state_config로 키 설정을 강제
+        raise RuntimeError("SESSION_STATE_KEYS가 설정되지 않았습니다.")
+
+    _CIPHERS = {
+        kid: AESGCM(hashlib.sha256(secret.encode("utf-8")).digest())
+        for kid, secret in keys
+    }
+    _SEALING_KID = keys[0][0]
+
+
+def check_session_state_config():
+    """
+    lifespan 시작 시 호출. stateless 모드에서
+    - 키가 없으면 시작 중단 (워커별 임시 키로는 다른 워커 / 노드가 상태를 복원할 수 없음)
+    - 여러 워커인데 jti 집합이 워커 단위면 시작 중단 (다른 워커로 재제출하면 fail_count 초기화 / PHASE_B 상태 재사용 가능)
+    """
+    if SESSION_STATE_MODE != "stateless":
+        return
+
+    if not SESSION_STATE_KEYS:
+        raise RuntimeError("SESSION_STATE_MODE=stateless에는 SESSION_STATE_KEYS가 필요합니다.")
+
+    if not is_shared():
+        if WORKER_COUNT > 1:
+            raise RuntimeError(
+                f"SESSION_STATE_MODE=stateless, WEB_CONCURRENCY={WORKER_COUNT}에는 REPLAY_STORE_BACKEND=redis가 필요합니다."
+            )
+        log_event(
+            "SESSION_STATE_REPLAY_SET_PER_PROCESS",
+            {"message": "REPLAY_STORE_BACKEND=memory에서는 상태 재제출 차단이 이 프로세스 안에서만 보장됩니다."},
+            level=LogLevel.WARNING
+        )
+
+
+def _aad(kid: str) -> bytes:
+    return f"{STATE_VERSION}.{kid}".encode("ascii")
+
+
+def seal_session_state(session: Dict[str, Any]) -> str:
+    """세션 dict → 상태 토큰 (호출마다 새 jti / nonce)"""
+    _load_ciphers()
+
+    plaintext = zlib.compress(json.dumps(
+        {"s": session, "j": secrets.token_urlsafe(12)},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8"))
+
+    nonce = secrets.token_bytes(_NONCE_BYTES)
+    ciphertext = _CIPHERS[_SEALING_KID].encrypt(nonce, plaintext, _aad(_SEALING_KID))
+    blob = base64.urlsafe_b64encode(nonce + ciphertext).rstrip(b"=").decode("ascii")
+    return f"{STATE_VERSION}.{_SEALING_KID}.{blob}"
+
+
+def unseal_session_state(token: str, consume: bool = True) -> Dict[str, Any]:
+    """
+    상태 토큰 → 세션 dict. jti를 소비하므로 같은 토큰은 한 번만 복원된다.
+    consume=False: jti를 소비하지 않고 복호화만 (이미 소비한 토큰의 요청 전 세션을 다시 얻을 때)
+    실패 시 SessionStateError
+    """
+    _load_ciphers()
+    from cryptography.exceptions import InvalidTag
+
+    parts = token.split(".")
+    if len(parts) != 3 or parts[0] != STATE_VERSION:
+        raise SessionStateError("malformed")
+
+    _, kid, blob = parts
+    cipher = _CIPHERS.get(kid)
+    if cipher is None:
+        raise SessionStateError("unknown_kid")
+
+    try:
+        raw = base64.urlsafe_b64decode(blob + "=" * (-len(blob) % 4))
+        plaintext = cipher.decrypt(raw[:_NONCE_BYTES], raw[_NONCE_BYTES:], _aad(kid))
+    except (InvalidTag, ValueError):
+        raise SessionStateError("decrypt_failed")
+
+    state = json.loads(zlib.decompress(plaintext))
+    session = state["s"]
+
+    if consume and not USED_STATE_IDS.consume(state["j"], session["expires_at"] / 1000):
+        raise SessionStateError("replayed")
+
+    return session
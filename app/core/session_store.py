@@ -1,19 +1,36 @@
 # core/session_store.py
 
+from contextvars import ContextVar
 from uuid import uuid4
 from time import time
-from typing import Dict, Any
+from typing import Dict, Any, List, Optional
 
 from fastapi import HTTPException, status
 from app.core.state_machine import SessionStatus, STATE_TRANSITION_RULES # 1210 enum 도입 + 헬퍼 추가
+from app.core.metrics import gauge, register_collector, stage_timer
+from app.services.logging_service import log_event, LogLevel
 
 
 # In-Memory Store
 SESSION_STORE: Dict[str, Dict[str, Any]] = {}
 
+# 요청 단위 세션 (stateless 모드: X-Session-State에서 복원한 세션만 사용, SESSION_STORE 미사용)
+# None이면 기존처럼 SESSION_STORE 사용
+REQUEST_SESSIONS: ContextVar[Optional[Dict[str, Dict[str, Any]]]] = ContextVar(
+    "request_sessions", default=None
+)
+
+
+def _sessions() -> Dict[str, Dict[str, Any]]:
+    overlay = REQUEST_SESSIONS.get()
+    return SESSION_STORE if overlay is None else overlay
+
 # 설정 (TODO: config.py로 분리 가능)
 SESSION_TTL_SECONDS = 600   # 10분
 
+SESSION_STORE_SIZE = gauge("captcha_session_store_entries", "메모리 세션 저장소에 있는 세션 수 (만료 포함)")
+register_collector(lambda: SESSION_STORE_SIZE.set(len(SESSION_STORE)))
+
 
 # -----------------------
 # Session 생성
@@ -35,6 +52,7 @@ def create_session(client_id: str) -> Dict[str, Any]:
 
         "phase_a": {
             "target_path": [],
+            "image_size": [],
             "attempts": 0
         },
 
@@ -45,7 +63,7 @@ def create_session(client_id: str) -> Dict[str, Any]:
         }
     }
 
-    SESSION_STORE[session_id] = session_data
+    _sessions()[session_id] = session_data
 
     # API 응답 구조
     return {
@@ -63,7 +81,8 @@ def get_session_and_validate(session_id: str) -> Dict[str, Any]:
     FastAPI 환경에 최적화된 세션 조회 함수
     세션이 없거나 만료된 경우 HTTPException 발생
     """
-    session = SESSION_STORE.get(session_id)
+    with stage_timer("session_lookup"):
+        session = _sessions().get(session_id)
 
     if session is None:
         raise HTTPException(404, "SESSION_NOT_FOUND")
@@ -73,6 +92,18 @@ def get_session_and_validate(session_id: str) -> Dict[str, Any]:
         
     return session
 
+# -----------------------
+# 세션 일괄 조회 (서버 간 batch verify)
+# -----------------------
+def get_sessions_bulk(session_ids: List[str]) -> Dict[str, Optional[Dict[str, Any]]]:
+    """
+    여러 세션을 한 번에 조회한다. 없는 세션은 None.
+    (원격 저장소로 옮길 경우 이 함수만 MGET / pipeline 1회로 교체)
+    예외를 던지지 않으며 만료 여부 판단은 호출 측에서 is_session_expired로 수행
+    """
+    store_get = _sessions().get
+    return {session_id: store_get(session_id) for session_id in set(session_ids)}
+
 # -----------------------
 # 상태 전이 + 로그 (중요)
 # -----------------------
@@ -81,10 +112,11 @@ def set_session_status(session_id: str, new_status: SessionStatus):
     상태 전이를 안전하게 수행하고 로그 출력.
     모든 서비스는 문자열로 상태 업데이트하지 말고 이 함수를 사용해야 함.
     """
-    if session_id not in SESSION_STORE:
+    sessions = _sessions()
+    if session_id not in sessions:
         raise HTTPException(404, "SESSION_NOT_FOUND")
 
-    session = SESSION_STORE[session_id]
+    session = sessions[session_id]
 
     old_status = SessionStatus(session["status"])
 #    new_status = SessionStatus(new_status)  # 혹시 문자열 들어올 때 대비
@@ -103,18 +135,23 @@ def set_session_status(session_id: str, new_status: SessionStatus):
     # 2) 상태 실제 업데이트
     session["status"] = new_status.value
 
-    # 3) 디버그 로그 출력
-    print(f"[STATE] {old_status.value} → {new_status.value}  (session_id={session_id})")
+    # 3) 디버그 로그 (LOG_LEVEL=debug 일 때만 기록)
+    log_event(
+        "SESSION_STATE_TRANSITION",
+        {"session_id": session_id, "from": old_status.value, "to": new_status.value},
+        level=LogLevel.DEBUG
+    )
 
 
 # -----------------------
 # 세션 업데이트 (안전한 딕셔너리 병합)
 # -----------------------
 def update_session(session_id: str, data: Dict[str, Any]):
-    if session_id not in SESSION_STORE:
+    sessions = _sessions()
+    if session_id not in sessions:
         raise HTTPException(404, "SESSION_NOT_FOUND")
 
-    session = SESSION_STORE[session_id]
+    session = sessions[session_id]
 
     # 깊은 병합 (중첩 dict만 update)
     for key, value in data.items():
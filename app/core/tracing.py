@@ -0,0 +1,101 @@
+# app/core/tracing.py
+"""
+요청 단위 경량 tracing
+- 요청마다 request_id + span 목록을 ContextVar에 보관 (sync endpoint의 worker thread에도 전파됨)
+- stage_timer() / span()으로 측정한 구간이 현재 요청의 span으로 쌓임
+- request_id는 X-Request-Id로 응답 / AI 서버 호출 / 로그에 함께 실려 백엔드·GPU 측 지연을 한 시도 단위로 연결
+- span 목록은 Server-Timing 헤더(선택) / 느린 요청 로그로 출력
+"""
+
+import re
+from contextvars import ContextVar
+from time import perf_counter
+from typing import List, Optional, Tuple
+from uuid import uuid4
+
+REQUEST_ID_HEADER = "X-Request-Id"
+
+# 외부에서 받은 request_id는 헤더 / 로그에 그대로 실리므로 형식 제한
+_VALID_REQUEST_ID = re.compile(r"^[A-Za-z0-9._:\-]{1,64}$")
+
+# 요청당 span 수 상한 (루프 안의 stage_timer가 헤더를 키우지 않도록)
+MAX_SPANS = 64
+
+
+class RequestTrace:
+    __slots__ = ("request_id", "started", "spans")
+
+    def __init__(self, request_id: str):
+        self.request_id = request_id
+        self.started = perf_counter()
+        # (이름, 요청 시작 기준 시작 시각(초), 소요 시간(초))
+        self.spans: List[Tuple[str, float, float]] = []
+
+    def add_span(self, name: str, started: float, duration: float):
+        if len(self.spans) < MAX_SPANS:
+            self.spans.append((name, started - self.started, duration))
+
+    def elapsed(self) -> float:
+        return perf_counter() - self.started
+
+    def stage_totals(self) -> List[Tuple[str, float, int]]:
+        """같은 이름의 span을 합산 → [(이름, 합계(초), 횟수)] (처음 등장한 순서)"""
+        totals = {}
+        for name, _, duration in self.spans:
+            total, count = totals.get(name, (0.0, 0))
+            totals[name] = (total + duration, count + 1)
+        return [(name, total, count) for name, (total, count) in totals.items()]
+
+
+CURRENT_TRACE: ContextVar[Optional[RequestTrace]] = ContextVar("current_trace", default=None)
+
+
+def new_request_id(incoming: Optional[str] = None) -> str:
+    """클라이언트가 보낸 X-Request-Id가 형식에 맞으면 그대로 사용, 아니면 새로 발급"""
+    if incoming and _VALID_REQUEST_ID.match(incoming):
+        return incoming
+    return uuid4().hex
+
+
+def current_request_id() -> Optional[str]:
+    trace = CURRENT_TRACE.get()
+    return trace.request_id if trace is not None else None
+
+
+def record_span(name: str, started: float, duration: float):
+    """요청 처리 중이면 현재 trace에 span 추가 (요청 밖이면 무시)"""
+    trace = CURRENT_TRACE.get()
+    if trace is not None:
+        trace.add_span(name, started, duration)
+
+
+class span:
+    """
+    with span("ai_slot_wait"):
+        ...
+    메트릭 없이 trace에만 남기는 구간 (메트릭도 필요하면 metrics.stage_timer 사용)
+    """
+
+    __slots__ = ("name", "started")
+
+    def __init__(self, name: str):
+        self.name = name
+        self.started = 0.0
+
+    def __enter__(self):
+        self.started = perf_counter()
+        return self
+
+    def __exit__(self, exc_type, exc, tb):
+        record_span(self.name, self.started, perf_counter() - self.started)
+        return False
+
+
+def format_server_timing(trace: RequestTrace) -> str:
+    """Server-Timing 헤더 값 (단계별 합계 ms + 전체)"""
+    entries = [
+        f'{name};dur={total * 1000:.2f}' + (f';desc="x{count}"' if count > 1 else "")
+        for name, total, count in trace.stage_totals()
+    ]
+    entries.append(f"total;dur={trace.elapsed() * 1000:.2f}")
+    return ", ".join(entries)
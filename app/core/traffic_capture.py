@@ -0,0 +1,240 @@
+# app/core/traffic_capture.py
+"""
+실제 트래픽 샘플 기록 (오프라인 성능 재현용, 기본 꺼짐)
+- TRAFFIC_CAPTURE_PATH 설정 시에만 동작, 세션 단위로 TRAFFIC_CAPTURE_SAMPLE_RATE 비율만 기록
+  (한 세션의 init → request → submit → verify 흐름을 통째로 기록해야 재생 가능)
+- 샘플링 / 익명화 모두 TRAFFIC_CAPTURE_KEY의 HMAC(session_id)로 결정 → 프로세스 상태 없이
+  어느 워커 / 노드에서 처리해도 같은 세션은 같은 판정 / 같은 seq
+- 기록 항목: 시각, 경로, 단계(phase), 허용된 헤더, 제출 body, 원래 응답 상태 / 소요 시간
+  (Phase A 제출에는 당시 절취선 중심 x를 reference_x로 함께 기록)
+- 익명화: session_id는 HMAC으로 치환, 완료 토큰은 제거,
+  Phase B 답안(이미지 id)은 개수 / 정답 여부만 기록, IP 등 나머지 헤더는 기록하지 않음
+- append-only JSON Lines (경로가 .gz면 batch마다 gzip member 추가), writer 스레드가 배치 기록
+  (batch는 write 1회로 추가 → 같은 파일에 여러 워커가 기록해도 줄이 섞이지 않음)
+- 파일의 디스크상 크기(gzip이면 압축 후)가 TRAFFIC_CAPTURE_MAX_BYTES에 도달하면 기록 중단
+
+재생: python -m benchmarks.replay <파일>
+"""
+
+import atexit
+import base64
+import gzip
+import hashlib
+import hmac
+import json
+import os
+import secrets
+import threading
+from collections import deque
+from typing import Any, Dict, Optional
+
+from app.core.config import (
+    TRAFFIC_CAPTURE_PATH,
+    TRAFFIC_CAPTURE_SAMPLE_RATE,
+    TRAFFIC_CAPTURE_MAX_BYTES,
+    TRAFFIC_CAPTURE_KEY,
+    WORKER_COUNT,
+)
+from app.core.session_store import _sessions
+from app.core.state_machine import SessionStatus
+from app.services.logging_service import log_event, LogLevel
+
+CAPTURE_FORMAT_VERSION = 1
+
+# 기록하는 요청 헤더 (그 외 헤더는 기록하지 않음)
+CAPTURED_HEADERS = ("x-client-id", "content-type")
+
+# 재생 대상 경로 → 단계 (submit은 세션 상태로 A / B 구분)
+CAPTURED_PATHS = {
+    "/api/v1/session/init": "init",
+    "/api/v1/captcha/request": "request",
+    "/api/v1/captcha/submit": "submit",
+    "/api/v1/captcha/verify": "verify",
+}
+
+MAX_QUEUE = 10_000
+FLUSH_INTERVAL_SECONDS = 0.5
+
+
+def token_session_id(token: str) -> Optional[str]:
+    """완료 토큰 payload의 sid (서명 검증 없이 읽기만, 기록 대상 판별용)"""
+    try:
+        body = token.split(".")[2]
+        return json.loads(base64.urlsafe_b64decode(body + "=" * (-len(body) % 4)))["sid"]
+    except (IndexError, ValueError, KeyError, TypeError):
+        return None
+
+
+class TrafficRecorder:
+
+    def __init__(self, path: str, sample_rate: float, max_bytes: int, key: Optional[str] = None):
+        self.path = path
+        self.sample_rate = sample_rate
+        self.max_bytes = max_bytes
+        self.written_bytes = 0
+        self.stopped = False
+
+        # 키 미설정 시 프로세스 전용 임시 키 (워커마다 샘플링 / seq가 달라짐 → check_traffic_capture_key)
+        self._key = key.encode("utf-8") if key else secrets.token_bytes(16)
+        self._lock = threading.Lock()
+        self._write_lock = threading.Lock()   # writer 스레드 / atexit flush가 batch를 섞어 쓰지 않도록
+        self._queue: deque = deque()
+        self._wakeup = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+
+    # -----------------------
+    # 샘플링 / 익명화 (session_id의 HMAC으로 결정)
+    # -----------------------
+    def _digest(self, session_id: str) -> bytes:
+        return hmac.new(self._key, session_id.encode("utf-8"), hashlib.sha256).digest()
+
+    def is_sampled(self, session_id: Optional[str]) -> bool:
+        if session_id is None or self.stopped:
+            return False
+        return int.from_bytes(self._digest(session_id)[:8], "big") / 2 ** 64 < self.sample_rate
+
+    def anonymize(self, session_id: str) -> str:
+        return self._digest(session_id).hex()[:16]
+
+    # -----------------------
+    # 기록 항목 구성
+    # -----------------------
+    def submit_phase(self, session_id: str) -> str:
+        session = _sessions().get(session_id)
+        if session is not None and session.get("status") == SessionStatus.PHASE_B.value:
+            return "submit_b"
+        return "submit_a"
+
+    def _answer_summary(self, session_id: str, answer: Any) -> Dict[str, Any]:
+        """Phase B 답안은 이미지 id 대신 개수 / 정답 여부만 (재생 시 새 문제에서 같은 정오답으로 제출)"""
+        answer = answer if isinstance(answer, list) else []
+        session = _sessions().get(session_id) or {}
+        correct_uuids = (session.get("phase_b") or {}).get("correct_uuids")
+        correct = set(answer) == set(correct_uuids) if correct_uuids else None
+        return {"count": len(answer), "correct": correct}
+
+    def _reference_x(self, session_id: str) -> Optional[float]:
+        """Phase A 절취선 중심 x (0~1), 재생 시 드래그를 새 문제의 절취선 위치로 옮기는 기준"""
+        phase_a = (_sessions().get(session_id) or {}).get("phase_a") or {}
+        target_path, image_size = phase_a.get("target_path"), phase_a.get("image_size")
+        if not target_path or not image_size:
+            return None
+        return round(sum(p["x"] for p in target_path) / len(target_path) / image_size[0], 5)
+
+    def build_body(self, phase: str, session_id: Optional[str], body: Any) -> Any:
+        if not isinstance(body, dict):
+            return None
+        if phase == "submit_a":
+            return {**body, "reference_x": self._reference_x(session_id)}
+        if phase == "submit_b":
+            body = dict(body)
+            if "user_answer" in body:
+                body["user_answer"] = self._answer_summary(session_id, body["user_answer"])
+            return body
+        if phase == "verify":
+            return {
+                "session_id": self.anonymize(body["session_id"]) if body.get("session_id") else None,
+                "token": "<token>" if body.get("token") else None,
+            }
+        return None
+
+    def record(
+        self,
+        phase: str,
+        path: str,
+        session_id: str,
+        headers: Dict[str, str],
+        body: Any,
+        status_code: int,
+        started_at: float,
+        latency_ms: float,
+    ):
+        """body는 build_body로 익명화된 값 (submit 처리 전 세션 기준으로 만들어야 함)"""
+        if self.stopped:
+            return
+        if len(self._queue) >= MAX_QUEUE:
+            return
+        self._ensure_writer()
+        self._queue.append({
+            "v": CAPTURE_FORMAT_VERSION,
+            "seq": self.anonymize(session_id),
+            "ts": round(started_at, 4),
+            "phase": phase,
+            "path": path,
+            "headers": {name: headers[name] for name in CAPTURED_HEADERS if name in headers},
+            "body": body,
+            "status": status_code,
+            "latency_ms": round(latency_ms, 2),
+        })
+
+    # -----------------------
+    # writer 스레드
+    # -----------------------
+    def _ensure_writer(self):
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, name="traffic-capture", daemon=True)
+            self._thread.start()
+            atexit.register(self.flush)
+
+    def _run(self):
+        while True:
+            self._wakeup.wait(FLUSH_INTERVAL_SECONDS)
+            self._wakeup.clear()
+            self.flush()
+
+    def flush(self):
+        with self._write_lock:
+            lines = []
+            while self._queue:
+                lines.append(json.dumps(self._queue.popleft(), separators=(",", ":"), ensure_ascii=False))
+            if not lines or self.stopped:
+                return
+
+            data = ("\n".join(lines) + "\n").encode("utf-8")
+            if self.path.endswith(".gz"):
+                data = gzip.compress(data)   # batch마다 gzip member 1개 (이어 붙인 member는 gzip.open으로 연속 읽기)
+            try:
+                with open(self.path, "ab") as f:
+                    f.write(data)
+                self.written_bytes = os.path.getsize(self.path)
+            except OSError as e:
+                self.stopped = True
+                log_event("TRAFFIC_CAPTURE_STOPPED", {"reason": "write_failed", "error": repr(e)}, level=LogLevel.ERROR)
+                return
+
+            if self.written_bytes >= self.max_bytes:
+                self.stopped = True
+                log_event(
+                    "TRAFFIC_CAPTURE_STOPPED",
+                    {"reason": "max_bytes", "path": self.path, "written_bytes": self.written_bytes},
+                    level=LogLevel.WARNING
+                )
+
+
+TRAFFIC_RECORDER: Optional[TrafficRecorder] = (
+    TrafficRecorder(TRAFFIC_CAPTURE_PATH, TRAFFIC_CAPTURE_SAMPLE_RATE, TRAFFIC_CAPTURE_MAX_BYTES, TRAFFIC_CAPTURE_KEY)
+    if TRAFFIC_CAPTURE_PATH else None
+)
+
+
+def check_traffic_capture_key():
+    """
+    lifespan 시작 시 호출. 키가 없으면 워커마다 샘플링 대상 / seq가 달라져
+    한 세션의 요청이 일부만 기록되거나 서로 다른 seq로 나뉨 → 여러 워커에서는 시작 중단
+    """
+    if TRAFFIC_RECORDER is None or TRAFFIC_CAPTURE_KEY:
+        return
+    if WORKER_COUNT > 1:
+        raise RuntimeError(
+            f"TRAFFIC_CAPTURE_KEY가 설정되지 않았습니다 (WEB_CONCURRENCY={WORKER_COUNT}). "
+            "여러 워커에서는 모든 워커가 같은 키로 세션을 샘플링해야 합니다."
+        )
+    log_event(
+        "TRAFFIC_CAPTURE_EPHEMERAL_KEY",
+        {"message": "TRAFFIC_CAPTURE_KEY가 설정되지 않아 임시 키를 사용합니다 (다른 노드와 seq가 달라짐)."},
+        level=LogLevel.WARNING
+    )
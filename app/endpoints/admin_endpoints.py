@@ -0,0 +1,110 @@
+# app/endpoints/admin_endpoints.py
+
+import hmac
+from typing import List, Optional
+
+from fastapi import APIRouter, Depends, Header, HTTPException, Query, status
+from fastapi.responses import PlainTextResponse
+
+from app.core.config import ADMIN_TOKEN, PROFILE_MAX_SECONDS, PROFILE_MAX_CALLS
+from app.core.profiling import (
+    HOOK_NAMES,
+    ProfilerBusyError,
+    profile_calls,
+    sample_stacks,
+)
+from app.services.logging_service import log_event, LogLevel
+
+
+def require_admin_token(x_admin_token: Optional[str] = Header(None, alias="X-Admin-Token")):
+    """ADMIN_TOKEN과 일치하지 않으면 401 (ADMIN_TOKEN 미설정 시 라우터 자체가 등록되지 않음)"""
+    if not ADMIN_TOKEN or not x_admin_token \
+            or not hmac.compare_digest(x_admin_token.encode("utf-8"), ADMIN_TOKEN.encode("utf-8")):
+        raise HTTPException(
+            status_code=status.HTTP_401_UNAUTHORIZED,
+            detail={
+                "error": "UNVERIFIED",
+                "message": "관리자 토큰이 올바르지 않습니다."
+            }
+        )
+
+
+router = APIRouter(tags=["Admin"], dependencies=[Depends(require_admin_token)])
+
+
+def _busy() -> HTTPException:
+    return HTTPException(
+        status_code=status.HTTP_409_CONFLICT,
+        detail={
+            "error": "PROFILER_BUSY",
+            "message": "이미 실행 중인 프로파일링이 있습니다."
+        }
+    )
+
+
+# ------------------------------------------------------------
+# 샘플링 프로파일 (collapsed stacks, flamegraph 입력용)
+# ------------------------------------------------------------
+@router.post("/profile/sample", include_in_schema=False)
+def profile_sample(
+    seconds: float = Query(5, gt=0, le=PROFILE_MAX_SECONDS),
+    interval_ms: float = Query(10, ge=1, le=1000),
+) -> PlainTextResponse:
+    """
+    이 워커의 모든 스레드를 seconds 동안 샘플링해 collapsed stack 텍스트로 반환
+    """
+    log_event("ADMIN_PROFILE_STARTED", {"mode": "sample", "seconds": seconds}, level=LogLevel.WARNING)
+    try:
+        result = sample_stacks(seconds, interval_ms)
+    except ProfilerBusyError:
+        raise _busy()
+
+    return PlainTextResponse(
+        result["collapsed"] + "\n",
+        headers={
+            "X-Profile-Samples": str(result["samples"]),
+            "X-Profile-Interval-Ms": f"{result['interval_ms']:.1f}",
+        },
+    )
+
+
+# ------------------------------------------------------------
+# 결정적 프로파일 (cProfile, @profile_hook 대상 함수의 다음 N회 호출)
+# ------------------------------------------------------------
+@router.post("/profile/calls", include_in_schema=False)
+def profile_hooked_calls(
+    calls: int = Query(20, ge=1, le=PROFILE_MAX_CALLS),
+    seconds: float = Query(PROFILE_MAX_SECONDS, gt=0, le=PROFILE_MAX_SECONDS),
+    target: Optional[List[str]] = Query(None),
+    sort: str = Query("cumulative", pattern="^(cumulative|tottime|calls|ncalls)$"),
+    limit: int = Query(50, ge=1, le=500),
+) -> PlainTextResponse:
+    """
+    generate_cutline / apply_watermark_and_noise / to_base64 등의 다음 calls회 호출을
+    cProfile로 측정 (seconds 안에 다 모이지 않으면 그때까지 측정된 호출만)
+    """
+    unknown = sorted(set(target or ()) - HOOK_NAMES)
+    if unknown:
+        raise HTTPException(
+            status_code=status.HTTP_400_BAD_REQUEST,
+            detail={
+                "error": "INVALID_PAYLOAD",
+                "message": f"알 수 없는 프로파일 대상입니다: {', '.join(unknown)} (가능: {', '.join(sorted(HOOK_NAMES))})"
+            }
+        )
+
+    log_event(
+        "ADMIN_PROFILE_STARTED",
+        {"mode": "cprofile", "calls": calls, "seconds": seconds, "targets": target},
+        level=LogLevel.WARNING
+    )
+    try:
+        result = profile_calls(calls, seconds, target, sort, limit)
+    except ProfilerBusyError:
+        raise _busy()
+
+    summary = ", ".join(f"{name}={count}" for name, count in sorted(result["calls"].items()))
+    return PlainTextResponse(
+        result["stats"] or "측정된 호출이 없습니다.\n",
+        headers={"X-Profile-Calls": summary or "none"},
+    )
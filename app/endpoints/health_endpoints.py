@@ -0,0 +1,39 @@
+# app/endpoints/health_endpoints.py
+
+from fastapi import APIRouter
+from fastapi.responses import JSONResponse
+
+from app.core.readiness import READINESS
+from app.schemas.common import BaseResponse, ErrorInfo
+from app.schemas.error_codes import ErrorCode
+
+router = APIRouter(tags=["Health"])
+
+
+# ------------------------------------------------------------
+# liveness: 프로세스가 응답 가능한지만 확인 (warmup 무관)
+# async → threadpool이 포화돼도 probe가 스레드를 기다리지 않음
+# ------------------------------------------------------------
+@router.get("/health", include_in_schema=False)
+async def health():
+    return {"status": "ok"}
+
+
+# ------------------------------------------------------------
+# readiness: startup warmup 완료 후에만 200 (warmup 중 / 종료 중 503)
+# ------------------------------------------------------------
+@router.get("/ready", include_in_schema=False)
+async def ready():
+    state = READINESS.status()
+    if state["ready"]:
+        return BaseResponse(success=True, data=state)
+
+    body = BaseResponse(
+        success=False,
+        data=state,
+        error=ErrorInfo(
+            code=ErrorCode.NOT_READY,
+            message="워커가 아직 요청을 받을 준비가 되지 않았습니다.",
+        ),
+    )
+    return JSONResponse(status_code=503, content=body.model_dump(mode="json"))
@@ -0,0 +1,18 @@
+# app/endpoints/metrics_endpoints.py
+
+from fastapi import APIRouter
+from fastapi.responses import PlainTextResponse
+
+from app.core.metrics import render_prometheus
+
+router = APIRouter()
+
+PROMETHEUS_CONTENT_TYPE = "text/plain; version=0.0.4; charset=utf-8"
+
+
+# ------------------------------------------------------------
+# Prometheus scrape (단계별 소요 시간 / 풀 상태 / 캐시 적중 / AI 오류 사유)
+# ------------------------------------------------------------
+@router.get("/metrics", include_in_schema=False)
+def get_metrics() -> PlainTextResponse:
+    return PlainTextResponse(render_prometheus(), media_type=PROMETHEUS_CONTENT_TYPE)
@@ -1,12 +1,13 @@
 # app/endpoints/phase_a_endpoints.py
 
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Request
 
 from app.schemas.common import BaseResponse, ErrorInfo
 from app.schemas.error_codes import ErrorCode
 
 from app.core.session_store import get_session_and_validate,update_session, set_session_status
 from app.core.state_machine import SessionStatus
+from app.core.rate_limit import enforce_rate_limit
 
 from app.services.phase_a_service import generate_phase_a_both
 from app.services.logging_service import log_event, LogLevel
@@ -16,6 +17,7 @@ router = APIRouter(tags=["CAPTCHA"])
 
 @router.post("/request", response_model=BaseResponse)
 def captcha_request_problem(
+    request: Request,
     session_id: str = Header(..., alias="X-Session-Id")
 ):
     """
@@ -28,6 +30,9 @@ def captcha_request_problem(
     session = get_session_and_validate(session_id)
     # 세션 존재 검증
 
+    # 요청 제한 (초과 시 429)
+    enforce_rate_limit("request", request, session["client_id"])
+
     current_status = SessionStatus(session["status"])
 
     # 상태 가드
@@ -62,6 +67,7 @@ def captcha_request_problem(
         {
             "phase_a": {
                 "target_path": internal_payload["target_path"],
+                "image_size": internal_payload["image_size"],
                 "attempts": session["phase_a"]["attempts"]  # 기존 실패 횟수 유지
             }
         }
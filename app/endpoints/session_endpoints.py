@@ -1,9 +1,10 @@
 # app/endpoints/session_endpoints.py
 
-from fastapi import APIRouter, Header, HTTPException, status
+from fastapi import APIRouter, Header, HTTPException, Request, status
 
 from app.schemas.common import BaseResponse
 from app.core.state_machine import SessionStatus
+from app.core.rate_limit import enforce_rate_limit, enforce_session_quota
 from app.services.session_service import initialize_session
 from app.services.client_validation import validate_client_id  # optional: validator 분리
 
@@ -13,6 +14,7 @@ router = APIRouter(tags=["Session"])
 
 @router.post("/init", response_model=BaseResponse)
 def session_init_endpoint(
+    request: Request,
     x_client_id: str = Header(..., alias="X-Client-Id")
 ):
     """
@@ -24,6 +26,10 @@ def session_init_endpoint(
     # 1) client_id 검증 (별도 서비스로 분리하는 것이 더 정석적)
     # validate_client_id(x_client_id)
 
+    # 1-1) IP / client_id 요청 제한 + 일일 세션 쿼터 (초과 시 429)
+    enforce_rate_limit("init", request, x_client_id)
+    enforce_session_quota(x_client_id)
+
     # 2) 세션 생성 서비스 호출
     session_data = initialize_session(client_id=x_client_id)
     
@@ -1,16 +1,20 @@
 # app/endpoints/verify_endpoints.py
 
 
-from fastapi import APIRouter, Header
+from fastapi import APIRouter, Header, Request
 
 from app.schemas.captcha_submit import CaptchaSubmitRequest
 from app.schemas.common import BaseResponse, ErrorInfo
 from app.schemas.error_codes import ErrorCode
 
+from app.core.config import TRAJECTORY_HARD_LIMIT_POINTS
 from app.core.session_store import get_session_and_validate
 from app.core.state_machine import SessionStatus
+from app.core.rate_limit import enforce_rate_limit
 
 from app.services.verify_service import verify_phase_a, verify_phase_b
+from app.services.logging_service import log_event, LogLevel
+from app.utils.trajectory import raw_point_count
 
 router = APIRouter(tags=["CAPTCHA Submit"])
 
@@ -18,12 +22,28 @@ router = APIRouter(tags=["CAPTCHA Submit"])
 @router.post("/submit", response_model=BaseResponse)
 def captcha_submit(
     request: CaptchaSubmitRequest,
+    http_request: Request,
     session_id: str = Header(..., alias="X-Session-Id")
 ):
 
     session = get_session_and_validate(session_id)
     status = SessionStatus(session["status"])
 
+    # 요청 제한 (초과 시 429)
+    enforce_rate_limit("submit", http_request, session["client_id"])
+
+    # -------------------------
+    # 포인트 수 상한 (CPU / AI 서버 보호)
+    # -------------------------
+    bpd_points = (request.behavior_pattern_data or {}).get("points")
+    if max(raw_point_count(request.points), raw_point_count(bpd_points)) > TRAJECTORY_HARD_LIMIT_POINTS:
+        return BaseResponse(
+            status=status.value,
+            success=False,
+            error=ErrorInfo(code=ErrorCode.INVALID_PAYLOAD,
+                            message=f"points는 최대 {TRAJECTORY_HARD_LIMIT_POINTS}개까지 허용됩니다.")
+        )
+
     # -------------------------
     # PHASE A 처리
     # -------------------------
@@ -46,7 +66,7 @@ def captcha_submit(
     # PHASE B 처리
     # -------------------------
     if status == SessionStatus.PHASE_B:
-        print(f"[DEBUG] Phase B 제출 시작 - session_id: {session_id}")
+        log_event("PHASE_B_SUBMIT", {"session_id": session_id}, level=LogLevel.DEBUG)
         
         # behavior_pattern_data 필수 검증
         bpd = request.behavior_pattern_data
@@ -74,7 +94,11 @@ def captcha_submit(
         #     )
 
         bpd = {"points": request.points, "metadata": request.metadata}
-        print(f"[DEBUG] Phase B 검증 호출 - user_answer: {len(request.user_answer)}개")
+        log_event(
+            "PHASE_B_VERIFY",
+            {"session_id": session_id, "answer_count": len(request.user_answer or [])},
+            level=LogLevel.DEBUG
+        )
         return verify_phase_b(session_id, request.user_answer, bpd)
 
 
@@ -104,17 +128,79 @@ def captcha_submit(
         )
     )
 
+from typing import Optional, List
+
 from pydantic import BaseModel
 
+from app.core.config import VERIFY_BATCH_MAX_ITEMS
+from app.core.completion_token import verify_completion_token, CompletionTokenError
+from app.services.s2s_verify_service import verify_sessions_batch, verify_tokens_batch
+
 class CaptchaVerifyRequest(BaseModel):
-    session_id: str
+    # 둘 중 하나 필수: token(권장, 세션 조회 없음) / session_id(기존 방식)
+    session_id: Optional[str] = None
+    token: Optional[str] = None
 
 @router.post("/verify", response_model=BaseResponse)
 def captcha_verify(req: CaptchaVerifyRequest):
+    # -------------------------
+    # 완료 토큰 검증 (서명 + 만료 + 1회용)
+    # -------------------------
+    if req.token is not None:
+        try:
+            claims = verify_completion_token(req.token)
+        except CompletionTokenError as e:
+            return BaseResponse(
+                success=False,
+                error=ErrorInfo(
+                    code=ErrorCode.INVALID_TOKEN,
+                    message="유효하지 않은 완료 토큰입니다.",
+                    detail={"reason": e.reason},
+                )
+            )
+        return BaseResponse(
+            status=SessionStatus.COMPLETED.value,
+            success=True,
+            data=claims
+        )
+
+    if req.session_id is None:
+        return BaseResponse(
+            success=False,
+            error=ErrorInfo(code=ErrorCode.INVALID_REQUEST,
+                            message="token 또는 session_id가 필요합니다.")
+        )
+
     session = get_session_and_validate(req.session_id)
     status = SessionStatus(session["status"])
     return BaseResponse(
         status=status.value,
         success=(status == SessionStatus.COMPLETED),
         data={"session_id": req.session_id}
-    )
\ No newline at end of file
+    )
+
+
+class CaptchaVerifyBatchRequest(BaseModel):
+    session_ids: List[str] = []
+    tokens: List[str] = []
+
+@router.post("/verify/batch", response_model=BaseResponse)
+def captcha_verify_batch(req: CaptchaVerifyBatchRequest):
+    """
+    여러 session_id / 완료 토큰을 한 번에 검증 (항목별 결과는 요청 순서 유지)
+    """
+    total = len(req.session_ids) + len(req.tokens)
+    if total == 0 or total > VERIFY_BATCH_MAX_ITEMS:
+        return BaseResponse(
+            success=False,
+            error=ErrorInfo(code=ErrorCode.INVALID_REQUEST,
+                            message=f"session_ids + tokens는 1~{VERIFY_BATCH_MAX_ITEMS}개여야 합니다.")
+        )
+
+    return BaseResponse(
+        success=True,
+        data={
+            "sessions": verify_sessions_batch(req.session_ids),
+            "tokens": verify_tokens_batch(req.tokens),
+        }
+    )
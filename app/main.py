@@ -14,12 +14,83 @@
 # def health():
 #     return {"status": "ok"}
 
-from fastapi import FastAPI
+from contextlib import asynccontextmanager
+
+import anyio.to_thread
+from fastapi import Depends, FastAPI
+from app.core.config import (
+    SESSION_STATE_MODE,
+    METRICS_ENABLED,
+    ADMIN_TOKEN,
+    RUNTIME_MONITOR_ENABLED,
+    THREADPOOL_SIZE,
+    TRAFFIC_CAPTURE_PATH,
+)
+from app.core.admission import OverloadedError
+from app.core.completion_token import check_completion_token_keys
+from app.core.readiness import READINESS
+from app.core.runtime_monitor import RuntimeMonitor
+from app.core.session_state import check_session_state_config
+from app.core.traffic_capture import check_traffic_capture_key
+from app.core.security_layer import (
+    RequestBodySizeLimit,
+    bind_session_state,
+    capture_traffic,
+    trace_request,
+    overloaded_exception_handler,
+)
 from app.endpoints.session_endpoints import router as session_router
 from app.endpoints.phase_a_endpoints import router as phase_a_router
 from app.endpoints.verify_endpoints import router as verify_router
+from app.endpoints.metrics_endpoints import router as metrics_router
+from app.endpoints.admin_endpoints import require_admin_token, router as admin_router
+from app.endpoints.health_endpoints import router as health_router
+from app.services.ai_endpoint_pool import AI_ENDPOINT_POOL
+
+
+@asynccontextmanager
+async def lifespan(app: FastAPI):
+    check_completion_token_keys()
+    check_session_state_config()
+    check_traffic_capture_key()
+
+    # sync endpoint(AI 호출 포함)가 실행되는 threadpool 크기
+    if THREADPOOL_SIZE > 0:
+        anyio.to_thread.current_default_thread_limiter().total_tokens = THREADPOOL_SIZE
+
+    # event loop 지연 / threadpool 포화 / 진행 중 AI 호출 모니터
+    monitor = RuntimeMonitor(ai_inflight=AI_ENDPOINT_POOL.inflight) if RUNTIME_MONITOR_ENABLED else None
+    if monitor is not None:
+        monitor.start()
+
+    # 템플릿 / 폰트 / 이미지 경로 / AI 연결 warmup (백그라운드, 완료 전까지 /ready 503)
+    READINESS.start()
+    try:
+        yield
+    finally:
+        READINESS.drain()
+        if monitor is not None:
+            await monitor.stop()
+
+
+app = FastAPI(lifespan=lifespan)
 
-app = FastAPI()
+# 트래픽 샘플 기록 (재생 벤치마크용), stateless 세션을 볼 수 있도록 bind_session_state 안쪽
+if TRAFFIC_CAPTURE_PATH:
+    app.middleware("http")(capture_traffic)
+
+# stateless 모드: 세션 상태를 X-Session-State 헤더(암호화 토큰)로 주고받음
+if SESSION_STATE_MODE == "stateless":
+    app.middleware("http")(bind_session_state)
+
+# AI 검증 / 문제 생성 과부하 시 503 + Retry-After
+app.add_exception_handler(OverloadedError, overloaded_exception_handler)
+
+# 요청 body 크기 제한 (points 과다 제출 방어)
+app.add_middleware(RequestBodySizeLimit)
+
+# liveness(/health) / readiness(/ready, warmup 완료 후 200)
+app.include_router(health_router)
 
 # 세션 생성
 app.include_router(session_router, prefix="/api/v1/session")
@@ -29,3 +100,18 @@ app.include_router(phase_a_router, prefix="/api/v1/captcha")
 
 # 통합 verify (Phase A + Phase B)
 app.include_router(verify_router, prefix="/api/v1/captcha")
+
+# Prometheus 메트릭 (단계별 소요 시간, AI 풀 / 대기열 상태 등)
+# 내부 AI 엔드포인트 URL / 고객사 ID가 포함되므로 ADMIN_TOKEN이 있으면 관리자 토큰으로 보호
+if METRICS_ENABLED:
+    app.include_router(
+        metrics_router,
+        dependencies=[Depends(require_admin_token)] if ADMIN_TOKEN else [],
+    )
+
+# 관리자 API (on-demand 프로파일링), ADMIN_TOKEN 미설정 시 등록하지 않음 → 404
+if ADMIN_TOKEN:
+    app.include_router(admin_router, prefix="/admin")
+
+# 요청 tracing: X-Request-Id 발급/전파, Server-Timing, 느린 요청 로그 (가장 바깥 middleware)
+app.middleware("http")(trace_request)
@@ -1,13 +1,42 @@
-from pydantic import BaseModel, Field
-from typing import List, Optional, Dict, Any
+from pydantic import BaseModel, Field, field_validator
+from typing import List, Optional, Dict, Any, Union
+
+
+class ColumnarPoints(BaseModel):
+    """
+    컬럼 형식 궤적 (대용량 드래그 / 모바일 터치 스트림용)
+    - xs / ys / ts / events 배열
+    - 또는 packed: base64(float32 little-endian, xs[n] + ys[n] + ts[n])
+      ts는 t0 기준 상대값(ms)으로 보내면 float32 정밀도 손실이 없음
+      (대용량 드래그는 packed 권장: JSON 숫자 파싱 자체가 없음)
+
+    xs / ys / ts / events는 원소 단위로 검증하지 않고 리스트 그대로 받는다.
+    (List[float]로 선언하면 pydantic이 원소마다 float 객체를 새로 만듦 → parse_points에서 np.asarray로 한 번에 변환,
+     숫자가 아닌 값이 섞이면 빈 궤적으로 처리)
+    """
+    xs: Optional[Any] = None
+    ys: Optional[Any] = None
+    ts: Optional[Any] = None
+    events: Optional[Any] = None
+
+    packed: Optional[str] = None
+    t0: float = 0.0
+
+    @field_validator("xs", "ys", "ts", "events")
+    @classmethod
+    def _must_be_list(cls, value: Any) -> Any:
+        if value is not None and not isinstance(value, list):
+            raise ValueError("배열이어야 합니다.")
+        return value
 
 
 class CaptchaSubmitRequest(BaseModel):
     """
     Phase A/B 공통 제출 스키마
+    - points: [[x, y, t, eventType], ...] / [{"x", "y", "t", "eventType"}, ...] / ColumnarPoints
     """
     behavior_pattern_data: Optional[Dict[str, Any]] = None
     user_answer: Optional[List[str]] = None
 
-    points: Optional[List[Any]] = None
+    points: Optional[Union[ColumnarPoints, List[Any]]] = None
     metadata: Optional[Dict[str, Any]] = None
@@ -7,11 +7,13 @@ class ErrorCode(str, Enum):
     SESSION_NOT_FOUND = "SESSION_NOT_FOUND"
     SESSION_EXPIRED = "SESSION_EXPIRED"
     INVALID_STATE = "INVALID_STATE"
+    INVALID_SESSION_STATE = "INVALID_SESSION_STATE"
 
     # --- 요청 / 입력 ---
     INVALID_REQUEST = "INVALID_REQUEST"
     INVALID_BEHAVIOR_DATA = "INVALID_BEHAVIOR_DATA"
     INVALID_PAYLOAD = "INVALID_PAYLOAD"
+    RATE_LIMITED = "RATE_LIMITED"
 
     # --- Phase A ---
     LOW_CONFIDENCE_BEHAVIOR = "LOW_CONFIDENCE_BEHAVIOR"
@@ -21,5 +23,10 @@ class ErrorCode(str, Enum):
     ANOMALOUS_BEHAVIOR = "ANOMALOUS_BEHAVIOR"
     TIME_LIMIT_EXCEEDED = "TIME_LIMIT_EXCEEDED"
 
+    # --- 서버 간 검증 ---
+    INVALID_TOKEN = "INVALID_TOKEN"
+
     # --- 서버 오류 ---
     INTERNAL_ERROR = "INTERNAL_ERROR"
+    OVERLOADED = "OVERLOADED"
+    NOT_READY = "NOT_READY"
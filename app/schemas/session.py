@@ -19,6 +19,9 @@ class PhaseAData(BaseModel):
     target_path: List[TargetPoint] = Field(
         description="서버에 저장된 정답 궤적 좌표"
     )
+    image_size: List[int] = Field(
+        description="문제 이미지 크기 [width, height] (target_path 픽셀 좌표 기준)"
+    )
     attempts: int = Field(
         description="Phase A 시도 횟수"
     )
@@ -0,0 +1,414 @@
+# app/services/ai_endpoint_pool.py
+"""
+AI 추론 서버 다중 엔드포인트 로드밸런서
+- AI_SERVER_URLS 목록 중 하나를 골라 요청 (least-outstanding / latency-weighted)
+- 액티브 헬스체크 + 연속 실패 시 일정 시간 eject
+- 헬스체크 응답의 wire_formats로 궤적 전송 포맷(json / packed) 협상
+- 별도 프록시 없이 추론 서버를 수평 확장하기 위함
+"""
+
+import json
+import random
+import socket
+import threading
+import urllib.request
+import urllib.error
+from time import monotonic, perf_counter, sleep
+from typing import Dict, Any, List, Optional
+
+from app.core.config import (
+    AI_SERVER_URLS,
+    AI_REQUEST_TIMEOUT,
+    AI_LB_STRATEGY,
+    AI_HEALTH_CHECK_PATH,
+    AI_HEALTH_CHECK_INTERVAL,
+    AI_HEALTH_CHECK_TIMEOUT,
+    AI_EJECT_CONSECUTIVE_FAILURES,
+    AI_EJECT_SECONDS,
+    AI_WIRE_FORMAT,
+)
+from app.core.metrics import counter, gauge, histogram, register_collector
+from app.core.tracing import REQUEST_ID_HEADER, current_request_id, record_span
+from app.services.logging_service import log_event, LogLevel
+from app.services.trajectory_codec import (
+    PACKED_CONTENT_TYPE,
+    PACKED_WIRE_FORMAT,
+    JSON_WIRE_FORMAT,
+    encode_packed,
+)
+from app.utils.trajectory import Trajectory
+
+
+# EWMA 가중치 (최근 응답시간 반영 비율)
+LATENCY_EWMA_ALPHA = 0.3
+
+# 헬스체크 경로 자체가 없다는 의미의 응답 (장애 아님)
+HEALTH_CHECK_UNSUPPORTED_CODES = (404, 405, 501)
+
+AI_REQUESTS = counter(
+    "captcha_ai_requests_total",
+    "AI 서버 요청 결과 (result=ok|http_4xx|http_5xx|timeout|connection_error|error)",
+    ("path", "result"),
+)
+AI_REQUEST_SECONDS = histogram(
+    "captcha_ai_request_duration_seconds",
+    "AI 서버 요청 소요 시간 (엔드포인트 선택 이후)",
+    ("path",),
+)
+AI_ENDPOINT_OUTSTANDING = gauge("captcha_ai_endpoint_outstanding", "AI 엔드포인트별 처리 중인 요청 수", ("url",))
+AI_ENDPOINT_AVAILABLE = gauge("captcha_ai_endpoint_available", "AI 엔드포인트 라우팅 가능 여부 (eject 시 0)", ("url",))
+AI_ENDPOINT_LATENCY = gauge("captcha_ai_endpoint_ewma_latency_ms", "AI 엔드포인트 응답시간 EWMA", ("url",))
+
+
+def _result_label(e: BaseException) -> str:
+    if isinstance(e, urllib.error.HTTPError):
+        return "http_5xx" if e.code >= 500 else "http_4xx"
+    if isinstance(e, (socket.timeout, TimeoutError)) or isinstance(getattr(e, "reason", None), socket.timeout):
+        return "timeout"
+    if isinstance(e, (urllib.error.URLError, ConnectionError)):
+        return "connection_error"
+    return "error"
+
+
+class AIEndpoint:
+    """단일 AI 서버 엔드포인트의 라우팅 상태"""
+
+    def __init__(self, url: str):
+        self.url = url
+        self.outstanding = 0            # 현재 처리 중인 요청 수
+        self.ewma_latency_ms = 0.0      # 응답시간 EWMA (0이면 아직 측정 전)
+        self.consecutive_failures = 0
+        self.ejected_until = 0.0        # monotonic 기준, 이 시각 전까지 라우팅 제외
+        self.total_requests = 0
+        self.total_failures = 0
+        # 헬스체크 응답으로 광고된 전송 포맷 (기본 JSON만)
+        self.wire_formats = {JSON_WIRE_FORMAT}
+        # packed 요청이 415로 거절된 엔드포인트 → AI_WIRE_FORMAT과 무관하게 JSON으로만 전송
+        self.packed_rejected = False
+        # 헬스체크 경로가 404/405/501이면 False → 액티브 헬스체크 대상에서 제외 (passive health만 적용)
+        self.health_check_supported = True
+
+    def is_available(self, now: float) -> bool:
+        return now >= self.ejected_until
+
+    def to_dict(self, now: float) -> Dict[str, Any]:
+        return {
+            "url": self.url,
+            "available": self.is_available(now),
+            "outstanding": self.outstanding,
+            "ewma_latency_ms": round(self.ewma_latency_ms, 2),
+            "consecutive_failures": self.consecutive_failures,
+            "total_requests": self.total_requests,
+            "total_failures": self.total_failures,
+            "wire_formats": sorted(self.wire_formats),
+            "packed_rejected": self.packed_rejected,
+            "health_check_supported": self.health_check_supported,
+        }
+
+
+class AIEndpointPool:
+    """
+    AI 서버 엔드포인트 풀
+    - select(): 요청을 보낼 엔드포인트 선택
+    - post_json(): 선택 + 호출 + 결과 기록을 한 번에 수행
+    """
+
+    def __init__(
+        self,
+        urls: List[str],
+        strategy: str = AI_LB_STRATEGY,
+        health_check_path: str = AI_HEALTH_CHECK_PATH,
+        health_check_interval: float = AI_HEALTH_CHECK_INTERVAL,
+        eject_failures: int = AI_EJECT_CONSECUTIVE_FAILURES,
+        eject_seconds: float = AI_EJECT_SECONDS,
+        wire_format: str = AI_WIRE_FORMAT,
+    ):
+        if not urls:
+            raise ValueError("AI 서버 엔드포인트가 최소 1개 필요합니다.")
+
+        self.endpoints = [AIEndpoint(url) for url in urls]
+        self.strategy = strategy
+        self.health_check_path = health_check_path
+        self.health_check_interval = health_check_interval
+        self.eject_failures = eject_failures
+        self.eject_seconds = eject_seconds
+        self.wire_format = wire_format
+
+        self._lock = threading.Lock()
+        self._health_thread: Optional[threading.Thread] = None
+
+    # -----------------------
+    # 엔드포인트 선택
+    # -----------------------
+    def _score(self, ep: AIEndpoint) -> float:
+        if self.strategy == "latency_weighted":
+            # 측정 전 엔드포인트는 우선적으로 시도되도록 1ms로 간주
+            return max(ep.ewma_latency_ms, 1.0) * (ep.outstanding + 1)
+        return ep.outstanding + ep.ewma_latency_ms / 1e6  # 동률이면 빠른 쪽
+
+    def select(self) -> AIEndpoint:
+        """
+        사용 가능한 엔드포인트 중 점수가 가장 낮은 것을 선택하고 outstanding을 증가시킨다.
+        모두 eject 상태라면 가장 먼저 복귀 예정인 엔드포인트로 fail-open 한다.
+        """
+        self._ensure_health_checker()
+        now = monotonic()
+
+        with self._lock:
+            candidates = [ep for ep in self.endpoints if ep.is_available(now)]
+            if not candidates:
+                candidates = [min(self.endpoints, key=lambda ep: ep.ejected_until)]
+
+            best = min(self._score(ep) for ep in candidates)
+            chosen = random.choice([ep for ep in candidates if self._score(ep) == best])
+            chosen.outstanding += 1
+            chosen.total_requests += 1
+            return chosen
+
+    # -----------------------
+    # 결과 기록 (passive health)
+    # -----------------------
+    def release(self, ep: AIEndpoint, latency_ms: float, ok: bool):
+        with self._lock:
+            ep.outstanding -= 1
+
+            if ok:
+                ep.consecutive_failures = 0
+                if ep.ewma_latency_ms == 0.0:
+                    ep.ewma_latency_ms = latency_ms
+                else:
+                    ep.ewma_latency_ms += LATENCY_EWMA_ALPHA * (latency_ms - ep.ewma_latency_ms)
+                return
+
+            ep.total_failures += 1
+            ep.consecutive_failures += 1
+            if ep.consecutive_failures >= self.eject_failures:
+                self._eject(ep, "consecutive_failures")
+
+    def _eject(self, ep: AIEndpoint, reason: str):
+        # lock 보유 상태에서 호출
+        now = monotonic()
+        if not ep.is_available(now):
+            return
+        ep.ejected_until = now + self.eject_seconds
+        log_event(
+            "AI_ENDPOINT_EJECTED",
+            {
+                "url": ep.url,
+                "reason": reason,
+                "consecutive_failures": ep.consecutive_failures,
+                "eject_seconds": self.eject_seconds,
+            },
+            level=LogLevel.WARNING
+        )
+
+    def _restore(self, ep: AIEndpoint):
+        # lock 보유 상태에서 호출
+        was_ejected = not ep.is_available(monotonic())
+        ep.ejected_until = 0.0
+        ep.consecutive_failures = 0
+        if was_ejected:
+            log_event("AI_ENDPOINT_RESTORED", {"url": ep.url})
+
+    # -----------------------
+    # 요청 전송
+    # -----------------------
+    def _post(
+        self,
+        ep: AIEndpoint,
+        path: str,
+        body: bytes,
+        content_type: str,
+        timeout: float
+    ) -> Dict[str, Any]:
+        """
+        선택된 엔드포인트로 POST 요청을 보내고 결과를 기록한다.
+        urllib 예외는 그대로 전파하므로 호출 측의 기존 에러 처리가 유지된다.
+        (4xx는 노드 장애가 아니므로 실패로 집계하지 않음)
+        """
+        started = perf_counter()
+        ok = False
+        result_label = "ok"
+
+        try:
+            headers = {"Content-Type": content_type}
+            # AI 서버 로그와 같은 시도 단위로 연결하기 위한 request_id 전파
+            request_id = current_request_id()
+            if request_id is not None:
+                headers[REQUEST_ID_HEADER] = request_id
+
+            req = urllib.request.Request(
+                f"{ep.url}{path}",
+                data=body,
+                headers=headers,
+                method="POST"
+            )
+
+            with urllib.request.urlopen(req, timeout=timeout) as response:
+                result = json.loads(response.read().decode("utf-8"))
+            ok = True
+            return result
+
+        except urllib.error.HTTPError as e:
+            ok = e.code < 500
+            result_label = _result_label(e)
+            raise
+        except BaseException as e:
+            result_label = _result_label(e)
+            raise
+        finally:
+            elapsed = perf_counter() - started
+            self.release(ep, elapsed * 1000, ok)
+            AI_REQUESTS.inc(path=path, result=result_label)
+            AI_REQUEST_SECONDS.observe(elapsed, path=path)
+            record_span(f"ai_http{path.replace('/', '_')}", started, elapsed)
+
+    def post_json(
+        self,
+        path: str,
+        payload: Dict[str, Any],
+        timeout: float = AI_REQUEST_TIMEOUT
+    ) -> Dict[str, Any]:
+        """JSON payload를 엔드포인트 하나로 전송"""
+        body = json.dumps(payload).encode("utf-8")
+        return self._post(self.select(), path, body, "application/json", timeout)
+
+    def _use_packed(self, ep: AIEndpoint) -> bool:
+        if ep.packed_rejected:
+            return False
+        if self.wire_format == PACKED_WIRE_FORMAT:
+            return True
+        if self.wire_format == "auto":
+            return PACKED_WIRE_FORMAT in ep.wire_formats
+        return False
+
+    def post_trajectory(
+        self,
+        path: str,
+        trajectory: Trajectory,
+        metadata: Dict[str, Any],
+        timeout: float = AI_REQUEST_TIMEOUT
+    ) -> Dict[str, Any]:
+        """
+        궤적 검증 요청 전송.
+        엔드포인트가 packed 포맷을 지원하면 바이너리로, 아니면 기존 JSON으로 보낸다.
+        packed 요청이 415로 거절되면 (AI_WIRE_FORMAT=packed여도) 해당 엔드포인트를 JSON 전용으로 표시하고
+        JSON으로 재전송.
+        """
+        ep = self.select()
+
+        if self._use_packed(ep):
+            try:
+                body = encode_packed(trajectory, metadata)
+                return self._post(ep, path, body, PACKED_CONTENT_TYPE, timeout)
+            except urllib.error.HTTPError as e:
+                if e.code != 415:
+                    raise
+                with self._lock:
+                    ep.wire_formats.discard(PACKED_WIRE_FORMAT)
+                    ep.packed_rejected = True
+                log_event(
+                    "AI_WIRE_FORMAT_DOWNGRADED",
+                    {"url": ep.url, "from": PACKED_WIRE_FORMAT, "to": JSON_WIRE_FORMAT, "configured": self.wire_format},
+                    level=LogLevel.WARNING
+                )
+                ep = self.select()
+
+        payload = {"points": trajectory.to_points(), "metadata": metadata}
+        body = json.dumps(payload).encode("utf-8")
+        return self._post(ep, path, body, "application/json", timeout)
+
+    # -----------------------
+    # 액티브 헬스체크
+    # -----------------------
+    def _ensure_health_checker(self):
+        if self.health_check_interval <= 0 or not self.health_check_path or self._health_thread is not None:
+            return
+
+        with self._lock:
+            if self._health_thread is not None:
+                return
+            self._health_thread = threading.Thread(
+                target=self._health_loop,
+                name="ai-endpoint-health",
+                daemon=True
+            )
+            self._health_thread.start()
+
+    def _health_loop(self):
+        while True:
+            self.check_health_once()
+            sleep(self.health_check_interval)
+
+    def check_health_once(self):
+        """
+        모든 엔드포인트에 헬스체크 요청을 1회 보낸다.
+        헬스체크 경로가 없는 서버(404/405/501)는 장애로 보지 않고 액티브 헬스체크에서 제외한다.
+        실패는 요청 실패와 같은 consecutive_failures에 누적되어 AI_EJECT_CONSECUTIVE_FAILURES부터 eject.
+        """
+        if not self.health_check_path:
+            return
+
+        for ep in self.endpoints:
+            if not ep.health_check_supported:
+                continue
+            try:
+                req = urllib.request.Request(f"{ep.url}{self.health_check_path}", method="GET")
+                with urllib.request.urlopen(req, timeout=AI_HEALTH_CHECK_TIMEOUT) as response:
+                    healthy = 200 <= response.status < 300
+                    body = response.read()
+            except urllib.error.HTTPError as e:
+                if e.code in HEALTH_CHECK_UNSUPPORTED_CODES:
+                    with self._lock:
+                        ep.health_check_supported = False
+                    log_event(
+                        "AI_HEALTH_CHECK_UNSUPPORTED",
+                        {"url": ep.url, "path": self.health_check_path, "status_code": e.code},
+                        level=LogLevel.WARNING
+                    )
+                    continue
+                healthy = False
+            except Exception:
+                healthy = False
+
+            with self._lock:
+                if healthy:
+                    self._restore(ep)
+                    self._update_wire_formats(ep, body)
+                else:
+                    # 요청 경로와 같은 연속 실패 기준 (느린 probe 1회로 모든 엔드포인트가 eject되지 않도록)
+                    ep.consecutive_failures += 1
+                    if ep.consecutive_failures >= self.eject_failures:
+                        self._eject(ep, "health_check_failed")
+
+    def _update_wire_formats(self, ep: AIEndpoint, body: bytes):
+        # 헬스체크 응답 예: {"status": "ok", "wire_formats": ["json", "packed"]}
+        try:
+            advertised = json.loads(body.decode("utf-8")).get("wire_formats")
+        except (ValueError, AttributeError):
+            return
+        if isinstance(advertised, list):
+            ep.wire_formats = {JSON_WIRE_FORMAT, *map(str, advertised)}
+
+    def snapshot(self) -> List[Dict[str, Any]]:
+        """엔드포인트별 라우팅 상태 (디버깅/메트릭용)"""
+        now = monotonic()
+        with self._lock:
+            return [ep.to_dict(now) for ep in self.endpoints]
+
+    def inflight(self) -> int:
+        """모든 엔드포인트에서 진행 중인 요청 수"""
+        with self._lock:
+            return sum(ep.outstanding for ep in self.endpoints)
+
+    def export_metrics(self):
+        """/metrics 조회 시점에 엔드포인트 상태를 gauge로 반영"""
+        for state in self.snapshot():
+            AI_ENDPOINT_OUTSTANDING.set(state["outstanding"], url=state["url"])
+            AI_ENDPOINT_AVAILABLE.set(1 if state["available"] else 0, url=state["url"])
+            AI_ENDPOINT_LATENCY.set(state["ewma_latency_ms"], url=state["url"])
+
+
+# 프로세스 전역 풀 (Phase A / Phase B 클라이언트가 공유)
+AI_ENDPOINT_POOL = AIEndpointPool(AI_SERVER_URLS)
+register_collector(AI_ENDPOINT_POOL.export_metrics)
@@ -2,17 +2,14 @@
 """
 Phase A AI 서버 호출 클라이언트
 tcurity-ai 서버의 /phase-a/verify 엔드포인트를 호출
+(요청 처리 중이면 AI_ENDPOINT_POOL이 X-Request-Id를 함께 전송)
 """
 
-import os
-import json
-import urllib.request
 import urllib.error
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 
-
-# AI 서버 URL (환경변수에서 가져오거나 기본값 사용)
-AI_SERVER_URL = os.getenv("AI_SERVER_URL", "http://10.0.83.48:9000")
+from app.services.ai_endpoint_pool import AI_ENDPOINT_POOL
+from app.utils.trajectory import Trajectory, parse_points
 
 
 def filter_and_normalize_points(
@@ -24,53 +21,11 @@ def filter_and_normalize_points(
     - FE 객체 형식 지원: {"x": x, "y": y, "t": t, "eventType": eventType}
     - 좌표는 0~1 정규화 상태 그대로 전송
     """
-    if not isinstance(points, list) or not points:
-        return []
-    
-    filtered = []
-    for p in points:
-        try:
-            # 배열 형식: [x, y, t, eventType]
-            if isinstance(p, (list, tuple)):
-                if len(p) < 3:  # 최소 x, y, t 필요
-                    continue
-                
-                x_norm = float(p[0])
-                y_norm = float(p[1])
-                t = float(p[2])
-                event_type = p[3] if len(p) > 3 else "move"
-                
-            # 객체 형식: {"x": x, "y": y, "t": t, "eventType": eventType}
-            elif isinstance(p, dict):
-                if not all(k in p for k in ("x", "y", "t")):
-                    continue
-                
-                x_norm = float(p["x"])
-                y_norm = float(p["y"])
-                t = float(p["t"])
-                event_type = p.get("eventType", p.get("event_type", "move"))
-            else:
-                continue
-            
-            # 0~1 범위 검증
-            if not (0 <= x_norm <= 1 and 0 <= y_norm <= 1):
-                continue
-            
-            # 정규화 좌표 그대로 전송 (픽셀 변환 없음)
-            filtered.append({
-                "x": x_norm,
-                "y": y_norm,
-                "t": t,
-                "eventType": event_type
-            })
-        except (ValueError, TypeError, IndexError):
-            continue
-    
-    return filtered
+    return parse_points(points, default_event="move").to_points()
 
 
 def verify_phase_a_with_ai_sync(
-    user_points: List[Any],
+    user_points: Union[List[Any], Trajectory],
     metadata: Dict[str, Any] = None
 ) -> Dict[str, Any]:
     """
@@ -78,20 +33,21 @@ def verify_phase_a_with_ai_sync(
     
     Args:
         user_points: [[x, y, t, eventType], ...] 또는 [{"x": x, "y": y, "t": t}, ...]
-                     x, y는 0~1 정규화 좌표
+                     x, y는 0~1 정규화 좌표 (이미 파싱된 Trajectory도 허용)
         metadata: {"screenWidth": int, "screenHeight": int, "deviceType": str}
         
     Returns:
         {"pass": bool, "label": str}
     """
-    url = f"{AI_SERVER_URL}/phase-a/verify"
-    
     # 메타데이터 기본값 설정
     if metadata is None:
         metadata = {}
     
     # 포인트 필터링 (정규화 좌표 그대로)
-    filtered_points = filter_and_normalize_points(user_points)
+    if isinstance(user_points, Trajectory):
+        filtered_points = user_points
+    else:
+        filtered_points = parse_points(user_points, default_event="move")
     
     # 유효 포인트가 너무 적으면 즉시 봇 처리
     if len(filtered_points) < 3:
@@ -102,41 +58,29 @@ def verify_phase_a_with_ai_sync(
         }
     
     # GPU 서버로 정규화 좌표 전송
-    payload = {
-        "points": filtered_points,  # 정규화 좌표 (0~1)
-        "metadata": {
-            "deviceType": metadata.get("deviceType", "unknown"),
-            "screenWidth": metadata.get("screenWidth"),
-            "screenHeight": metadata.get("screenHeight"),
-        }
+    ai_metadata = {
+        "deviceType": metadata.get("deviceType", "unknown"),
+        "screenWidth": metadata.get("screenWidth"),
+        "screenHeight": metadata.get("screenHeight"),
     }
     
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            return result
-            
-    except urllib.error.URLError as e:
-        # 연결 실패 시 봇으로 처리
+        # 다중 AI 서버 중 하나로 라우팅 (ai_endpoint_pool)
+        return AI_ENDPOINT_POOL.post_trajectory("/phase-a/verify", filtered_points, ai_metadata)
+
+    except urllib.error.HTTPError as e:
+        # HTTP 에러 시 봇으로 처리 (URLError의 하위 클래스이므로 먼저 검사)
         return {
             "pass": False,
             "label": "봇",
-            "reason": "ai_server_connection_failed"
+            "reason": f"ai_server_error_{e.code}"
         }
-    except urllib.error.HTTPError as e:
-        # HTTP 에러 시 봇으로 처리
+    except urllib.error.URLError as e:
+        # 연결 실패 시 봇으로 처리
         return {
             "pass": False,
             "label": "봇",
-            "reason": f"ai_server_error_{e.code}"
+            "reason": "ai_server_connection_failed"
         }
     except TimeoutError:
         # 타임아웃 시 봇으로 처리
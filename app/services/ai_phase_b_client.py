@@ -3,20 +3,18 @@
 Phase B AI 서버 호출 클라이언트
 - /phase-b/generate: 문제 생성
 - /phase-b/verify: 답안 검증
+(요청 처리 중이면 AI_ENDPOINT_POOL이 X-Request-Id를 함께 전송)
 """
 
-import os
-import json
-import random
-import urllib.request
 import urllib.error
-from typing import Dict, Any, List
+from typing import Dict, Any, List, Union
 
+from app.core.config import AI_SERVER_URLS
+from app.services.ai_endpoint_pool import AI_ENDPOINT_POOL
+from app.services.logging_service import log_event, LogLevel, is_enabled
+from app.utils.trajectory import Trajectory, parse_points
 
 
-# AI 서버 URL (Phase A와 동일한 서버 사용)
-AI_SERVER_URL = os.getenv("AI_SERVER_URL", "http://10.0.83.48:9000")
-
 
 def generate_phase_b_problem_from_ai(target_class: str = None) -> Dict[str, Any]:
     """
@@ -39,30 +37,18 @@ def generate_phase_b_problem_from_ai(target_class: str = None) -> Dict[str, Any]
             ]
         }
     """
-    url = f"{AI_SERVER_URL}/phase-b/generate"
-    
     payload = {
         "target_class": target_class
     }
     
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            return result
-            
+        return AI_ENDPOINT_POOL.post_json("/phase-b/generate", payload)
+
     except Exception as e:
         # AI 서버 실패 시 에러 발생 (fallback 없음)
         raise RuntimeError(
             f"AI 서버 문제 생성 실패: {str(e)}\n"
-            f"AI_SERVER_URL={AI_SERVER_URL}"
+            f"AI_SERVER_URLS={AI_SERVER_URLS}"
         )
 
 
@@ -76,53 +62,11 @@ def filter_and_normalize_points_phase_b(
     - FE 객체 형식 지원: {"x": x, "y": y, "t": t, "eventType": eventType}
     - 좌표는 0~1 정규화 상태 그대로 전송
     """
-    if not isinstance(points, list) or not points:
-        return []
-    
-    filtered = []
-    for p in points:
-        try:
-            # 배열 형식: [x, y, t, eventType]
-            if isinstance(p, (list, tuple)):
-                if len(p) < 3:  # 최소 x, y, t 필요
-                    continue
-                
-                x_norm = float(p[0])
-                y_norm = float(p[1])
-                t = float(p[2])
-                event_type = p[3] if len(p) > 3 else "click"
-                
-            # 객체 형식: {"x": x, "y": y, "t": t, "eventType": eventType}
-            elif isinstance(p, dict):
-                if not all(k in p for k in ("x", "y", "t")):
-                    continue
-                
-                x_norm = float(p["x"])
-                y_norm = float(p["y"])
-                t = float(p["t"])
-                event_type = p.get("eventType", p.get("event_type", "click"))
-            else:
-                continue
-            
-            # 0~1 범위 검증
-            if not (0 <= x_norm <= 1 and 0 <= y_norm <= 1):
-                continue
-            
-            # 정규화 좌표 그대로 전송 (픽셀 변환 없음)
-            filtered.append({
-                "x": x_norm,
-                "y": y_norm,
-                "t": t,
-                "eventType": event_type
-            })
-        except (ValueError, TypeError, IndexError):
-            continue
-    
-    return filtered
+    return parse_points(points, default_event="click").to_points()
 
 
 def verify_phase_b_with_ai_sync(
-    user_points: List[Any],
+    user_points: Union[List[Any], Trajectory],
     metadata: Dict[str, Any] = None
 ) -> Dict[str, Any]:
     """
@@ -130,7 +74,7 @@ def verify_phase_b_with_ai_sync(
     
     Args:
         user_points: [[x, y, t, eventType], ...] 또는 [{"x": x, "y": y, "t": t}, ...]
-                     x, y는 0~1 정규화 좌표
+                     x, y는 0~1 정규화 좌표 (이미 파싱된 Trajectory도 허용)
         metadata: {"screenWidth": int, "screenHeight": int, "deviceType": str}
         
     Returns:
@@ -141,20 +85,26 @@ def verify_phase_b_with_ai_sync(
     Note:
         정답 검증은 백엔드에서 수행하므로, AI 서버는 행동 패턴만 검증
     """
-    url = f"{AI_SERVER_URL}/phase-b/verify"
-    
     # 메타데이터 기본값 설정
     if metadata is None:
         metadata = {}
     
     # 포인트 필터링 (정규화 좌표 그대로)
-    filtered_points = filter_and_normalize_points_phase_b(user_points)
+    if isinstance(user_points, Trajectory):
+        filtered_points = user_points
+    else:
+        filtered_points = parse_points(user_points, default_event="click")
     
-    print(f"[DEBUG] Phase B AI 호출 - 원본 포인트: {len(user_points)}개, 필터링 후: {len(filtered_points)}개")
+    log_event(
+        "PHASE_B_AI_VERIFY",
+        # 다운샘플 후 AI 서버로 보내는 포인트 수 (제출 원본 수는 verify_service에서 확인)
+        {"sent_points": len(filtered_points), "device_type": metadata.get("deviceType")},
+        level=LogLevel.DEBUG
+    )
     
     # 유효 포인트가 너무 적으면 즉시 통과 처리
     if len(filtered_points) < 2:  # Phase B는 클릭이므로 2개로 완화
-        print(f"[DEBUG] 포인트 부족으로 AI 서버 호출 스킵 (최소 2개 필요)")
+        log_event("PHASE_B_AI_VERIFY_SKIPPED", {"reason": "insufficient_valid_points"}, level=LogLevel.DEBUG)
         return {
             "pass": True,
             "label": "사람",
@@ -163,51 +113,38 @@ def verify_phase_b_with_ai_sync(
 
     
     # GPU 서버로 정규화 좌표 전송
-    payload = {
-        "points": filtered_points,  # 정규화 좌표 (0~1)
-        "metadata": {
-            "deviceType": metadata.get("deviceType", "unknown"),
-            "screenWidth": metadata.get("screenWidth"),
-            "screenHeight": metadata.get("screenHeight"),
-        }
+    ai_metadata = {
+        "deviceType": metadata.get("deviceType", "unknown"),
+        "screenWidth": metadata.get("screenWidth"),
+        "screenHeight": metadata.get("screenHeight"),
     }
     
-    print(f"[DEBUG] AI 서버 호출: {url}")
-    print(f"[DEBUG] Payload: points={len(filtered_points)}개, metadata={metadata.get('deviceType')}")
-    
     try:
-        data = json.dumps(payload).encode("utf-8")
-        req = urllib.request.Request(
-            url,
-            data=data,
-            headers={"Content-Type": "application/json"},
-            method="POST"
-        )
-        
-        with urllib.request.urlopen(req, timeout=10) as response:
-            result = json.loads(response.read().decode("utf-8"))
-            print(f"[DEBUG] AI 서버 응답: {result}")
-            return result
-            
-    except urllib.error.URLError as e:
-        # 연결 실패 시 통과 (AI 모델 준비 전)
-        print(f"[DEBUG] AI 서버 연결 실패: {e}")
+        result = AI_ENDPOINT_POOL.post_trajectory("/phase-b/verify", filtered_points, ai_metadata)
+        if is_enabled(LogLevel.DEBUG):
+            log_event("PHASE_B_AI_RESPONSE", {"result": result}, level=LogLevel.DEBUG)
+        return result
+
+
+    except urllib.error.HTTPError as e:
+        # HTTP 에러 시 통과 (URLError의 하위 클래스이므로 먼저 검사)
+        log_event("PHASE_B_AI_ERROR", {"reason": "http_error", "status": e.code}, level=LogLevel.WARNING)
         return {
             "pass": True,
             "label": "사람",
-            "reason": "ai_server_connection_failed"
+            "reason": f"ai_server_error_{e.code}"
         }
-    except urllib.error.HTTPError as e:
-        # HTTP 에러 시 통과
-        print(f"[DEBUG] AI 서버 HTTP 에러: {e.code}")
+    except urllib.error.URLError as e:
+        # 연결 실패 시 통과 (AI 모델 준비 전)
+        log_event("PHASE_B_AI_ERROR", {"reason": "connection_failed", "error": repr(e)}, level=LogLevel.WARNING)
         return {
             "pass": True,
             "label": "사람",
-            "reason": f"ai_server_error_{e.code}"
+            "reason": "ai_server_connection_failed"
         }
     except TimeoutError:
         # 타임아웃 시 통과
-        print(f"[DEBUG] AI 서버 타임아웃")
+        log_event("PHASE_B_AI_ERROR", {"reason": "timeout"}, level=LogLevel.WARNING)
         return {
             "pass": True,
             "label": "사람",
@@ -215,7 +152,7 @@ def verify_phase_b_with_ai_sync(
         }
     except Exception as e:
         # 기타 에러 시 통과
-        print(f"[DEBUG] AI 서버 알 수 없는 에러: {e}")
+        log_event("PHASE_B_AI_ERROR", {"reason": "unknown", "error": repr(e)}, level=LogLevel.WARNING)
         return {
             "pass": True,
             "label": "사람",
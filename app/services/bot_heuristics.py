@@ -0,0 +1,155 @@
+# app/services/bot_heuristics.py
+"""
+운동학 기반 봇 휴리스틱 룰 (AI 모델 앞단의 저비용 판정 계층)
+- 궤적 컬럼(Trajectory)에서 dt / 속도 / 가속도를 벡터 연산으로 한 번 계산
+- 등록된 룰을 순서대로 평가하여 첫 번째로 적중한 룰 이름을 반환
+- 명백한 봇만 로컬에서 차단하고, 애매한 경우는 모두 AI 서버로 넘김
+- 룰별 적중 수는 /metrics의 captcha_bot_rule_hits_total / captcha_bot_rule_evaluations_total
+  (BOT_HEURISTICS_MODE=flag 이면 차단하지 않고 적중만 기록)
+
+룰 추가:
+    @rule("my_rule", phases=("A",))
+    def _my_rule(f: Features) -> bool:
+        ...
+"""
+
+from typing import Callable, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import BOT_HEURISTICS_ENABLED, BOT_HEURISTICS_DISABLED_RULES
+from app.core.metrics import counter
+from app.utils.trajectory import Trajectory
+
+# 판정에 필요한 최소 포인트 수
+MIN_POINTS_TIMESTAMP_RULES = 5
+MIN_POINTS_KINEMATIC_RULES = 10
+
+DUPLICATED_TIMESTAMP_RATIO = 0.5       # dt == 0 비율
+CONSTANT_VELOCITY_MAX_CV = 0.02        # 속도 변동계수(std/mean)
+ZERO_JITTER_MAX_RESIDUAL = 1e-4        # 이동평균 대비 최대 편차 (정규화 좌표, 약 0.2px)
+IMPOSSIBLE_ACCEL_MIN_DT_MS = 4.0       # 가속도 계산에 쓰는 최소 샘플 간격
+IMPOSSIBLE_ACCEL_P90 = 500.0           # 화면 단위/s^2 (사람 드래그 최대치의 약 10배)
+LINEAR_MAX_DEVIATION_RATIO = 1e-3      # 시작-끝 직선 대비 최대 이탈 / 직선 길이
+LINEAR_MIN_CHORD = 0.05
+
+
+RULE_EVALUATIONS = counter(
+    "captcha_bot_rule_evaluations_total",
+    "휴리스틱 룰 계층을 통과한 제출 수",
+    ("phase",),
+)
+RULE_HITS = counter(
+    "captcha_bot_rule_hits_total",
+    "휴리스틱 룰별 봇 판정 수",
+    ("phase", "rule"),
+)
+
+
+class Features:
+    """룰 평가용 궤적 특징 (한 번만 계산하여 모든 룰이 공유)"""
+
+    def __init__(self, trajectory: Trajectory):
+        self.n = len(trajectory)
+        self.xs = trajectory.xs
+        self.ys = trajectory.ys
+        self.dt = np.diff(trajectory.ts)              # ms
+        self.dx = np.diff(trajectory.xs)
+        self.dy = np.diff(trajectory.ys)
+        self.step = np.hypot(self.dx, self.dy)
+
+        moving = self.dt > 0
+        self.speed = self.step[moving] / (self.dt[moving] / 1000.0)   # 화면 단위/s
+
+
+# (이름, 적용 Phase, 판정 함수)
+RULES: List[Tuple[str, Tuple[str, ...], Callable[[Features], bool]]] = []
+
+
+def rule(name: str, phases: Tuple[str, ...] = ("A", "B")):
+    """룰 등록 데코레이터 (등록 순서 = 평가 순서)"""
+    def decorator(func: Callable[[Features], bool]):
+        RULES.append((name, phases, func))
+        return func
+    return decorator
+
+
+# ==========================================================
+# 룰 정의
+# ==========================================================
+@rule("non_monotonic_timestamps")
+def _non_monotonic_timestamps(f: Features) -> bool:
+    return f.n >= 2 and bool(np.any(f.dt < 0))
+
+
+@rule("duplicated_timestamps")
+def _duplicated_timestamps(f: Features) -> bool:
+    return f.n >= MIN_POINTS_TIMESTAMP_RULES and float(np.mean(f.dt == 0)) > DUPLICATED_TIMESTAMP_RATIO
+
+
+@rule("constant_velocity", phases=("A",))
+def _constant_velocity(f: Features) -> bool:
+    if f.n < MIN_POINTS_KINEMATIC_RULES or len(f.speed) < MIN_POINTS_KINEMATIC_RULES - 1:
+        return False
+    mean = float(np.mean(f.speed))
+    return mean > 0 and float(np.std(f.speed)) / mean < CONSTANT_VELOCITY_MAX_CV
+
+
+@rule("zero_jitter", phases=("A",))
+def _zero_jitter(f: Features) -> bool:
+    if f.n < MIN_POINTS_KINEMATIC_RULES:
+        return False
+    # 3점 이동평균 대비 편차: 사람 입력은 픽셀 단위 떨림이 반드시 존재
+    rx = f.xs[1:-1] - (f.xs[:-2] + f.xs[1:-1] + f.xs[2:]) / 3
+    ry = f.ys[1:-1] - (f.ys[:-2] + f.ys[1:-1] + f.ys[2:]) / 3
+    return float(np.max(np.hypot(rx, ry))) < ZERO_JITTER_MAX_RESIDUAL
+
+
+@rule("impossible_acceleration", phases=("A",))
+def _impossible_acceleration(f: Features) -> bool:
+    if f.n < MIN_POINTS_KINEMATIC_RULES:
+        return False
+    valid = f.dt >= IMPOSSIBLE_ACCEL_MIN_DT_MS
+    if valid.sum() < 3:
+        return False
+    dt_s = f.dt[valid] / 1000.0
+    speed = f.step[valid] / dt_s
+    accel = np.abs(np.diff(speed)) / dt_s[1:]
+    return float(np.percentile(accel, 90)) > IMPOSSIBLE_ACCEL_P90
+
+
+@rule("perfectly_linear", phases=("A",))
+def _perfectly_linear(f: Features) -> bool:
+    if f.n < MIN_POINTS_KINEMATIC_RULES:
+        return False
+    cx, cy = f.xs[-1] - f.xs[0], f.ys[-1] - f.ys[0]
+    chord = float(np.hypot(cx, cy))
+    if chord < LINEAR_MIN_CHORD:
+        return False
+    deviation = np.abs(cx * (f.ys - f.ys[0]) - cy * (f.xs - f.xs[0])) / chord
+    return float(np.max(deviation)) / chord < LINEAR_MAX_DEVIATION_RATIO
+
+
+# ==========================================================
+# 평가
+# ==========================================================
+def evaluate_bot_rules(trajectory: Trajectory, phase: str) -> Optional[str]:
+    """
+    phase("A" / "B")에 해당하는 룰을 순서대로 평가하여 첫 적중 룰 이름을 반환.
+    적중 룰이 없으면 None (→ AI 서버 판정)
+    """
+    if not BOT_HEURISTICS_ENABLED or len(trajectory) < 2:
+        return None
+
+    RULE_EVALUATIONS.inc(phase=phase)
+    features = Features(trajectory)
+
+    for name, phases, func in RULES:
+        if phase not in phases or name in BOT_HEURISTICS_DISABLED_RULES:
+            continue
+        if func(features):
+            RULE_HITS.inc(phase=phase, rule=name)
+            return name
+
+    return None
+
@@ -1,20 +1,62 @@
 # app/services/client_validation.py
 
 from fastapi import HTTPException, status
-from typing import Dict
+from typing import Dict, Any
 
-# (가정) 실제 운영 시, 이 맵은 DB나 설정 파일에서 로드됩니다.
-VALID_CLIENTS: Dict[str, str] = {
-    "cust_alpha": "Active",
-    "cust_beta": "Active",
+from app.core.client_registry import ClientRegistry
+from app.core.config import (
+    RATE_LIMIT_CLIENT_PER_SEC,
+    RATE_LIMIT_CLIENT_BURST,
+    AI_FAIR_DEFAULT_QUEUE_BURST,
+)
+
+# 기본 고객사 목록 (CLIENT_REGISTRY_PATH 미설정 시 사용, 운영에서는 JSON / SQLite 레지스트리)
+# 고객사별 정책
+# - rate_per_sec / burst: 요청 제한(token bucket), daily_session_quota: 일일 세션 발급 쿼터(None이면 무제한)
+# - weight / ai_queue_burst: AI 검증 슬롯 공정 분배 가중치 / 슬롯 대기 가능 요청 수
+# - token_keys: (선택) 고객사 전용 완료 토큰 서명 키 [{"kid": ..., "secret": ...}]
+VALID_CLIENTS: Dict[str, Dict[str, Any]] = {
+    "cust_alpha": {"status": "Active", "rate_per_sec": 50, "burst": 100, "daily_session_quota": None,
+                   "weight": 2, "ai_queue_burst": 32},
+    "cust_beta": {"status": "Active", "rate_per_sec": 20, "burst": 40, "daily_session_quota": 100000,
+                  "weight": 1, "ai_queue_burst": 16},
     # ...
 }
 
+# 등록되지 않은 client_id에 적용되는 정책
+# - 요청 제한: 같은 한도 값으로 client_id별 bucket을 따로 사용 (서로의 한도를 소진하지 않음)
+# - AI 공정 분배: 미등록 ID는 모두 하나의 tenant("_unregistered")로 묶여 weight 1을 나눠 씀
+DEFAULT_CLIENT_POLICY: Dict[str, Any] = {
+    "status": "Unknown",
+    "rate_per_sec": RATE_LIMIT_CLIENT_PER_SEC,
+    "burst": RATE_LIMIT_CLIENT_BURST,
+    "daily_session_quota": None,
+    "weight": 1,
+    "ai_queue_burst": AI_FAIR_DEFAULT_QUEUE_BURST,
+}
+
+
+# 요청 경로에서 사용하는 레지스트리 (메모리 인덱스, hot reload)
+CLIENT_REGISTRY = ClientRegistry(DEFAULT_CLIENT_POLICY, VALID_CLIENTS)
+
+
+def get_client_policy(client_id: str) -> Dict[str, Any]:
+    """
+    client_id의 정책 조회 (미등록이면 DEFAULT_CLIENT_POLICY)
+    """
+    return CLIENT_REGISTRY.policy(client_id)
+
+
+def is_registered_client(client_id: str) -> bool:
+    return CLIENT_REGISTRY.is_registered(client_id)
+
+
 def validate_client_id(client_id: str):
     """
     X-Client-Id의 유효성을 검증하고, 유효하지 않으면 401 UNVERIFIED 오류를 발생시킵니다.
     """
-    if client_id not in VALID_CLIENTS:
+    policy = CLIENT_REGISTRY.get(client_id)
+    if policy is None:
         raise HTTPException(
             status_code=status.HTTP_401_UNAUTHORIZED,
             detail={
@@ -22,9 +64,9 @@ def validate_client_id(client_id: str):
                 "message": "허용되지 않은 client_id 입니다."
             }
         )
-    
+
     # 추가적인 상태 체크 로직 (e.g., 계정 상태가 'Active'인지)
-    # if VALID_CLIENTS[client_id] != "Active":
+    # if policy["status"] != "Active":
     #     ...
-    
+
     return True # 유효하면 통과
\ No newline at end of file
@@ -1,24 +1,165 @@
-import logging
+import atexit
 import json
+import logging
+import queue
+import random
+import threading
 from datetime import datetime
+from logging.handlers import QueueHandler, QueueListener
+from time import time
 from typing import Dict, Any, Optional
 from enum import Enum
 
+from app.core.config import (
+    LOG_LEVEL,
+    LOG_QUEUE_MAX,
+    LOG_SAMPLE_RATES,
+)
+from app.core.metrics import counter, gauge, register_collector
+from app.core.tracing import current_request_id
+
+# orjson이 설치되어 있으면 사용 (없으면 표준 json)
+# 두 경로 모두 같은 한 줄을 만들도록: 공백 없는 구분자, 비 ASCII 그대로, str이 아닌 key 허용, 그 외 값은 str()
+try:
+    import orjson
+
+    def _encode(data: Dict[str, Any]) -> str:
+        return orjson.dumps(data, default=str, option=orjson.OPT_NON_STR_KEYS).decode("utf-8")
+except ImportError:
+    _json_encoder = json.JSONEncoder(ensure_ascii=False, separators=(",", ":"), default=str)
+
+    def _encode(data: Dict[str, Any]) -> str:
+        return _json_encoder.encode(data)
+
 
 class LogLevel(str, Enum):
+    DEBUG = "debug" # 개발용 상세 정보 (LOG_LEVEL=debug 일 때만 기록)
     INFO = "info" # 단순 기록
     WARNING = "warning" # 의심
     ERROR = "error" # 장애/위험
 
 
+_LEVEL_ORDER = {LogLevel.DEBUG: 10, LogLevel.INFO: 20, LogLevel.WARNING: 30, LogLevel.ERROR: 40}
+_MIN_LEVEL = next((order for lvl, order in _LEVEL_ORDER.items() if lvl.value == LOG_LEVEL), _LEVEL_ORDER[LogLevel.INFO])
+
+
+def is_enabled(level: LogLevel) -> bool:
+    """호출 측에서 비싼 payload를 만들기 전에 확인용"""
+    return _LEVEL_ORDER[level] >= _MIN_LEVEL
+
+
+# -----------------------
+# 비동기 기록 (요청 스레드는 QueueHandler로 큐에 넣기만 함)
+# -----------------------
+# 출력은 표준 logging의 "captcha" logger handler가 담당 (dictConfig 등으로 교체 / 추가 가능)
+# _LEVEL_ORDER 값은 logging 표준 레벨 값과 같음
 logger = logging.getLogger("captcha")
-logger.setLevel(logging.INFO)
+logger.setLevel(_MIN_LEVEL)
+
+
+def _format_record(record: Dict[str, Any]) -> str:
+    """
+    log_event 레코드 1건 → JSON 한 줄. 변환에 실패해도 예외를 내지 않고 실패 사실을 기록하는 줄을 반환
+    (payload가 timestamp를 다른 값으로 덮어쓴 경우 / 직렬화할 수 없는 key 등)
+    """
+    try:
+        if isinstance(record.get("timestamp"), (int, float)):
+            record["timestamp"] = datetime.utcfromtimestamp(record["timestamp"]).isoformat()
+        return _encode(record)
+    except Exception as e:
+        return _encode({
+            "event": "LOG_RECORD_ENCODE_FAILED",
+            "timestamp": datetime.utcnow().isoformat(),
+            "service": "captcha-backend",
+            "level": LogLevel.ERROR.value,
+            "original_event": str(record.get("event")),
+            "error": repr(e),
+        })
+
+
+class JsonLineFormatter(logging.Formatter):
+    """log_event 레코드(msg가 dict)는 JSON 한 줄로, 그 외 레코드는 기본 형식으로 출력"""
+
+    def format(self, record: logging.LogRecord) -> str:
+        if isinstance(record.msg, dict):
+            return _format_record(record.msg)
+        return super().format(record)
+
 
 if not logger.handlers:
     handler = logging.StreamHandler()
-    handler.setFormatter(logging.Formatter("%(message)s"))
+    handler.setFormatter(JsonLineFormatter())
     logger.addHandler(handler)
 
+
+class _DroppingQueueHandler(QueueHandler):
+    """
+    - 레코드를 그대로 큐에 넣음 (기본 prepare는 요청 스레드에서 format → 직렬화는 listener 스레드로 미룸)
+    - 큐가 가득 차면 새 로그는 버리고 개수만 기록 (요청 지연 방지)
+    """
+
+    def __init__(self, q: "queue.Queue"):
+        super().__init__(q)
+        self.dropped = 0
+
+    def prepare(self, record: logging.LogRecord) -> logging.LogRecord:
+        return record
+
+    def enqueue(self, record: logging.LogRecord):
+        try:
+            self.queue.put_nowait(record)
+        except queue.Full:
+            self.dropped += 1
+            LOG_DROPPED.inc()
+
+
+class _LogListener(QueueListener):
+    """listener 스레드: 큐의 레코드를 "captcha" logger handler로 전달 + 버려진 로그 수 기록"""
+
+    def handle(self, record: logging.LogRecord):
+        try:
+            logger.handle(record)
+
+            if _QUEUE_HANDLER.dropped:
+                dropped, _QUEUE_HANDLER.dropped = _QUEUE_HANDLER.dropped, 0
+                logger.handle(_make_record(LogLevel.WARNING, {
+                    "event": "LOG_RECORDS_DROPPED",
+                    "timestamp": time(),
+                    "service": "captcha-backend",
+                    "level": LogLevel.WARNING.value,
+                    "dropped": dropped,
+                }))
+        except Exception:
+            pass   # listener 스레드가 종료되면 이후 로그가 모두 버려지므로 어떤 경우에도 유지
+
+
+def _make_record(level: LogLevel, log_data: Dict[str, Any]) -> logging.LogRecord:
+    return logger.makeRecord(logger.name, _LEVEL_ORDER[level], "log_event", 0, log_data, None, None)
+
+
+_QUEUE: "queue.Queue" = queue.Queue(LOG_QUEUE_MAX)
+_QUEUE_HANDLER = _DroppingQueueHandler(_QUEUE)
+_LISTENER = _LogListener(_QUEUE)
+_listener_lock = threading.Lock()
+_listener_started = False
+
+
+def _start_listener():
+    """첫 로그 시 listener 스레드 시작 (import 시점에는 스레드를 만들지 않음)"""
+    global _listener_started
+    with _listener_lock:
+        if _listener_started:
+            return
+        _LISTENER.start()
+        _listener_started = True
+        atexit.register(_LISTENER.stop)   # 종료 시 큐에 남은 로그 기록
+
+
+LOG_QUEUE_DEPTH = gauge("captcha_log_queue_depth", "기록 대기 중인 로그 수")
+LOG_DROPPED = counter("captcha_log_records_dropped_total", "큐 초과로 버려진 로그 수")
+register_collector(lambda: LOG_QUEUE_DEPTH.set(_QUEUE.qsize()))
+
+
 # CAPTCHA 시스템에서 발생한 "이벤트 하나"를 공통 포맷으로 기록하기 위한 함수
 def log_event(
     event_type: str, # 이벤트 ID, 이벤트 코드
@@ -27,20 +168,40 @@ def log_event(
     *, # context는 반드시 키워드 인자로만 받겠다는 뜻
     context: Optional[Dict[str, Any]] = None # 모든 로그에 공통적으로 붙는 환경 정보
 ):
-    # 이 이벤트 하나를 기계가 분석하기 좋은 JSON 구조로 만듦
+    # 레벨 미달이면 아무 작업도 하지 않음
+    if _LEVEL_ORDER[level] < _MIN_LEVEL:
+        return
+
+    # 대량 이벤트 샘플링 (ERROR는 항상 기록)
+    sample_rate = LOG_SAMPLE_RATES.get(event_type)
+    if sample_rate is not None and level != LogLevel.ERROR and random.random() >= sample_rate:
+        return
+
+    # 이 이벤트 하나를 기계가 분석하기 좋은 JSON 구조로 만듦 (직렬화는 listener 스레드에서)
+    # payload / context는 새 dict로 얕은 복사 → 호출 후 payload dict를 재사용 / 수정해도 기록에 영향 없음
+    # (중첩된 값은 공유되므로 기록 직후 수정하지 않는 값만 넣을 것)
     log_data = {
         "event": event_type, # 모든 로그의 1번 키, 분석/알림 기준점
-        "timestamp": datetime.utcnow().isoformat(), # 이벤트 자체의 시간
+        "timestamp": time(), # 이벤트 자체의 시간 (기록 시 ISO 형식으로 변환)
         "service": "captcha-backend", # 여러 서비스 중 어디서 나온 로그인지
+        "level": level.value,
         **(context or {}), # context가 있으면 풀어서 추가, 없으면 빈 dict
         **payload, # 이벤트별 정보 추가
     }
+    if sample_rate is not None:
+        log_data["sample_rate"] = sample_rate # 분석 시 1/sample_rate 가중치
+
+    # 요청 처리 중 발생한 로그는 request_id로 묶어서 조회 가능하도록
+    request_id = current_request_id()
+    if request_id is not None and "request_id" not in log_data:
+        log_data["request_id"] = request_id
+
+    if not _listener_started:
+        _start_listener()
+    _QUEUE_HANDLER.handle(_make_record(level, log_data))
 
-    message = json.dumps(log_data, ensure_ascii=False)
 
-    if level == LogLevel.WARNING:
-        logger.warning(message)
-    elif level == LogLevel.ERROR:
-        logger.error(message)
-    else:
-        logger.info(message)
+def flush_logs():
+    """큐에 남은 로그가 모두 기록될 때까지 대기 (테스트 / 종료 처리용)"""
+    if _listener_started:
+        _QUEUE.join()
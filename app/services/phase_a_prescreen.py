@@ -0,0 +1,93 @@
+# app/services/phase_a_prescreen.py
+"""
+Phase A 로컬 기하 사전검사
+- 세션에 저장된 target_path(절취선 Bézier 포인트)와 사용자 궤적을 NumPy로 비교
+- 절취선과 동떨어진 드래그는 AI 서버 호출 없이 즉시 거절
+- 애매한 경우는 모두 통과시켜 최종 판정은 AI 모델에 맡김
+"""
+
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.core.config import (
+    PHASE_A_PRESCREEN_ENABLED,
+    PHASE_A_PRESCREEN_MAX_MEDIAN_DISTANCE_PX,
+    PHASE_A_PRESCREEN_COVERAGE_RADIUS_PX,
+    PHASE_A_PRESCREEN_MIN_COVERAGE,
+)
+from app.core.metrics import counter
+from app.utils.trajectory import Trajectory
+
+# 거리 행렬(n x 250) 크기를 제한하기 위한 사용자 포인트 상한
+_MAX_SCREEN_POINTS = 1024
+
+PRESCREEN_RESULTS = counter(
+    "captcha_phase_a_prescreen_total",
+    "Phase A 로컬 사전검사 결과 (reason=pass면 AI 서버로 전달)",
+    ("reason",),
+)
+
+
+def _target_array(target_path: List[Dict[str, Any]]) -> np.ndarray:
+    return np.array([(p["x"], p["y"]) for p in target_path], dtype=np.float32)
+
+
+def prescreen_phase_a(
+    trajectory: Trajectory,
+    target_path: List[Dict[str, Any]],
+    image_size: Optional[List[int]],
+) -> Dict[str, Any]:
+    """
+    사용자 궤적(0~1 정규화)을 이미지 픽셀 좌표로 변환해 target_path와 비교한다.
+
+    측정값:
+        median_distance_px: 사용자 포인트별 절취선 최근접 거리의 중앙값
+        coverage: 절취선 포인트 중 반경 내에 사용자 포인트가 있는 비율
+
+    Returns:
+        {"pass": bool, "reason": str, "median_distance_px": float, "coverage": float}
+        검사할 수 없는 경우(비활성, 정답 경로/이미지 크기 없음, 포인트 부족)는 pass
+    """
+    if (
+        not PHASE_A_PRESCREEN_ENABLED
+        or not target_path
+        or not image_size
+        or len(trajectory) < 3
+    ):
+        return {"pass": True, "reason": "skipped"}
+
+    img_w, img_h = image_size
+    xs, ys = trajectory.xs, trajectory.ys
+    if len(xs) > _MAX_SCREEN_POINTS:
+        step = -(-len(xs) // _MAX_SCREEN_POINTS)
+        xs, ys = xs[::step], ys[::step]
+
+    ux = (xs * img_w).astype(np.float32)[:, None]
+    uy = (ys * img_h).astype(np.float32)[:, None]
+    target = _target_array(target_path)
+
+    # (n, m) 제곱거리 행렬 한 번으로 양방향 최근접 거리 계산 (sqrt는 중앙값에만)
+    dx = ux - target[:, 0]
+    dy = uy - target[:, 1]
+    dist_sq = dx * dx
+    dist_sq += dy * dy
+
+    median_distance = float(np.sqrt(np.median(dist_sq.min(axis=1))))
+    coverage = float(np.mean(dist_sq.min(axis=0) <= PHASE_A_PRESCREEN_COVERAGE_RADIUS_PX ** 2))
+
+    if median_distance > PHASE_A_PRESCREEN_MAX_MEDIAN_DISTANCE_PX:
+        reason = "far_from_target_path"
+    elif coverage < PHASE_A_PRESCREEN_MIN_COVERAGE:
+        reason = "low_target_coverage"
+    else:
+        reason = "pass"
+
+    PRESCREEN_RESULTS.inc(reason=reason)
+
+    return {
+        "pass": reason == "pass",
+        "reason": reason,
+        "median_distance_px": round(median_distance, 2),
+        "coverage": round(coverage, 3),
+    }
@@ -1,6 +1,8 @@
 # app/services/phase_a_service.py
 
 from typing import Dict, Any, List, Tuple
+from app.core.admission import GENERATION_LIMITER
+from app.core.metrics import stage_timer
 from app.utils.image_tools import generate_phase_a_problem
 
 GUIDE_TEXT = "절취선을 따라 드래그하세요."
@@ -34,7 +36,9 @@ def generate_phase_a_both() -> Tuple[Dict[str, Any], Dict[str, Any]]:
         fe_payload: FE에게 내려보낼 UI/문제 데이터
         internal_payload: 서버에만 저장할 정답 경로/메타데이터
     """
-    problem = generate_phase_a_problem()
+    # 동시 생성 수 제한 (과부하 시 OverloadedError)
+    with GENERATION_LIMITER.acquire(), stage_timer("phase_a_generation"):
+        problem = generate_phase_a_problem()
 
     # ---------------------------
     # FE(클라이언트) 전달용 데이터
@@ -74,7 +78,8 @@ def generate_phase_a_both() -> Tuple[Dict[str, Any], Dict[str, Any]]:
     # Internal(서버) 저장 데이터
     # ---------------------------
     internal_payload = {
-        "target_path": problem["target_path"]
+        "target_path": problem["target_path"],
+        "image_size": [img_w, img_h],  # target_path 픽셀 좌표 → 0~1 정규화 기준
     }
 
     return fe_payload, internal_payload
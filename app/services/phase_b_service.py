@@ -5,8 +5,9 @@ import base64
 import random
 from time import time
 from typing import Dict, Any, List, Tuple
-from PIL import Image
 
+from app.core.admission import GENERATION_LIMITER
+from app.core.metrics import stage_timer
 from app.services.ai_phase_b_client import generate_phase_b_problem_from_ai
 from app.utils.image_tools import to_base64, apply_watermark_and_noise
 
@@ -29,6 +30,8 @@ def generate_phase_b_payload(
     Returns:
         FE용 payload (absolute answer 제외)
     """
+    from PIL import Image  # 워커 부팅 시 로드하지 않도록 사용 시점에 import
+
     processed_grid = []
     
     for idx, img_info in enumerate(problem_data["images"]):
@@ -48,7 +51,8 @@ def generate_phase_b_payload(
         assigned_number = fixed_numbers[idx]
         
         # 숫자 워터마크 적용
-        marked = apply_watermark_and_noise(img, assigned_number, fail_count)
+        with stage_timer("watermark"):
+            marked = apply_watermark_and_noise(img, assigned_number, fail_count)
         
         processed_grid.append({
             "image_id": img_info["image_id"],
@@ -108,19 +112,21 @@ def generate_phase_b_both(fail_count: int) -> Tuple[Dict[str, Any], Dict[str, An
     Returns:
         (fe_payload, internal_payload)
     """
-    # 1) AI 서버에서 문제 생성
-    problem_data = generate_phase_b_problem_from_ai()
-    
     # 2) 고정된 숫자 배치 (1~9 순서대로)
     # 3x3 그리드: [1,2,3 / 4,5,6 / 7,8,9]
     fixed_numbers = list(range(1, 10))  # [1, 2, 3, 4, 5, 6, 7, 8, 9]
-    
-    # 3) FE payload 생성
-    fe_payload = generate_phase_b_payload(
-        fail_count=fail_count,
-        problem_data=problem_data,
-        fixed_numbers=fixed_numbers
-    )
+
+    # 1) AI 서버에서 문제 생성 (네트워크 대기 → CPU 기준 생성 한도 밖에서 호출)
+    with stage_timer("phase_b_ai_generate"):
+        problem_data = generate_phase_b_problem_from_ai()
+
+    # 3) FE payload 생성 (이미지 디코딩 + 워터마크: CPU 작업만 동시 생성 수 제한, 과부하 시 OverloadedError)
+    with GENERATION_LIMITER.acquire(), stage_timer("phase_b_generation"):
+        fe_payload = generate_phase_b_payload(
+            fail_count=fail_count,
+            problem_data=problem_data,
+            fixed_numbers=fixed_numbers
+        )
     
     # 4) Internal payload 생성
     internal_payload = generate_phase_b_internal(
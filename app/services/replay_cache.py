@@ -0,0 +1,213 @@
+# app/services/replay_cache.py
+"""
+궤적 지문(fingerprint) 캐시 - 녹화된 사람 드래그 재사용(replay) 탐지
+- exact: 정규화 궤적 원본 값의 해시 (완전히 같은 재전송)
+- near: 시간축 기준 32점 재샘플 시그니처를 (시작 위치, 소요시간) 버킷에 보관하고
+        같은/인접 버킷 후보와 벡터 연산으로 최대 편차 비교 (미세 변형된 재전송)
+- FIFO + TTL로 메모리 상한 유지, hit/miss/eviction 메트릭 기록
+  (모든 항목의 TTL이 같아 삽입 순서 = 만료 순서, 조회 hit으로 수명을 늘리지 않음:
+   재전송 탐지는 첫 판정 후 TTL 동안만 의미가 있고, 앞쪽부터 만료분을 정리하는 전제를 유지)
+"""
+
+import threading
+from collections import OrderedDict
+from hashlib import blake2b
+from time import monotonic
+from typing import Dict, Any, List, Optional, Tuple
+
+import numpy as np
+
+from app.core.config import (
+    REPLAY_CACHE_ENABLED,
+    REPLAY_CACHE_TTL_SECONDS,
+    REPLAY_CACHE_MAX_ENTRIES,
+)
+from app.core.metrics import counter, gauge
+from app.utils.trajectory import Trajectory
+
+# 지문 계산에 필요한 최소 포인트 수 (짧은 궤적은 사람끼리도 겹칠 수 있음)
+MIN_FINGERPRINT_POINTS = 10
+
+SIGNATURE_POINTS = 32
+NEAR_MAX_DEVIATION = 0.005     # 시그니처 최대 편차 (정규화 좌표, 1920px 기준 약 10px)
+START_CELL = 16                # 시작 위치 버킷 (화면의 1/16)
+DURATION_BUCKET_MS = 100       # 소요시간 버킷, 조회 시 ±1 버킷까지 탐색
+MAX_BUCKET_ENTRIES = 32        # 버킷당 최근 후보 수 상한
+
+CACHE_LOOKUPS = counter(
+    "captcha_replay_cache_lookups_total",
+    "궤적 지문 캐시 조회 결과 (result=exact|near|miss)",
+    ("result",),
+)
+CACHE_EVICTIONS = counter(
+    "captcha_replay_cache_evictions_total",
+    "용량 초과 / TTL 만료로 제거된 지문 수",
+    ("cause",),
+)
+CACHE_SIZE = gauge("captcha_replay_cache_entries", "현재 저장된 지문 수")
+
+
+class Fingerprint:
+    """exact 해시 + near 시그니처 (타임스탬프는 첫 포인트 기준 상대값)"""
+
+    __slots__ = ("exact_key", "signature", "start_cell", "duration_bucket")
+
+    def __init__(self, trajectory: Trajectory, ts: np.ndarray):
+        h = blake2b(digest_size=16)
+        for column in (trajectory.xs, trajectory.ys, ts):
+            h.update(column.tobytes())
+        self.exact_key = h.digest()
+
+        duration = float(ts[-1])
+        grid_t = np.linspace(0.0, duration, SIGNATURE_POINTS)
+        self.signature = np.concatenate((
+            np.interp(grid_t, ts, trajectory.xs),
+            np.interp(grid_t, ts, trajectory.ys),
+        )).astype(np.float32)
+
+        self.start_cell = (
+            int(trajectory.xs[0] * START_CELL),
+            int(trajectory.ys[0] * START_CELL),
+        )
+        self.duration_bucket = int(duration // DURATION_BUCKET_MS)
+
+    def bucket_keys(self) -> List[Tuple[int, int, int]]:
+        cx, cy = self.start_cell
+        d = self.duration_bucket
+        return [(cx, cy, d), (cx, cy, d - 1), (cx, cy, d + 1)]
+
+
+def fingerprint(trajectory: Trajectory) -> Optional[Fingerprint]:
+    """포인트가 너무 적거나 시간축이 올바르지 않으면 None"""
+    if len(trajectory) < MIN_FINGERPRINT_POINTS:
+        return None
+
+    ts = trajectory.ts - trajectory.ts[0]
+    if ts[-1] <= 0 or np.any(np.diff(ts) < 0):
+        return None
+
+    return Fingerprint(trajectory, ts)
+
+
+class ReplayCache:
+    """
+    exact_key → entry (삽입 순서 FIFO) + near 버킷 인덱스
+    entry: {"verdict", "session_id", "expires_at", "hits", "signature", "bucket"}
+    """
+
+    def __init__(self, max_entries: int, ttl_seconds: float):
+        self.max_entries = max_entries
+        self.ttl_seconds = ttl_seconds
+        self._entries: "OrderedDict[bytes, Dict[str, Any]]" = OrderedDict()
+        self._buckets: Dict[Tuple[int, int, int], List[Dict[str, Any]]] = {}
+        self._lock = threading.Lock()
+
+    # -----------------------
+    # 내부 헬퍼 (lock 보유 상태에서 호출)
+    # -----------------------
+    def _remove(self, key: bytes, cause: str):
+        entry = self._entries.pop(key)
+        bucket = self._buckets.get(entry["bucket"])
+        if bucket is not None:
+            try:
+                bucket.remove(entry)
+            except ValueError:
+                pass
+            if not bucket:
+                del self._buckets[entry["bucket"]]
+        CACHE_EVICTIONS.inc(cause=cause)
+
+    def _find_near(self, fp: Fingerprint, now: float) -> Optional[Dict[str, Any]]:
+        candidates = [
+            entry
+            for key in fp.bucket_keys()
+            for entry in self._buckets.get(key, ())
+            if entry["expires_at"] >= now
+        ]
+        if not candidates:
+            return None
+
+        signatures = np.stack([entry["signature"] for entry in candidates])
+        deviation = np.abs(signatures - fp.signature).max(axis=1)
+        best = int(np.argmin(deviation))
+        return candidates[best] if deviation[best] <= NEAR_MAX_DEVIATION else None
+
+    # -----------------------
+    # 조회 / 기록
+    # -----------------------
+    def lookup(self, trajectory: Trajectory, session_id: str) -> Optional[Dict[str, Any]]:
+        """
+        일치하는 지문이 있으면 {"verdict", "match", "cross_session"} 반환, 없으면 None
+        """
+        fp = fingerprint(trajectory)
+        if fp is None:
+            return None
+
+        now = monotonic()
+        with self._lock:
+            match = "exact"
+            entry = self._entries.get(fp.exact_key)
+            if entry is not None and entry["expires_at"] < now:
+                self._remove(fp.exact_key, "ttl")
+                entry = None
+
+            if entry is None:
+                match = "near"
+                entry = self._find_near(fp, now)
+
+            if entry is None:
+                CACHE_LOOKUPS.inc(result="miss")
+                return None
+
+            entry["hits"] += 1
+
+        CACHE_LOOKUPS.inc(result=match)
+        return {
+            "verdict": entry["verdict"],
+            "match": match,
+            "cross_session": entry["session_id"] != session_id,
+        }
+
+    def record(self, trajectory: Trajectory, session_id: str, verdict: bool):
+        """최종 판정 결과 저장"""
+        fp = fingerprint(trajectory)
+        if fp is None:
+            return
+
+        now = monotonic()
+        bucket_key = fp.bucket_keys()[0]
+
+        with self._lock:
+            # TTL이 동일하므로 앞쪽(오래된 항목)부터 만료분 정리
+            while self._entries:
+                oldest_key, oldest = next(iter(self._entries.items()))
+                if oldest["expires_at"] >= now:
+                    break
+                self._remove(oldest_key, "ttl")
+
+            if fp.exact_key in self._entries:
+                self._remove(fp.exact_key, "replaced")
+
+            entry = {
+                "verdict": verdict,
+                "session_id": session_id,
+                "expires_at": now + self.ttl_seconds,
+                "hits": 0,
+                "signature": fp.signature,
+                "bucket": bucket_key,
+            }
+            self._entries[fp.exact_key] = entry
+
+            bucket = self._buckets.setdefault(bucket_key, [])
+            bucket.append(entry)
+            if len(bucket) > MAX_BUCKET_ENTRIES:
+                bucket.pop(0)  # 버킷 후보에서만 제외 (exact 항목은 FIFO로 관리)
+
+            while len(self._entries) > self.max_entries:
+                self._remove(next(iter(self._entries)), "capacity")
+
+            CACHE_SIZE.set(len(self._entries))
+
+
+# 프로세스 전역 캐시
+REPLAY_CACHE = ReplayCache(REPLAY_CACHE_MAX_ENTRIES, REPLAY_CACHE_TTL_SECONDS) if REPLAY_CACHE_ENABLED else None
@@ -0,0 +1,64 @@
+# app/services/s2s_verify_service.py
+"""
+고객사 서버 간(S2S) 일괄 검증
+- session_id 목록: 세션 저장소 일괄 조회 1회 (get_sessions_bulk)
+- 완료 토큰 목록: 토큰별 HMAC 검증 (저장소 조회 없음)
+- 결과는 요청 순서대로 항목별 반환 (일부 실패해도 전체 요청은 성공)
+"""
+
+from typing import List, Dict, Any
+
+from app.core.completion_token import verify_completion_token, CompletionTokenError
+from app.core.session_store import get_sessions_bulk, is_session_expired
+from app.core.state_machine import SessionStatus
+
+
+def verify_sessions_batch(session_ids: List[str]) -> List[Dict[str, Any]]:
+    """session_id별 {"session_id", "success", "status", "reason"}"""
+    sessions = get_sessions_bulk(session_ids)
+    results = []
+
+    for session_id in session_ids:
+        session = sessions.get(session_id)
+
+        if session is None:
+            results.append({"session_id": session_id, "success": False,
+                            "status": None, "reason": "SESSION_NOT_FOUND"})
+            continue
+
+        if is_session_expired(session):
+            results.append({"session_id": session_id, "success": False,
+                            "status": session["status"], "reason": "SESSION_EXPIRED"})
+            continue
+
+        completed = session["status"] == SessionStatus.COMPLETED.value
+        results.append({
+            "session_id": session_id,
+            "success": completed,
+            "status": session["status"],
+            "reason": None if completed else "NOT_COMPLETED",
+        })
+
+    return results
+
+
+def verify_tokens_batch(tokens: List[str]) -> List[Dict[str, Any]]:
+    """토큰별 {"session_id", "client_id", "success", "reason"} (실패 시 session_id는 None)"""
+    results = []
+
+    for token in tokens:
+        try:
+            claims = verify_completion_token(token)
+        except CompletionTokenError as e:
+            results.append({"session_id": None, "client_id": None,
+                            "success": False, "reason": e.reason})
+            continue
+
+        results.append({
+            "session_id": claims["session_id"],
+            "client_id": claims["client_id"],
+            "success": True,
+            "reason": None,
+        })
+
+    return results
@@ -0,0 +1,90 @@
+# app/services/trajectory_codec.py
+"""
+AI 서버 전송용 궤적(points) 압축 바이너리 포맷
+- JSON의 {"x","y","t","eventType"} 객체 배열 대신 컬럼 단위 float32 배열 + eventType 코드 배열
+- AI 서버가 헬스체크 응답(wire_formats)에 "packed"를 광고한 경우에만 사용 (ai_endpoint_pool)
+
+레이아웃 (little-endian):
+    magic    4B   b"TCTJ"
+    version  u8
+    reserved u8 * 3
+    n        u32   포인트 수
+    t0       f64   첫 타임스탬프 (t 컬럼은 t0 기준 상대값으로 저장 → float32 정밀도 유지)
+    hlen     u32   header JSON 길이
+    header   JSON  {"metadata": {...}, "events": ["move", "down", ...]}
+    xs       f32 * n
+    ys       f32 * n
+    ts       f32 * n   (t - t0, ms)
+    codes    u8  * n   header.events 인덱스
+"""
+
+import json
+import struct
+from typing import Dict, Any, Tuple
+
+import numpy as np
+
+from app.utils.trajectory import Trajectory
+
+PACKED_CONTENT_TYPE = "application/vnd.tcurity.trajectory"
+PACKED_WIRE_FORMAT = "packed"
+JSON_WIRE_FORMAT = "json"
+
+_MAGIC = b"TCTJ"
+_VERSION = 1
+_PREFIX = struct.Struct("<4sB3xIdI")
+
+# eventType 종류는 최대 256개까지 (u8 코드)
+_MAX_EVENT_TYPES = 256
+
+
+def encode_packed(trajectory: Trajectory, metadata: Dict[str, Any]) -> bytes:
+    """
+    필터링이 끝난 궤적을 packed 바이너리로 인코딩
+    """
+    n = len(trajectory)
+    t0 = float(trajectory.ts[0]) if n else 0.0
+
+    events, codes = np.unique(trajectory.events.astype(str), return_inverse=True)
+    if len(events) > _MAX_EVENT_TYPES:
+        raise ValueError("eventType 종류가 너무 많습니다.")
+
+    header = json.dumps(
+        {"metadata": metadata, "events": events.tolist()},
+        separators=(",", ":"),
+        ensure_ascii=False,
+    ).encode("utf-8")
+
+    return b"".join((
+        _PREFIX.pack(_MAGIC, _VERSION, n, t0, len(header)),
+        header,
+        trajectory.xs.astype("<f4").tobytes(),
+        trajectory.ys.astype("<f4").tobytes(),
+        (trajectory.ts - t0).astype("<f4").tobytes(),
+        codes.astype(np.uint8).tobytes(),
+    ))
+
+
+def decode_packed(data: bytes) -> Tuple[Trajectory, Dict[str, Any]]:
+    """
+    packed 바이너리를 다시 (궤적, metadata)로 복원 (AI 서버 측 참고 구현 / 벤치마크용)
+    """
+    magic, version, n, t0, hlen = _PREFIX.unpack_from(data, 0)
+    if magic != _MAGIC or version != _VERSION:
+        raise ValueError("지원하지 않는 궤적 포맷입니다.")
+
+    offset = _PREFIX.size
+    header = json.loads(data[offset:offset + hlen].decode("utf-8"))
+    offset += hlen
+
+    columns = np.frombuffer(data, dtype="<f4", count=3 * n, offset=offset).astype(np.float64)
+    codes = np.frombuffer(data, dtype=np.uint8, count=n, offset=offset + 12 * n)
+
+    events = np.array(header["events"], dtype=object)
+    trajectory = Trajectory(
+        columns[:n],
+        columns[n:2 * n],
+        columns[2 * n:] + t0,
+        events[codes] if n else np.empty(0, dtype=object),
+    )
+    return trajectory, header["metadata"]
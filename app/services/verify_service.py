@@ -1,12 +1,17 @@
 # app/services/verify_service.py
 
 from time import time
-from typing import List, Dict, Any
+from typing import List, Dict, Any, Optional
 
 from app.schemas.common import BaseResponse, ErrorInfo
 from app.schemas.error_codes import ErrorCode
 
+from app.core.config import TRAJECTORY_MAX_POINTS, TRAJECTORY_REDUCTION, REPLAY_CACHE_MODE, BOT_HEURISTICS_MODE
 from app.core.state_machine import SessionStatus
+from app.core.admission import OverloadedError
+from app.core.metrics import stage_timer
+from app.core.fair_scheduler import AI_FAIR_SCHEDULER
+from app.core.completion_token import issue_completion_token
 from app.core.session_store import (
     get_session_and_validate,
     update_session,
@@ -17,11 +22,84 @@ from app.services.phase_a_service import generate_phase_a_both
 from app.services.phase_b_service import generate_phase_b_both
 from app.services.ai_phase_a_client import verify_phase_a_with_ai
 from app.services.ai_phase_b_client import verify_phase_b_with_ai
+from app.services.phase_a_prescreen import prescreen_phase_a
+from app.services.bot_heuristics import evaluate_bot_rules
+from app.services.replay_cache import REPLAY_CACHE
+from app.services.logging_service import log_event, LogLevel
+from app.utils.trajectory import Trajectory, parse_points, downsample
 
 
 PHASE_B_TIME_LIMIT = 30  # seconds
 
 
+# ============================================================
+#   PHASE A 로컬 판정 (AI 호출 전)
+# ============================================================
+def is_model_verdict(ai_result: Dict[str, Any]) -> bool:
+    """AI 모델이 실제로 내린 판정인지 (서버 오류 / 포인트 부족 fallback 제외)"""
+    reason = str(ai_result.get("reason", ""))
+    return not reason.startswith("ai_server_") and reason != "insufficient_valid_points"
+
+
+def is_overload_signal(ai_result: Dict[str, Any]) -> bool:
+    """AI 서버 과부하로 볼 수 있는 실패 (타임아웃 / 연결 실패 / 5xx) → 동시 실행 한도 감소"""
+    reason = str(ai_result.get("reason", ""))
+    return reason in ("ai_server_timeout", "ai_server_connection_failed", "ai_server_unknown_error") \
+        or reason.startswith("ai_server_error_5")
+
+
+def judge_phase_a_locally(
+    session_id: str,
+    session: Dict[str, Any],
+    trajectory: Trajectory,
+) -> Optional[Dict[str, Any]]:
+    """
+    AI 서버 없이 결론 낼 수 있는 경우 {"pass", "reason"}를 반환, 아니면 None.
+    (trajectory는 다운샘플 전 원본)
+    1) target_path 기하 사전검사  2) 궤적 재사용(replay) 캐시  3) 운동학 휴리스틱 룰
+    """
+    # 절취선과 동떨어진 드래그는 AI 서버 호출 없이 거절
+    screen = prescreen_phase_a(
+        trajectory,
+        session["phase_a"]["target_path"],
+        session["phase_a"].get("image_size"),
+    )
+    if not screen["pass"]:
+        log_event(
+            "PHASE_A_PRESCREEN_REJECTED",
+            {"session_id": session_id, **screen},
+            level=LogLevel.WARNING
+        )
+        return {"pass": False, "reason": screen["reason"]}
+
+    # 이미 판정된 궤적의 재전송: 다른 세션이면 replay, 같은 세션이면 이전 판정 재사용
+    cached = REPLAY_CACHE.lookup(trajectory, session_id) if REPLAY_CACHE is not None else None
+    if cached is not None:
+        if cached["cross_session"]:
+            log_event(
+                "PHASE_A_REPLAY_DETECTED",
+                {"session_id": session_id, "match": cached["match"], "mode": REPLAY_CACHE_MODE},
+                level=LogLevel.WARNING
+            )
+            if REPLAY_CACHE_MODE == "reject":
+                return {"pass": False, "reason": f"replay_{cached['match']}"}
+        else:
+            return {"pass": cached["verdict"], "reason": "replay_cache"}
+
+    # 명백한 봇 패턴은 AI 서버(GPU) 호출 없이 로컬 룰로 차단 (flag 모드는 기록만)
+    bot_rule = evaluate_bot_rules(trajectory, "A")
+    if bot_rule is not None:
+        log_event(
+            "PHASE_A_BOT_RULE_HIT",
+            {"session_id": session_id, "rule": bot_rule, "mode": BOT_HEURISTICS_MODE},
+            level=LogLevel.WARNING
+        )
+        if BOT_HEURISTICS_MODE == "reject":
+            return {"pass": False, "reason": f"bot_rule_{bot_rule}"}
+
+    return None
+
+
 # ============================================================
 #   PHASE A 검증 (AI 연동)
 # ============================================================
@@ -48,12 +126,32 @@ def verify_phase_a(
 
     # ---------------- AI 서버 호출 ----------------
     try:
-        # FE payload에서 points와 metadata 추출
+        # FE payload에서 points와 metadata 추출 (배열/객체/컬럼 형식 모두 컬럼 궤적으로 변환)
         points = behavior_pattern_data.get("points", [])
         metadata = behavior_pattern_data.get("metadata", {})
-        
-        ai_result = verify_phase_a_with_ai(points, metadata)
+        with stage_timer("trajectory_normalize"):
+            trajectory = parse_points(points, default_event="move")
+
+        # 로컬 판정(사전검사 / 재사용 캐시 / 휴리스틱)으로 결론이 나면 AI 서버 호출 생략
+        # (다운샘플 전 원본 궤적 기준: 재샘플 / RDP는 중복 타임스탬프를 합치고 dt를 바꿈)
+        with stage_timer("phase_a_local_judge"):
+            ai_result = judge_phase_a_locally(session_id, session, trajectory)
+        if ai_result is None:
+            # 다운샘플은 AI 서버로 보내는 payload에만 적용
+            with stage_timer("trajectory_downsample"):
+                ai_trajectory = downsample(trajectory, TRAJECTORY_MAX_POINTS, TRAJECTORY_REDUCTION)
+            # AI 서버 슬롯은 고객사별 공정 분배 (DRR)
+            with AI_FAIR_SCHEDULER.acquire(session["client_id"]) as permit:
+                with stage_timer("ai_verify_phase_a"):
+                    ai_result = verify_phase_a_with_ai(ai_trajectory, metadata)
+                if is_overload_signal(ai_result):
+                    permit.drop()
+            if REPLAY_CACHE is not None and is_model_verdict(ai_result):
+                REPLAY_CACHE.record(trajectory, session_id, bool(ai_result.get("pass")))
         is_human = ai_result.get("pass", False)
+    except OverloadedError:
+        # 과부하 거절은 시도 실패로 세지 않고 그대로 retry-after 응답
+        raise
     except Exception:
         # AI 서버 오류는 보안상 FAIL 처리
         is_human = False
@@ -62,12 +160,13 @@ def verify_phase_a(
     #   SUCCESS → Phase B 진입
     # ==================================================
     if is_human:
-        set_session_status(session_id, SessionStatus.PHASE_B)
-
         fail_count = session["phase_b"]["fail_count"]
 
+        # 문제 생성이 과부하로 거절되면 PHASE_A에 머물도록 생성 후 상태 전이
         fe_payload, internal_payload = generate_phase_b_both(fail_count)
 
+        set_session_status(session_id, SessionStatus.PHASE_B)
+
         update_session(
             session_id,
             {
@@ -102,6 +201,7 @@ def verify_phase_a(
             "phase_a": {
                 "attempts": session["phase_a"]["attempts"] + 1,
                 "target_path": internal_payload["target_path"],
+                "image_size": internal_payload["image_size"],
             }
         },
     )
@@ -171,15 +271,22 @@ def handle_phase_b_fail(
     session: Dict[str, Any],
     fail_count: int,
     error: ErrorCode,
+    count_failure: bool = True,
 ) -> BaseResponse:
     """
     Phase B 실패 처리:
-    - fail_count 증가
+    - fail_count 증가 (count_failure=False면 유지)
     - 새로운 문제 발급
     """
-    new_fail = fail_count + 1
+    new_fail = fail_count + 1 if count_failure else fail_count
 
-    fe_payload, internal_payload = generate_phase_b_both(new_fail)
+    try:
+        fe_payload, internal_payload = generate_phase_b_both(new_fail)
+    except OverloadedError:
+        # 재발급이 과부하로 거절돼도 실패는 반영하고 기존 문제는 닫음 (같은 문제로 재시도 불가)
+        # → 다음 제출에서 실패 횟수 증가 없이 새 문제만 발급
+        update_session(session_id, {"phase_b": {"correct_uuids": [], "fail_count": new_fail}})
+        raise
 
     update_session(
         session_id,
@@ -240,6 +347,17 @@ def verify_phase_b(
 
     elapsed = (int(time() * 1000) - issued_at) / 1000
 
+    # ---------------- 닫힌 문제 (이전 재발급이 과부하로 거절됨) ----------------
+    # 실패는 이미 반영됐으므로 fail_count 그대로 새 문제 발급 (빈 정답과 빈 제출이 일치하지 않도록 먼저 검사)
+    if not session["phase_b"]["correct_uuids"]:
+        return handle_phase_b_fail(
+            session_id,
+            session,
+            fail_count,
+            ErrorCode.OVERLOADED,
+            count_failure=False,
+        )
+
     # ---------------- 시간 초과 ----------------
     if elapsed > PHASE_B_TIME_LIMIT:
         return handle_phase_b_fail(
@@ -288,18 +406,46 @@ def verify_phase_b(
 
     # ---------------- AI 서버 호출 (Phase B) ----------------
     # 정답이 맞으면 AI 서버에서 행동 패턴만 검증
+    ai_result = None
     try:
         # FE payload에서 points와 metadata 추출
         points = behavior_pattern_data.get("points", [])
         metadata = behavior_pattern_data.get("metadata", {})
-        
-        # AI 서버에 행동 데이터만 전송 (정답은 백엔드에서 이미 검증)
-        ai_result = verify_phase_b_with_ai(points, metadata)
-        is_human = ai_result.get("pass", False)
+        with stage_timer("trajectory_normalize"):
+            trajectory = parse_points(points, default_event="click")
+
+        # 명백한 봇 패턴은 로컬 룰로 차단 (flag 모드는 기록만), 나머지는 AI 서버에 행동 데이터만 전송
+        # (정답은 백엔드에서 이미 검증, 룰은 다운샘플 전 원본 궤적 기준)
+        bot_rule = evaluate_bot_rules(trajectory, "B")
+        if bot_rule is not None:
+            log_event(
+                "PHASE_B_BOT_RULE_HIT",
+                {"session_id": session_id, "rule": bot_rule, "mode": BOT_HEURISTICS_MODE},
+                level=LogLevel.WARNING
+            )
+            if BOT_HEURISTICS_MODE == "reject":
+                ai_result = {"pass": False, "reason": f"bot_rule_{bot_rule}"}
+        if ai_result is None:
+            with stage_timer("trajectory_downsample"):
+                ai_trajectory = downsample(trajectory, TRAJECTORY_MAX_POINTS, TRAJECTORY_REDUCTION)
     except Exception:
-        # AI 서버 오류 시 정답만 맞으면 통과 (AI 모델 준비 전)
-        is_human = True
-
+        # 파싱 / 룰 평가 오류는 Phase A와 같이 보안상 FAIL 처리 (AI fallback 대상 아님)
+        ai_result = {"pass": False, "reason": "invalid_trajectory"}
+
+    if ai_result is None:
+        try:
+            with AI_FAIR_SCHEDULER.acquire(session["client_id"]) as permit:
+                with stage_timer("ai_verify_phase_b"):
+                    ai_result = verify_phase_b_with_ai(ai_trajectory, metadata)
+                if is_overload_signal(ai_result):
+                    permit.drop()
+        except OverloadedError:
+            # 과부하 시 통과 처리(fallback)하지 않고 retry-after 응답
+            raise
+        except Exception:
+            # AI 서버 오류 시 정답만 맞으면 통과 (AI 모델 준비 전)
+            ai_result = {"pass": True, "reason": "ai_unavailable"}
+    is_human = ai_result.get("pass", False)
 
     # 행동 검증 결과 처리
     if is_human:
@@ -307,6 +453,8 @@ def verify_phase_b(
         return BaseResponse(
             status=SessionStatus.COMPLETED.value,  # COMPLETED 상태
             success=True,
+            # 고객사 서버가 세션 조회 없이 검증할 수 있는 서명 토큰
+            data={"completion_token": issue_completion_token(session_id, session["client_id"])},
         )
 
 
@@ -1,30 +1,100 @@
-import cv2
 import numpy as np
 import random
 import json
 import base64
 
+# cv2 / PIL은 import 비용이 커서 (워커 부팅 시간) 이미지를 실제로 다루는 함수 안에서 import
+# → /session/init, /verify만 처리하는 경로는 로드하지 않음 (startup warmup에서 백그라운드로 미리 로드)
+from app.core.metrics import stage_timer
+from app.core.profiling import profile_hook
+
+# Phase A 티켓 템플릿
+TICKET_TEMPLATE_PATH = "app/static/tcurity_ticket.png"
+
+# 워터마크 폰트 후보 (앞에서부터 시도, 모두 실패하면 PIL 기본 폰트)
+WATERMARK_FONT_PATHS = (
+    "/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf",
+    "/System/Library/Fonts/Helvetica.ttc",  # macOS
+)
+
+# 템플릿 / 폰트는 요청마다 디스크에서 읽지 않도록 프로세스 단위 캐시 (startup warmup에서 미리 로드)
+_TEMPLATE_CACHE = {}
+_FONT_CACHE = {}
+
 
 # ==========================================================
 # 공통 유틸리티 함수
 # ==========================================================
+def load_template(img_path):
+    """
+    템플릿 이미지를 BGRA로 읽어 캐시 (읽기 전용 배열, 사용하는 쪽에서 copy 후 수정)
+    """
+    img = _TEMPLATE_CACHE.get(img_path)
+    if img is not None:
+        return img
+
+    import cv2
+
+    img = cv2.imread(img_path, cv2.IMREAD_UNCHANGED)  # BGRA 가능
+    if img is None:
+        raise FileNotFoundError(f"입력 이미지 없음: {img_path}")
+
+    # 혹시 3채널로 들어오면 알파를 붙여줌(안전장치)
+    if len(img.shape) == 3 and img.shape[2] == 3:
+        alpha = np.full((img.shape[0], img.shape[1], 1), 255, dtype=img.dtype)
+        img = np.concatenate([img, alpha], axis=2)  # BGR + A
+
+    img.flags.writeable = False
+    _TEMPLATE_CACHE[img_path] = img
+    return img
+
+
+def load_font(font_size):
+    """워터마크 폰트 (크기별 캐시)"""
+    font = _FONT_CACHE.get(font_size)
+    if font is not None:
+        return font
+
+    from PIL import ImageFont
+
+    for path in WATERMARK_FONT_PATHS:
+        try:
+            font = ImageFont.truetype(path, font_size)
+            break
+        except OSError:
+            continue
+    else:
+        # 기본 폰트 (크기 조절 불가)
+        font = ImageFont.load_default()
+
+    _FONT_CACHE[font_size] = font
+    return font
+
+
+@profile_hook("to_base64")
 def to_base64(img):
     """
     numpy 이미지(BGR)를 base64 문자열로 변환
     """
     if img is None:
         return ""
-    _, buffer = cv2.imencode('.png', img)
-    return base64.b64encode(buffer).decode('utf-8')
+    import cv2
 
+    with stage_timer("png_encode"):
+        _, buffer = cv2.imencode('.png', img)
+    with stage_timer("base64_encode"):
+        return base64.b64encode(buffer).decode('utf-8')
 
+
+@profile_hook("apply_watermark_and_noise")
 def apply_watermark_and_noise(img, number, fail_count):
     """
     Phase B 이미지에 숫자 워터마크 적용
     - number: 이미지에 표시할 숫자 (1~9)
     - fail_count: 실패 횟수 (현재 미사용, 추후 노이즈 추가 시 사용)
     """
-    from PIL import ImageDraw, ImageFont
+    import cv2
+    from PIL import Image, ImageDraw
     
     # PIL Image로 변환 (없으면 그대로)
     if not hasattr(img, 'mode'):
@@ -47,16 +117,7 @@ def apply_watermark_and_noise(img, number, fail_count):
         w, h = img.size
         font_size = max(20, int(min(w, h) / 10))
         
-        try:
-            # 시스템 기본 폰트 사용 시도
-            font = ImageFont.truetype("/usr/share/fonts/truetype/dejavu/DejaVuSans-Bold.ttf", font_size)
-        except:
-            try:
-                # macOS 폰트
-                font = ImageFont.truetype("/System/Library/Fonts/Helvetica.ttc", font_size)
-            except:
-                # 기본 폰트 (크기 조절 불가)
-                font = ImageFont.load_default()
+        font = load_font(font_size)
         
         # 텍스트 크기 계산
         bbox = draw.textbbox((0, 0), text, font=font)
@@ -92,12 +153,12 @@ def generate_phase_a_problem():
     """
     Phase A 문제 생성 - 절취선 이미지를 생성하고 FE에 전달할 데이터 반환
     """
-    img_path = "app/static/tcurity_ticket.png"  
+    img_path = TICKET_TEMPLATE_PATH
     
-    canvas, metadata = generate_cutline(img_path)
+    with stage_timer("cutline_render"):
+        canvas, metadata = generate_cutline(img_path)
     
-    _, buffer = cv2.imencode('.png', canvas)
-    image_base64 = base64.b64encode(buffer).decode('utf-8')
+    image_base64 = to_base64(canvas)
     
     curve_points = metadata["curve_points"]
     target_path = [
@@ -152,6 +213,7 @@ def bezier_curve(P0, P1, P2, P3, num_points=250):
 # ==========================================================
 # 2) 절취선 생성 (메모리 리턴 + 저장 없음)
 # ==========================================================
+@profile_hook("generate_cutline")
 def generate_cutline(
     img_path,
     x_center_ratio=(0.30, 0.55),
@@ -169,20 +231,12 @@ def generate_cutline(
     파일 저장은 전혀 하지 않음.
     """
 
+    import cv2
+
     # ------------------------
-    # 이미지 로드
+    # 이미지 로드 (캐시된 BGRA 템플릿)
     # ------------------------
-    img = cv2.imread(img_path, cv2.IMREAD_UNCHANGED)  # BGRA 가능
-
-    if img is None:
-        raise FileNotFoundError(f"입력 이미지 없음: {img_path}")
-
-    # 혹시 3채널로 들어오면 알파를 붙여줌(안전장치)
-    if len(img.shape) == 3 and img.shape[2] == 3:
-        alpha = np.full((img.shape[0], img.shape[1], 1), 255, dtype=img.dtype)
-        img = np.concatenate([img, alpha], axis=2)  # BGR + A
-
-    canvas = img.copy()
+    img = load_template(img_path)
 
     color = (255, 255, 255, 255)  # 흰색 + 불투명
 
@@ -273,6 +327,7 @@ if __name__ == "__main__":
     print("JSON 저장 완료: cutline_meta.json")
 
     # 시각적 확인 (저장은 아님)
+    import cv2
     import matplotlib.pyplot as plt
     plt.imshow(cv2.cvtColor(img, cv2.COLOR_BGR2RGB))
     plt.title("Generated Cutline (Preview Only)")
@@ -0,0 +1,356 @@
+# app/utils/trajectory.py
+"""
+Phase A / Phase B 공통 궤적(points) 파서
+- FE 배열 형식: [x, y, t, eventType]
+- FE 객체 형식: {"x": x, "y": y, "t": t, "eventType": eventType}
+- FE 컬럼 형식: {"xs": [...], "ys": [...], "ts": [...], "events": [...]} 또는 {"packed": base64, "t0": ...}
+- 모든 형식 모두 NumPy 컬럼(xs, ys, ts, events)으로 변환 후 마스크 연산으로 0~1 범위 필터링
+- AI 서버 전송 payload는 컬럼에서 한 번에 생성
+"""
+
+import base64
+import binascii
+import heapq
+from itertools import chain
+from operator import itemgetter
+from typing import Dict, Any, List, Optional
+
+import numpy as np
+
+from app.schemas.captcha_submit import ColumnarPoints
+
+_ARRAY_XYT = itemgetter(0, 1, 2)
+_OBJECT_XYT = itemgetter("x", "y", "t")
+_ARRAY_EVENT = itemgetter(3)
+_OBJECT_EVENT = itemgetter("eventType")
+
+
+class Trajectory:
+    """
+    정규화 좌표(0~1) 궤적의 컬럼 표현
+    - xs, ys, ts: float64 배열
+    - events: object 배열 (eventType 원본 값)
+    """
+
+    __slots__ = ("xs", "ys", "ts", "events")
+
+    def __init__(self, xs: np.ndarray, ys: np.ndarray, ts: np.ndarray, events: np.ndarray):
+        self.xs = xs
+        self.ys = ys
+        self.ts = ts
+        self.events = events
+
+    @classmethod
+    def empty(cls) -> "Trajectory":
+        return cls(
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=np.float64),
+            np.empty(0, dtype=object),
+        )
+
+    def __len__(self) -> int:
+        return len(self.xs)
+
+    def select(self, keep: np.ndarray) -> "Trajectory":
+        """불리언 마스크 또는 인덱스 배열로 부분 궤적 생성"""
+        return Trajectory(self.xs[keep], self.ys[keep], self.ts[keep], self.events[keep])
+
+    def to_points(self) -> List[Dict[str, Any]]:
+        """AI 서버 JSON 전송용 [{"x", "y", "t", "eventType"}, ...]"""
+        return [
+            {"x": x, "y": y, "t": t, "eventType": e}
+            for x, y, t, e in zip(
+                self.xs.tolist(), self.ys.tolist(), self.ts.tolist(), self.events.tolist()
+            )
+        ]
+
+
+def _object_array(values: List[Any]) -> np.ndarray:
+    # np.array(values)는 값이 리스트일 때 다차원으로 펼쳐지므로 1차원 object 배열로 고정
+    arr = np.empty(len(values), dtype=object)
+    arr[:] = values
+    return arr
+
+
+def _read_xyt(points: List[Any], getter: itemgetter, n: int) -> np.ndarray:
+    # (x, y, t) 튜플을 평탄화해 fromiter로 한 번에 float64 배열 생성 → (n, 3)
+    flat = chain.from_iterable(map(getter, points))
+    return np.fromiter(flat, dtype=np.float64, count=3 * n).reshape(n, 3)
+
+
+def _parse_fast(points: List[Any], default_event: str) -> Optional[Trajectory]:
+    """
+    모든 포인트가 같은 형식이고 값이 온전할 때의 벡터화 경로.
+    하나라도 예외 케이스가 섞여 있으면 None → 포인트 단위 경로로 처리.
+    """
+    n = len(points)
+    types = set(map(type, points))  # 타입 검사도 C 레벨 map으로 처리
+
+    try:
+        if types <= {list, tuple}:
+            min_len = min(map(len, points))
+            if min_len < 3:
+                return None
+            xyt = _read_xyt(points, _ARRAY_XYT, n)
+            if min_len > 3:
+                events = list(map(_ARRAY_EVENT, points))
+            else:
+                events = [p[3] if len(p) > 3 else default_event for p in points]
+
+        elif types == {dict}:
+            xyt = _read_xyt(points, _OBJECT_XYT, n)
+            try:
+                events = list(map(_OBJECT_EVENT, points))
+            except KeyError:
+                events = [
+                    p["eventType"] if "eventType" in p else p.get("event_type", default_event)
+                    for p in points
+                ]
+
+        else:
+            return None
+
+    except (ValueError, TypeError, KeyError):
+        return None
+
+    # NaN 포함 시 포인트 단위 경로에서 기존과 동일하게 걸러냄
+    if np.isnan(xyt).any():
+        return None
+
+    xs, ys, ts = np.ascontiguousarray(xyt.T)
+    return Trajectory(xs, ys, ts, _object_array(events))
+
+
+def _parse_slow(points: List[Any], default_event: str) -> Trajectory:
+    """형식이 섞여 있거나 잘못된 포인트가 있을 때: 해당 포인트만 건너뜀"""
+    xs, ys, ts, events = [], [], [], []
+
+    for p in points:
+        try:
+            # 배열 형식: [x, y, t, eventType]
+            if isinstance(p, (list, tuple)):
+                if len(p) < 3:  # 최소 x, y, t 필요
+                    continue
+                x, y, t = float(p[0]), float(p[1]), float(p[2])
+                event_type = p[3] if len(p) > 3 else default_event
+
+            # 객체 형식: {"x": x, "y": y, "t": t, "eventType": eventType}
+            elif isinstance(p, dict):
+                if not all(k in p for k in ("x", "y", "t")):
+                    continue
+                x, y, t = float(p["x"]), float(p["y"]), float(p["t"])
+                event_type = p.get("eventType", p.get("event_type", default_event))
+            else:
+                continue
+        except (ValueError, TypeError, IndexError):
+            continue
+
+        xs.append(x)
+        ys.append(y)
+        ts.append(t)
+        events.append(event_type)
+
+    return Trajectory(
+        np.array(xs, dtype=np.float64),
+        np.array(ys, dtype=np.float64),
+        np.array(ts, dtype=np.float64),
+        _object_array(events),
+    )
+
+
+def _parse_columnar(columns: Dict[str, Any], default_event: str) -> Trajectory:
+    """
+    컬럼 형식 → 궤적. 포인트 단위 파이썬 객체 없이 배열로 바로 변환한다.
+    컬럼 길이가 맞지 않거나 1차원이 아니거나 디코딩에 실패하면 빈 궤적 (유효 포인트 부족으로 처리됨)
+    """
+    try:
+        packed = columns.get("packed")
+        if packed:
+            raw = base64.b64decode(packed, validate=True)
+            if len(raw) % 12:
+                return Trajectory.empty()
+            n = len(raw) // 12
+            xs, ys, ts = np.frombuffer(raw, dtype="<f4").astype(np.float64).reshape(3, n)
+            ts = ts + float(columns.get("t0") or 0.0)
+        else:
+            xs = np.asarray(columns.get("xs") or [], dtype=np.float64)
+            ys = np.asarray(columns.get("ys") or [], dtype=np.float64)
+            ts = np.asarray(columns.get("ts") or [], dtype=np.float64)
+            # 중첩 리스트 컬럼([[..], [..]])은 (n, k) 배열이 되어 규칙 / 축소 / fingerprint가 깨지므로 거부
+            if not xs.ndim == ys.ndim == ts.ndim == 1:
+                return Trajectory.empty()
+            n = len(xs)
+            if len(ys) != n or len(ts) != n:
+                return Trajectory.empty()
+    except (ValueError, TypeError, binascii.Error):
+        return Trajectory.empty()
+
+    events = columns.get("events")
+    if events is not None:
+        if not isinstance(events, (list, tuple)) or any(isinstance(e, (list, tuple, dict)) for e in events):
+            return Trajectory.empty()
+    if events is not None and len(events) == n:
+        events = _object_array(events)
+    else:
+        events = np.full(n, default_event, dtype=object)
+
+    # 배열/객체 형식과 동일하게 t가 NaN인 포인트는 제외 (x, y NaN은 범위 필터에서 제외됨)
+    trajectory = Trajectory(xs, ys, ts, events)
+    valid_t = ~np.isnan(ts)
+    return trajectory if valid_t.all() else trajectory.select(valid_t)
+
+
+def _columns(points: ColumnarPoints) -> Dict[str, Any]:
+    # 필드 값(리스트)을 복사 없이 그대로 넘김
+    return {
+        "xs": points.xs,
+        "ys": points.ys,
+        "ts": points.ts,
+        "events": points.events,
+        "packed": points.packed,
+        "t0": points.t0,
+    }
+
+
+def parse_points(points: Any, default_event: str = "move") -> Trajectory:
+    """
+    FE points를 컬럼 궤적으로 변환하고 0~1 범위를 벗어난 포인트를 제거한다.
+    - 좌표는 0~1 정규화 상태 그대로 유지 (픽셀 변환 없음)
+    - default_event: eventType이 없을 때 기본값 (Phase A "move", Phase B "click")
+    """
+    if isinstance(points, ColumnarPoints):
+        points = _columns(points)
+
+    if isinstance(points, dict):
+        trajectory = _parse_columnar(points, default_event)
+
+    elif not isinstance(points, list) or not points:
+        return Trajectory.empty()
+
+    else:
+        trajectory = _parse_fast(points, default_event)
+        if trajectory is None:
+            trajectory = _parse_slow(points, default_event)
+
+    xs, ys = trajectory.xs, trajectory.ys
+    in_range = (xs >= 0) & (xs <= 1) & (ys >= 0) & (ys <= 1)  # NaN은 자동 제외
+
+    if in_range.all():
+        return trajectory
+    return trajectory.select(in_range)
+
+
+def raw_point_count(points: Any) -> int:
+    """
+    파싱 전 원본 points의 포인트 수 (요청 크기 상한 검사용, 배열 변환 없이 O(1))
+    """
+    if isinstance(points, ColumnarPoints):
+        points = _columns(points)
+
+    if isinstance(points, list):
+        return len(points)
+
+    if isinstance(points, dict):
+        packed = points.get("packed")
+        if isinstance(packed, str):
+            return len(packed) * 3 // 4 // 12
+        xs = points.get("xs")
+        return len(xs) if isinstance(xs, list) else 0
+
+    return 0
+
+
+# ==========================================================
+# 궤적 축소 (AI 서버 전송 전)
+# ==========================================================
+def _keep_indices(trajectory: Trajectory) -> np.ndarray:
+    """처음/끝 포인트와 eventType이 바뀌는 지점(down/up 등)은 항상 유지"""
+    events = trajectory.events
+    changed = np.flatnonzero(events[1:] != events[:-1]) + 1
+    return np.union1d([0, len(trajectory) - 1], changed)
+
+
+def _time_bucket_indices(trajectory: Trajectory, max_points: int) -> np.ndarray:
+    """
+    전체 시간 구간을 균등 분할하고 구간마다 첫 실제 샘플만 유지.
+    원본 타임스탬프를 그대로 쓰므로 속도/가속도 등 운동학적 특징이 보존된다.
+    """
+    n = len(trajectory)
+    keep = _keep_indices(trajectory)
+    budget = max(max_points - len(keep), 1)
+
+    ts = trajectory.ts
+    span = ts[-1] - ts[0]
+
+    if span > 0 and np.all(np.diff(ts) >= 0):
+        buckets = np.minimum(((ts - ts[0]) / span * budget).astype(np.int64), budget - 1)
+        _, sampled = np.unique(buckets, return_index=True)
+    else:
+        # 타임스탬프가 단조 증가하지 않으면 인덱스 기준 균등 샘플링
+        sampled = np.unique(np.linspace(0, n - 1, budget).round().astype(np.int64))
+
+    return np.union1d(keep, sampled)
+
+
+def _rdp_indices(trajectory: Trajectory, max_points: int) -> np.ndarray:
+    """
+    Ramer–Douglas–Peucker (포인트 수 상한 버전):
+    직선에서 가장 많이 벗어난 구간부터 분할하여 max_points개가 될 때까지 모양을 유지한다.
+    """
+    xs, ys = trajectory.xs, trajectory.ys
+    n = len(trajectory)
+
+    def farthest(start: int, end: int):
+        if end - start < 2:
+            return None
+        dx, dy = xs[end] - xs[start], ys[end] - ys[start]
+        px, py = xs[start + 1:end] - xs[start], ys[start + 1:end] - ys[start]
+        norm = np.hypot(dx, dy)
+        if norm > 0:
+            dist = np.abs(dx * py - dy * px) / norm
+        else:
+            dist = np.hypot(px, py)
+        i = int(np.argmax(dist))
+        return (-float(dist[i]), start, end, start + 1 + i)
+
+    kept = set(_keep_indices(trajectory).tolist())
+    heap = []
+    ordered = sorted(kept)
+    for start, end in zip(ordered, ordered[1:]):
+        item = farthest(start, end)
+        if item is not None:
+            heap.append(item)
+    heapq.heapify(heap)
+
+    while heap and len(kept) < max_points:
+        _, start, end, split = heapq.heappop(heap)
+        kept.add(split)
+        for segment in ((start, split), (split, end)):
+            item = farthest(*segment)
+            if item is not None:
+                heapq.heappush(heap, item)
+
+    return np.fromiter(sorted(kept), dtype=np.int64, count=len(kept))
+
+
+def downsample(trajectory: Trajectory, max_points: int, method: str = "time_bucket") -> Trajectory:
+    """
+    궤적을 최대 max_points개 내외로 축소한다. (이벤트 전환 지점은 항상 유지)
+    - time_bucket: 시간 구간별 샘플 (기본, 운동학 특징 보존)
+    - rdp: 경로 모양 기준 축소
+    - none: 축소하지 않음
+    """
+    if method == "none" or max_points <= 0 or len(trajectory) <= max_points:
+        return trajectory
+
+    if method == "rdp":
+        indices = _rdp_indices(trajectory, max_points)
+    else:
+        indices = _time_bucket_indices(trajectory, max_points)
+
+    # 이벤트 전환 지점이 상한보다 많은 비정상 입력도 max_points를 넘지 않도록 보장
+    if len(indices) > max_points:
+        indices = indices[np.linspace(0, len(indices) - 1, max_points).round().astype(np.int64)]
+
+    return trajectory.select(indices)
@@ -0,0 +1,148 @@
+# benchmarks/bench_cold_start.py
+"""
+워커 cold start 벤치마크 (새 프로세스 기준, 실행마다 새로 띄움)
+- import: `import app.main` 소요 시간 + 그 시점에 로드된 무거운 모듈 (cv2 / PIL / numpy)
+- uvicorn 1 worker를 띄워 프로세스 시작 → 첫 /health 응답, → /ready 200 (warmup 완료)까지 시간
+- 첫 요청 비용: 새 워커의 첫 /session/init, /captcha/request 지연과 두 번째 요청 지연 비교
+  (--no-warmup이면 WARMUP_ENABLED=0 → warmup 없이 첫 요청이 cold 비용을 떠안는 경우)
+- AI 서버는 benchmarks.stub_ai_server (같은 프로세스)
+
+실행:
+    python -m benchmarks.bench_cold_start --runs 5
+    python -m benchmarks.bench_cold_start --runs 5 --no-warmup --json cold.json
+"""
+
+import argparse
+import json
+import os
+import socket
+import statistics
+import subprocess
+import sys
+from time import perf_counter, sleep
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.stub_ai_server import StubConfig, start_stub_server
+
+HEAVY_MODULES = ("cv2", "PIL.Image", "numpy")
+
+IMPORT_PROBE = (
+    "import sys, json\n"
+    "from time import perf_counter\n"
+    "t = perf_counter()\n"
+    "import app.main\n"
+    "elapsed = perf_counter() - t\n"
+    f"print(json.dumps({{'import_ms': elapsed * 1000, 'loaded': [m for m in {HEAVY_MODULES!r} if m in sys.modules]}}))\n"
+)
+
+
+def measure_import() -> Dict[str, Any]:
+    output = subprocess.run(
+        [sys.executable, "-c", IMPORT_PROBE],
+        capture_output=True, text=True, check=True, env={**os.environ, "LOG_LEVEL": "error"},
+    ).stdout
+    return json.loads(output.strip().splitlines()[-1])
+
+
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def _wait_for(client: httpx.Client, path: str, started: float, timeout: float = 60.0) -> float:
+    """path가 200을 돌려줄 때까지 5ms 간격으로 확인 → 프로세스 시작 후 경과 ms"""
+    while perf_counter() - started < timeout:
+        try:
+            if client.get(path, timeout=1).status_code == 200:
+                return (perf_counter() - started) * 1000
+        except httpx.HTTPError:
+            pass
+        sleep(0.005)
+    raise RuntimeError(f"{path}가 {timeout}초 안에 200을 반환하지 않았습니다.")
+
+
+def _timed_post(client: httpx.Client, path: str, headers: Dict[str, str]) -> Tuple[float, Dict[str, Any]]:
+    t = perf_counter()
+    response = client.post(path, headers=headers)
+    return (perf_counter() - t) * 1000, response.json()
+
+
+def measure_worker(ai_url: str, warmup: bool) -> Dict[str, float]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "AI_SERVER_URLS": ai_url,
+        "RATE_LIMIT_ENABLED": "0",
+        "LOG_LEVEL": "error",
+        "WARMUP_ENABLED": "1" if warmup else "0",
+    }
+    started = perf_counter()
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    try:
+        with httpx.Client(base_url=f"http://127.0.0.1:{port}") as client:
+            result = {
+                "first_health_ms": _wait_for(client, "/health", started),
+                "ready_ms": _wait_for(client, "/ready", started),
+            }
+            headers = {"X-Client-Id": "cust_alpha"}
+            for label in ("first", "second"):
+                init_ms, data = _timed_post(client, "/api/v1/session/init", headers)
+                session_headers = {"X-Session-Id": data["data"]["session_id"]}
+                request_ms, _ = _timed_post(client, "/api/v1/captcha/request", session_headers)
+                result[f"{label}_init_ms"] = init_ms
+                result[f"{label}_request_ms"] = request_ms
+            return result
+    finally:
+        process.terminate()
+        process.wait(timeout=10)
+
+
+def _median(runs: List[Dict[str, float]], key: str) -> float:
+    return round(statistics.median(run[key] for run in runs), 2)
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--runs", type=int, default=5, help="새 프로세스 실행 횟수 (중앙값 출력)")
+    parser.add_argument("--no-warmup", action="store_true", help="WARMUP_ENABLED=0으로 실행")
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    args = parser.parse_args(argv)
+
+    stub_server, ai_url = start_stub_server(0, StubConfig(verify_latency="fixed:5", generate_latency="fixed:5"))
+    try:
+        imports = [measure_import() for _ in range(args.runs)]
+        workers = [measure_worker(ai_url, warmup=not args.no_warmup) for _ in range(args.runs)]
+    finally:
+        stub_server.shutdown()
+
+    report = {
+        "runs": args.runs,
+        "warmup": not args.no_warmup,
+        "import_ms": round(statistics.median(r["import_ms"] for r in imports), 2),
+        "heavy_modules_at_import": imports[0]["loaded"],
+        **{key: _median(workers, key) for key in workers[0]},
+    }
+
+    print(f"import app.main          {report['import_ms']:>9.1f}ms  (loaded: {report['heavy_modules_at_import'] or '-'})")
+    print(f"spawn → first /health    {report['first_health_ms']:>9.1f}ms")
+    print(f"spawn → /ready           {report['ready_ms']:>9.1f}ms  (warmup={'on' if report['warmup'] else 'off'})")
+    print(f"{'':<24} {'first':>11} {'second':>11}")
+    for phase in ("init", "request"):
+        print(f"/{phase:<23} {report[f'first_{phase}_ms']:>9.1f}ms {report[f'second_{phase}_ms']:>9.1f}ms")
+    print(f"(median of {args.runs} runs)")
+
+    if args.json:
+        with open(args.json, "w", encoding="utf-8") as f:
+            json.dump(report, f, indent=2, ensure_ascii=False)
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
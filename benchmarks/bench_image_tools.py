@@ -0,0 +1,110 @@
+# benchmarks/bench_image_tools.py
+"""
+이미지 / 문제 생성 경로 마이크로 벤치마크 (benchmarks.harness 사용)
+- Phase A: bezier_curve, generate_cutline, generate_phase_a_problem, to_base64
+- Phase B: apply_watermark_and_noise, generate_phase_b_payload (AI 서버 응답 대신 고정 fixture 이미지 9장)
+- 포인트 정규화: filter_and_normalize_points (Phase A), filter_and_normalize_points_phase_b
+- 입력은 모두 고정 seed로 생성 (실행마다 동일)
+
+실행 (저장소 루트에서):
+    python -m benchmarks.bench_image_tools
+    python -m benchmarks.bench_image_tools --save-baseline
+"""
+
+import base64
+import io
+
+import numpy as np
+from PIL import Image
+
+from app.services.ai_phase_a_client import filter_and_normalize_points
+from app.services.ai_phase_b_client import filter_and_normalize_points_phase_b
+from app.services.phase_b_service import generate_phase_b_payload
+from app.utils.image_tools import (
+    apply_watermark_and_noise,
+    bezier_curve,
+    generate_cutline,
+    generate_phase_a_problem,
+    to_base64,
+)
+from benchmarks.bench_wire_format import make_drag
+from benchmarks.harness import main
+
+TICKET_IMAGE = "app/static/tcurity_ticket.png"
+FIXTURE_SIZE = 256       # Phase B 그리드 이미지 한 변 (px)
+FIXTURE_SEED = 7
+
+
+def fixture_image(index: int) -> Image.Image:
+    """Phase B 그리드용 고정 이미지 (seed별 그라디언트 + 노이즈, PNG 압축률이 실제 사진과 비슷하도록)"""
+    rng = np.random.default_rng(FIXTURE_SEED + index)
+    y, x = np.mgrid[0:FIXTURE_SIZE, 0:FIXTURE_SIZE]
+    base = np.stack([(x + index * 20) % 256, (y + index * 40) % 256, (x + y) // 2 % 256], axis=-1)
+    noise = rng.integers(0, 48, size=base.shape)
+    return Image.fromarray(np.clip(base + noise, 0, 255).astype(np.uint8), "RGB")
+
+
+def fixture_problem() -> dict:
+    """AI 서버 /phase-b/generate 응답 형태의 고정 fixture"""
+    images = []
+    for i in range(9):
+        buffer = io.BytesIO()
+        fixture_image(i).save(buffer, format="PNG")
+        images.append({
+            "image_id": f"img-{i}",
+            "image_base64": base64.b64encode(buffer.getvalue()).decode("ascii"),
+        })
+    return {
+        "question": "고양이 이미지를 모두 고르시오",
+        "images": images,
+        "answer_uuids": ["img-1", "img-4", "img-7"],
+    }
+
+
+def make_clicks(n: int = 6):
+    drag = make_drag(max(n, 2), seed=FIXTURE_SEED)
+    return [[p["x"], p["y"], p["t"], "click"] for p in drag[:n]]
+
+
+# -----------------------
+# 케이스별 준비 함수 (seed 고정 직후 1회 실행)
+# -----------------------
+def setup_bezier():
+    return (np.array([600, 80]), np.array([601, 280]), np.array([599, 520]), np.array([600, 720]))
+
+
+def setup_ticket_canvas():
+    canvas, _ = generate_cutline(TICKET_IMAGE)
+    return (canvas,)
+
+
+def setup_fixture_image():
+    return (fixture_image(0), 5, 0)
+
+
+def setup_phase_b_payload():
+    return (0, fixture_problem(), list(range(1, 10)))
+
+
+def setup_drag_2000():
+    return ([[p["x"], p["y"], p["t"], p["eventType"]] for p in make_drag(2000)],)
+
+
+def setup_clicks():
+    return (make_clicks(),)
+
+
+CASES = [
+    ("bezier_curve", bezier_curve, setup_bezier),
+    ("generate_cutline", lambda: generate_cutline(TICKET_IMAGE), None),
+    ("generate_phase_a_problem", generate_phase_a_problem, None),
+    ("to_base64[ticket]", to_base64, setup_ticket_canvas),
+    ("apply_watermark_and_noise", apply_watermark_and_noise, setup_fixture_image),
+    ("generate_phase_b_payload[9 images]", generate_phase_b_payload, setup_phase_b_payload),
+    ("normalize_phase_a[2000 pts]", filter_and_normalize_points, setup_drag_2000),
+    ("normalize_phase_b[6 clicks]", filter_and_normalize_points_phase_b, setup_clicks),
+]
+
+
+if __name__ == "__main__":
+    main("image_tools", CASES)
@@ -0,0 +1,45 @@
+# benchmarks/bench_prescreen.py
+"""
+Phase A 로컬 사전검사 벤치마크 (사용자 포인트 수별 prescreen_phase_a 소요 시간)
+
+실행:
+    python -m benchmarks.bench_prescreen
+"""
+
+import random
+import timeit
+
+import numpy as np
+
+from app.services.phase_a_prescreen import prescreen_phase_a
+from app.utils.image_tools import bezier_curve
+from app.utils.trajectory import parse_points
+
+IMAGE_SIZE = [1920, 1080]
+
+
+def make_target_path():
+    curve = bezier_curve(
+        np.array([800, 108]), np.array([801, 364]), np.array([799, 705]), np.array([800, 961])
+    )
+    return [{"x": int(x), "y": int(y), "t": i * 10} for i, (x, y) in enumerate(curve.tolist())]
+
+
+def make_user_points(n: int, dx: float = 0.0, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        [800 / 1920 + dx + rng.gauss(0, 0.003), 0.1 + 0.79 * i / (n - 1), i * 12.0, "move"]
+        for i in range(n)
+    ]
+
+
+if __name__ == "__main__":
+    target_path = make_target_path()
+    for n in (100, 512, 1024, 4000):
+        for label, dx in (("on-path", 0.0), ("miss", 0.2)):
+            trajectory = parse_points(make_user_points(n, dx))
+            result = prescreen_phase_a(trajectory, target_path, IMAGE_SIZE)
+            elapsed = timeit.timeit(
+                lambda: prescreen_phase_a(trajectory, target_path, IMAGE_SIZE), number=200
+            ) / 200
+            print(f"{n:>5} pts {label:<8} | {elapsed * 1e6:8.1f}us | {result}")
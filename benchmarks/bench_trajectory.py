@@ -0,0 +1,80 @@
+# benchmarks/bench_trajectory.py
+"""
+궤적 정규화 벤치마크 (기존 포인트 단위 루프 vs NumPy 컬럼 파서)
+- 컬럼 / packed 제출 형식은 포인트 단위 객체 없이 디코딩되는 비용을 함께 측정
+
+실행:
+    python -m benchmarks.bench_trajectory
+"""
+
+import base64
+import timeit
+
+import numpy as np
+
+from app.utils.trajectory import parse_points
+from benchmarks.bench_wire_format import make_drag
+
+
+def legacy_filter_and_normalize_points(points, default_event="move"):
+    """기존 filter_and_normalize_points 구현 (비교 기준)"""
+    if not isinstance(points, list) or not points:
+        return []
+
+    filtered = []
+    for p in points:
+        try:
+            if isinstance(p, (list, tuple)):
+                if len(p) < 3:
+                    continue
+                x_norm, y_norm, t = float(p[0]), float(p[1]), float(p[2])
+                event_type = p[3] if len(p) > 3 else default_event
+            elif isinstance(p, dict):
+                if not all(k in p for k in ("x", "y", "t")):
+                    continue
+                x_norm, y_norm, t = float(p["x"]), float(p["y"]), float(p["t"])
+                event_type = p.get("eventType", p.get("event_type", default_event))
+            else:
+                continue
+
+            if not (0 <= x_norm <= 1 and 0 <= y_norm <= 1):
+                continue
+
+            filtered.append({"x": x_norm, "y": y_norm, "t": t, "eventType": event_type})
+        except (ValueError, TypeError, IndexError):
+            continue
+
+    return filtered
+
+
+def bench_columnar(label, columns, n, repeat=100):
+    columnar = timeit.timeit(lambda: parse_points(columns), number=repeat) / repeat
+    print(f"{label:<14} {n:>6} pts | parse {columnar * 1e6:9.1f}us")
+
+
+def bench(label, points, repeat=100):
+    legacy = timeit.timeit(lambda: legacy_filter_and_normalize_points(points), number=repeat) / repeat
+    columns = timeit.timeit(lambda: parse_points(points), number=repeat) / repeat
+    payload = timeit.timeit(lambda: parse_points(points).to_points(), number=repeat) / repeat
+
+    print(
+        f"{label:<14} {len(points):>6} pts | legacy {legacy * 1e6:9.1f}us | "
+        f"parse {columns * 1e6:9.1f}us (x{legacy / columns:.1f}) | "
+        f"parse+payload {payload * 1e6:9.1f}us"
+    )
+
+
+if __name__ == "__main__":
+    for n in (500, 2000, 10000):
+        objects = make_drag(n)
+        arrays = [[p["x"], p["y"], p["t"], p["eventType"]] for p in objects]
+        bench("object format", objects)
+        bench("array format", arrays)
+
+        xs = [p["x"] for p in objects]
+        ys = [p["y"] for p in objects]
+        ts = [p["t"] - objects[0]["t"] for p in objects]
+        events = [p["eventType"] for p in objects]
+        packed = base64.b64encode(np.array(xs + ys + ts, dtype="<f4").tobytes()).decode()
+        bench_columnar("columnar", {"xs": xs, "ys": ys, "ts": ts, "events": events}, n)
+        bench_columnar("packed", {"packed": packed, "t0": objects[0]["t"]}, n)
@@ -0,0 +1,66 @@
+# benchmarks/bench_verify_batch.py
+"""
+서버 간 검증 항목당 비용 벤치마크 (/verify 단건 N회 vs /verify/batch 1회)
+- session_id 방식 / 완료 토큰 방식 각각 측정 (HTTP 왕복은 TestClient 기준)
+
+실행:
+    python -m benchmarks.bench_verify_batch
+"""
+
+from time import perf_counter
+
+from fastapi.testclient import TestClient
+
+from app.main import app
+from app.core.completion_token import issue_completion_token
+from app.core.session_store import SESSION_STORE, create_session
+from app.core.state_machine import SessionStatus
+
+
+def make_completed_sessions(n: int):
+    session_ids = []
+    for _ in range(n):
+        session_id = create_session("cust_alpha")["session_id"]
+        SESSION_STORE[session_id]["status"] = SessionStatus.COMPLETED.value
+        session_ids.append(session_id)
+    return session_ids
+
+
+def per_item_us(elapsed: float, n: int) -> float:
+    return elapsed / n * 1e6
+
+
+if __name__ == "__main__":
+    client = TestClient(app)
+
+    for n in (10, 100, 500):
+        session_ids = make_completed_sessions(n)
+
+        started = perf_counter()
+        for session_id in session_ids:
+            client.post("/api/v1/captcha/verify", json={"session_id": session_id})
+        single_sessions = perf_counter() - started
+
+        started = perf_counter()
+        response = client.post("/api/v1/captcha/verify/batch", json={"session_ids": session_ids})
+        batch_sessions = perf_counter() - started
+        assert all(item["success"] for item in response.json()["data"]["sessions"])
+
+        tokens = [issue_completion_token(sid, "cust_alpha") for sid in session_ids]
+        started = perf_counter()
+        for token in tokens:
+            client.post("/api/v1/captcha/verify", json={"token": token})
+        single_tokens = perf_counter() - started
+
+        tokens = [issue_completion_token(sid, "cust_alpha") for sid in session_ids]
+        started = perf_counter()
+        response = client.post("/api/v1/captcha/verify/batch", json={"tokens": tokens})
+        batch_tokens = perf_counter() - started
+        assert all(item["success"] for item in response.json()["data"]["tokens"])
+
+        print(
+            f"{n:>4} items | session_id single {per_item_us(single_sessions, n):8.1f}us"
+            f" batch {per_item_us(batch_sessions, n):7.1f}us"
+            f" | token single {per_item_us(single_tokens, n):8.1f}us"
+            f" batch {per_item_us(batch_tokens, n):7.1f}us  (per item)"
+        )
@@ -0,0 +1,60 @@
+# benchmarks/bench_wire_format.py
+"""
+AI 서버 전송 포맷 벤치마크 (JSON vs packed)
+- 500~2000 포인트의 현실적인 드래그 궤적으로 직렬화 시간 / payload 크기 비교
+
+실행:
+    python -m benchmarks.bench_wire_format
+"""
+
+import json
+import math
+import random
+import timeit
+
+from app.services.trajectory_codec import encode_packed, decode_packed
+from app.utils.trajectory import parse_points
+
+METADATA = {"deviceType": "desktop", "screenWidth": 1920, "screenHeight": 1080}
+
+
+def make_drag(n: int, seed: int = 42):
+    """세로 절취선을 따라가는 드래그 (약간의 흔들림 + 8~16ms 샘플 간격)"""
+    rng = random.Random(seed)
+    t = 1_734_000_000_000.0  # epoch ms
+    points = []
+    for i in range(n):
+        progress = i / (n - 1)
+        x = 0.42 + 0.01 * math.sin(progress * 6.0) + rng.gauss(0, 0.002)
+        y = 0.10 + 0.79 * progress + rng.gauss(0, 0.001)
+        event_type = "down" if i == 0 else ("up" if i == n - 1 else "move")
+        points.append({"x": x, "y": y, "t": t, "eventType": event_type})
+        t += rng.uniform(8, 16)
+    return points
+
+
+def bench(n: int, repeat: int = 200):
+    trajectory = parse_points(make_drag(n))
+
+    def encode_json():
+        return json.dumps({"points": trajectory.to_points(), "metadata": METADATA}).encode("utf-8")
+
+    json_body = encode_json()
+    packed_body = encode_packed(trajectory, METADATA)
+
+    json_enc = timeit.timeit(encode_json, number=repeat) / repeat
+    packed_enc = timeit.timeit(lambda: encode_packed(trajectory, METADATA), number=repeat) / repeat
+    json_dec = timeit.timeit(lambda: json.loads(json_body), number=repeat) / repeat
+    packed_dec = timeit.timeit(lambda: decode_packed(packed_body), number=repeat) / repeat
+
+    print(
+        f"{n:>5} pts | "
+        f"json {len(json_body):>7} B enc {json_enc * 1e6:8.1f}us dec {json_dec * 1e6:8.1f}us | "
+        f"packed {len(packed_body):>6} B enc {packed_enc * 1e6:8.1f}us dec {packed_dec * 1e6:8.1f}us | "
+        f"size x{len(json_body) / len(packed_body):.1f}"
+    )
+
+
+if __name__ == "__main__":
+    for n in (500, 1000, 2000):
+        bench(n)
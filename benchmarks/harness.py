@@ -0,0 +1,227 @@
+# benchmarks/harness.py
+"""
+마이크로 벤치마크 공통 실행기
+- 케이스별 ops/s, p50 / p99 (1회 호출 소요 시간), 1회 호출당 메모리 할당량(tracemalloc peak)
+- 시간 측정과 메모리 측정은 별도 패스 (tracemalloc 오버헤드가 시간에 섞이지 않도록)
+- 케이스마다 고정 seed로 random / numpy 상태를 초기화해 입력이 실행마다 동일
+- baseline 저장 / 비교: 회귀가 "느낌"이 아니라 수치 비교로 드러나도록
+  (baseline은 측정한 머신에서만 의미가 있으므로 실행 환경 정보를 함께 저장)
+
+사용:
+    python -m benchmarks.bench_image_tools                      # 실행 + baseline 있으면 비교
+    python -m benchmarks.bench_image_tools --save-baseline      # 현재 결과를 baseline으로 저장
+    python -m benchmarks.bench_image_tools --filter watermark --fail-on-regression
+"""
+
+import argparse
+import json
+import os
+import platform
+import random
+import sys
+import tracemalloc
+from time import perf_counter
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+import numpy as np
+
+BASELINE_DIR = os.path.join(os.path.dirname(__file__), "baselines")
+DEFAULT_SEED = 1234
+
+# 케이스: (이름, 측정할 함수, 준비 함수 또는 None)
+# 준비 함수는 seed 고정 직후 1회 호출되며, 측정 함수에 넘길 인자를 반환
+Case = Tuple[str, Callable[..., Any], Optional[Callable[[], Tuple]]]
+
+
+def _seed(seed: int):
+    random.seed(seed)
+    np.random.seed(seed)
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    index = min(len(sorted_values) - 1, max(0, int(round(q * (len(sorted_values) - 1)))))
+    return sorted_values[index]
+
+
+def measure(
+    fn: Callable[..., Any],
+    args: Tuple = (),
+    min_time: float = 1.0,
+    max_ops: int = 5000,
+    warmup: int = 3,
+    alloc_ops: int = 5,
+) -> Dict[str, float]:
+    """fn(*args)를 min_time 이상(또는 max_ops회) 반복 호출해 통계를 반환"""
+    for _ in range(warmup):
+        fn(*args)
+
+    samples = []
+    started = perf_counter()
+    while len(samples) < max_ops and (perf_counter() - started) < min_time:
+        t0 = perf_counter()
+        fn(*args)
+        samples.append(perf_counter() - t0)
+    total = perf_counter() - started
+    samples.sort()
+
+    # 메모리: 1회 호출 중 최대 추가 할당량 (cv2 내부 버퍼처럼 Python allocator를 거치지 않는 메모리는 제외)
+    peaks = []
+    tracemalloc.start()
+    try:
+        for _ in range(alloc_ops):
+            tracemalloc.reset_peak()
+            before, _ = tracemalloc.get_traced_memory()
+            fn(*args)
+            _, peak = tracemalloc.get_traced_memory()
+            peaks.append(peak - before)
+    finally:
+        tracemalloc.stop()
+
+    return {
+        "ops": len(samples),
+        "ops_per_sec": len(samples) / total if total > 0 else 0.0,
+        "p50_us": _percentile(samples, 0.50) * 1e6,
+        "p99_us": _percentile(samples, 0.99) * 1e6,
+        "alloc_bytes": float(sorted(peaks)[len(peaks) // 2]) if peaks else 0.0,
+    }
+
+
+# -----------------------
+# baseline 저장 / 비교
+# -----------------------
+def environment() -> Dict[str, str]:
+    info = {
+        "python": platform.python_version(),
+        "platform": platform.platform(),
+        "machine": platform.machine(),
+        "processor": platform.processor() or "",
+        "cpu_count": str(os.cpu_count()),
+        "numpy": np.__version__,
+    }
+    try:
+        import cv2
+        info["opencv"] = cv2.__version__
+    except ImportError:
+        pass
+    try:
+        import PIL
+        info["pillow"] = PIL.__version__
+    except ImportError:
+        pass
+    return info
+
+
+def baseline_path(suite: str) -> str:
+    return os.path.join(BASELINE_DIR, f"{suite}.json")
+
+
+def load_baseline(path: str) -> Optional[Dict[str, Any]]:
+    if not os.path.exists(path):
+        return None
+    with open(path, "r", encoding="utf-8") as f:
+        return json.load(f)
+
+
+def save_baseline(path: str, suite: str, results: Dict[str, Dict[str, float]], seed: int):
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    with open(path, "w", encoding="utf-8") as f:
+        json.dump(
+            {"suite": suite, "seed": seed, "environment": environment(), "results": results},
+            f,
+            indent=2,
+            ensure_ascii=False,
+        )
+        f.write("\n")
+
+
+def compare(current: Dict[str, float], base: Dict[str, float], threshold: float) -> Tuple[str, List[str]]:
+    """
+    p50 / 할당량 기준 비교 → ("regression" | "improved" | "same", 설명 목록)
+    p99는 노이즈가 커서 참고용으로만 출력
+    """
+    notes, status = [], "same"
+
+    p50_ratio = current["p50_us"] / base["p50_us"] if base.get("p50_us") else 1.0
+    notes.append(f"p50 x{p50_ratio:.2f}")
+    if p50_ratio > 1 + threshold:
+        status = "regression"
+    elif p50_ratio < 1 - threshold:
+        status = "improved"
+
+    if base.get("alloc_bytes"):
+        alloc_ratio = current["alloc_bytes"] / base["alloc_bytes"]
+        notes.append(f"alloc x{alloc_ratio:.2f}")
+        if alloc_ratio > 1 + threshold:
+            status = "regression"
+    elif current["alloc_bytes"] > 0 and base.get("alloc_bytes") == 0:
+        notes.append("alloc new")
+
+    return status, notes
+
+
+# -----------------------
+# 실행
+# -----------------------
+def _parse_args(argv: Optional[List[str]]) -> argparse.Namespace:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--filter", default="", help="이름에 이 문자열이 포함된 케이스만 실행")
+    parser.add_argument("--min-time", type=float, default=1.0, help="케이스당 최소 측정 시간(초)")
+    parser.add_argument("--max-ops", type=int, default=5000)
+    parser.add_argument("--seed", type=int, default=DEFAULT_SEED)
+    parser.add_argument("--baseline", default=None, help="baseline 파일 경로 (기본: benchmarks/baselines/<suite>.json)")
+    parser.add_argument("--save-baseline", action="store_true", help="현재 결과를 baseline으로 저장")
+    parser.add_argument("--threshold", type=float, default=0.10, help="회귀 판정 비율 (0.10 = 10%%)")
+    parser.add_argument("--fail-on-regression", action="store_true", help="회귀가 있으면 종료 코드 1")
+    return parser.parse_args(argv)
+
+
+def run_suite(suite: str, cases: List[Case], argv: Optional[List[str]] = None) -> int:
+    args = _parse_args(argv)
+    path = args.baseline or baseline_path(suite)
+    baseline = None if args.save_baseline else load_baseline(path)
+    base_results = (baseline or {}).get("results", {})
+
+    if baseline is not None and baseline.get("environment", {}).get("machine") != platform.machine():
+        print(f"[warn] baseline이 다른 환경에서 측정됨: {baseline.get('environment')}")
+
+    results, regressions = {}, []
+    print(f"{'case':<36} {'ops/s':>10} {'p50':>11} {'p99':>11} {'alloc/op':>11}  vs baseline")
+
+    for name, fn, setup in cases:
+        if args.filter and args.filter not in name:
+            continue
+
+        _seed(args.seed)
+        call_args = setup() if setup is not None else ()
+        stats = measure(fn, call_args, min_time=args.min_time, max_ops=args.max_ops)
+        results[name] = {key: round(value, 3) for key, value in stats.items()}
+
+        verdict = "-"
+        if name in base_results:
+            status, notes = compare(stats, base_results[name], args.threshold)
+            verdict = f"{status} ({', '.join(notes)})"
+            if status == "regression":
+                regressions.append(name)
+
+        print(
+            f"{name:<36} {stats['ops_per_sec']:>10.1f} {stats['p50_us']:>9.1f}us "
+            f"{stats['p99_us']:>9.1f}us {stats['alloc_bytes'] / 1024:>8.1f}KiB  {verdict}"
+        )
+
+    if args.save_baseline:
+        save_baseline(path, suite, results, args.seed)
+        print(f"baseline 저장: {path}")
+    elif baseline is None:
+        print(f"baseline 없음 ({path}), --save-baseline으로 저장 후 비교 가능")
+
+    if regressions:
+        print(f"회귀 {len(regressions)}건: {', '.join(regressions)}")
+        if args.fail_on_regression:
+            return 1
+    return 0
+
+
+def main(suite: str, cases: List[Case]):
+    sys.exit(run_suite(suite, cases))
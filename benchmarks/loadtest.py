@@ -0,0 +1,364 @@
+# benchmarks/loadtest.py
+"""
+전체 플로우 부하 테스트 (실제 앱 + 로컬 AI stub 서버)
+    /session/init → /captcha/request → /captcha/submit (Phase A) → /captcha/submit (Phase B) → /captcha/verify
+- --url 미지정 시 uvicorn으로 앱을 별도 프로세스로 띄움 (AI_SERVER_URLS=stub, RATE_LIMIT_ENABLED=0)
+- --ai-url 미지정 시 benchmarks.stub_ai_server를 같은 프로세스에서 띄움 (지연 분포 / 오류율 / pass 비율 설정)
+- 단계별 처리량, 지연 p50/p90/p99, 결과(에러 코드 / HTTP 상태) 분포와 플로우 결과 분포 출력
+
+실행:
+    python -m benchmarks.loadtest --concurrency 32 --duration 30
+    python -m benchmarks.loadtest --workers 4 --verify-latency lognormal:60:0.6 --error-rate 0.02
+    python -m benchmarks.loadtest --url http://127.0.0.1:8000 --ai-url http://10.0.0.5:9100   # 이미 떠 있는 서버
+"""
+
+import argparse
+import json
+import os
+import random
+import socket
+import subprocess
+import sys
+import threading
+from collections import Counter, defaultdict
+from time import monotonic, perf_counter, sleep, time
+from typing import Any, Dict, List, Optional, Tuple
+
+import httpx
+
+from benchmarks.stub_ai_server import (
+    TARGET_PREFIX,
+    add_stub_arguments,
+    start_stub_server,
+    stub_config_from_args,
+)
+
+PHASES = ("init", "request", "submit_a", "submit_b", "verify")
+SESSION_STATE_HEADER = "X-Session-State"
+
+
+# -----------------------
+# 결과 집계
+# -----------------------
+class Recorder:
+
+    def __init__(self):
+        self._lock = threading.Lock()
+        self.latencies: Dict[str, List[float]] = defaultdict(list)
+        self.outcomes: Dict[str, Counter] = defaultdict(Counter)
+        self.flows: Counter = Counter()
+
+    def record(self, phase: str, seconds: float, outcome: str):
+        with self._lock:
+            self.latencies[phase].append(seconds)
+            self.outcomes[phase][outcome] += 1
+
+    def flow(self, outcome: str):
+        with self._lock:
+            self.flows[outcome] += 1
+
+
+def _percentile(sorted_values: List[float], q: float) -> float:
+    if not sorted_values:
+        return 0.0
+    return sorted_values[min(len(sorted_values) - 1, int(round(q * (len(sorted_values) - 1))))]
+
+
+def summarize(recorder: Recorder, elapsed: float) -> Dict[str, Any]:
+    phases = {}
+    for phase in PHASES:
+        values = sorted(recorder.latencies.get(phase, []))
+        if not values:
+            continue
+        phases[phase] = {
+            "count": len(values),
+            "rps": round(len(values) / elapsed, 2),
+            "p50_ms": round(_percentile(values, 0.50) * 1000, 2),
+            "p90_ms": round(_percentile(values, 0.90) * 1000, 2),
+            "p99_ms": round(_percentile(values, 0.99) * 1000, 2),
+            "max_ms": round(values[-1] * 1000, 2),
+            "outcomes": dict(recorder.outcomes[phase].most_common()),
+        }
+    flows = sum(recorder.flows.values())
+    return {
+        "elapsed_s": round(elapsed, 2),
+        "flows": flows,
+        "flows_per_sec": round(flows / elapsed, 2) if elapsed > 0 else 0.0,
+        "flow_outcomes": dict(recorder.flows.most_common()),
+        "phases": phases,
+    }
+
+
+def print_report(report: Dict[str, Any]):
+    print(f"\n{report['flows']} flows in {report['elapsed_s']}s ({report['flows_per_sec']} flows/s)")
+    print(f"flow outcomes: {report['flow_outcomes']}")
+    print(f"\n{'phase':<10} {'count':>7} {'rps':>8} {'p50':>9} {'p90':>9} {'p99':>9} {'max':>9}  outcomes")
+    for phase, s in report["phases"].items():
+        print(
+            f"{phase:<10} {s['count']:>7} {s['rps']:>8.1f} {s['p50_ms']:>7.1f}ms {s['p90_ms']:>7.1f}ms "
+            f"{s['p99_ms']:>7.1f}ms {s['max_ms']:>7.1f}ms  {s['outcomes']}"
+        )
+
+
+# -----------------------
+# 사용자 행동 생성
+# -----------------------
+def drag_points(problem: Dict[str, Any], rng: random.Random, n: int = 120) -> List[List[Any]]:
+    """가이드라인을 따라가는 사람 같은 드래그 (흔들림 + 8~18ms 샘플 간격)"""
+    (x0, y0), (x1, y1) = problem["guide_line"]["start"], problem["guide_line"]["end"]
+    t = time() * 1000
+    points = []
+    for i in range(n):
+        f = i / (n - 1)
+        event = "down" if i == 0 else ("up" if i == n - 1 else "move")
+        points.append([
+            x0 + (x1 - x0) * f + rng.gauss(0, 0.004),
+            y0 + (y1 - y0) * f + rng.gauss(0, 0.002),
+            t,
+            event,
+        ])
+        t += rng.uniform(8, 18)
+    return points
+
+
+def click_points(count: int, rng: random.Random) -> List[List[Any]]:
+    t = time() * 1000
+    points = []
+    for _ in range(count):
+        t += rng.uniform(350, 900)
+        points.append([rng.uniform(0.1, 0.9), rng.uniform(0.1, 0.9), t, "click"])
+    return points
+
+
+def choose_answer(problem: Dict[str, Any], rng: random.Random, wrong_ratio: float) -> List[str]:
+    ids = [cell["image_id"] for cell in problem["grid"]]
+    answer = [image_id for image_id in ids if image_id.startswith(TARGET_PREFIX)]
+    if rng.random() < wrong_ratio:
+        answer = rng.sample(ids, len(answer) or 1)
+    return answer
+
+
+# -----------------------
+# 플로우 실행
+# -----------------------
+class FlowRunner:
+
+    def __init__(self, client: httpx.Client, recorder: Recorder, args: argparse.Namespace, seed: int):
+        self.client = client
+        self.recorder = recorder
+        self.args = args
+        self.rng = random.Random(seed)
+        self.session_state: Optional[str] = None
+
+    def _call(self, phase: str, path: str, headers: Dict[str, str], body: Optional[Dict[str, Any]] = None):
+        """요청 1회 → (json 또는 None, outcome). outcome은 "ok" / ErrorCode / http_<code> / 예외 이름"""
+        if self.session_state:
+            headers = {**headers, SESSION_STATE_HEADER: self.session_state}
+
+        started = perf_counter()
+        try:
+            response = self.client.post(path, headers=headers, json=body)
+        except httpx.HTTPError as e:
+            self.recorder.record(phase, perf_counter() - started, type(e).__name__)
+            return None, type(e).__name__
+        elapsed = perf_counter() - started
+
+        self.session_state = response.headers.get(SESSION_STATE_HEADER, self.session_state)
+        try:
+            data = response.json()
+        except ValueError:
+            data = None
+
+        if response.status_code != 200:
+            code = ((data or {}).get("error") or {}).get("code") if isinstance(data, dict) else None
+            outcome = f"http_{response.status_code}" + (f"_{code}" if code else "")
+        else:
+            error = (data or {}).get("error") or {}
+            outcome = error.get("code") or "ok"
+
+        self.recorder.record(phase, elapsed, outcome)
+        return (data if response.status_code == 200 else None), outcome
+
+    def run(self) -> str:
+        """플로우 1회 → 결과 문자열 ("completed" / "<단계>:<outcome>" / "failed_phase_a|b")"""
+        self.session_state = None
+        args, rng = self.args, self.rng
+
+        # 200이어도 success=False면 data가 None (INVALID_STATE 등) → 해당 단계 outcome으로 종료
+        data, outcome = self._call("init", "/api/v1/session/init", {"X-Client-Id": args.client_id})
+        session_id = ((data or {}).get("data") or {}).get("session_id")
+        if session_id is None:
+            return f"init:{outcome}"
+        session_headers = {"X-Session-Id": session_id}
+
+        data, outcome = self._call("request", "/api/v1/captcha/request", session_headers)
+        problem = ((data or {}).get("data") or {}).get("problem")
+        if problem is None:
+            return f"request:{outcome}"
+
+        # Phase A (실패 시 새 문제로 재시도)
+        for _ in range(args.max_attempts):
+            body = {"points": drag_points(problem, rng), "metadata": {"deviceType": "desktop"}}
+            data, outcome = self._call("submit_a", "/api/v1/captcha/submit", session_headers, body)
+            problem = ((data or {}).get("data") or {}).get("problem")
+            if problem is None:
+                return f"submit_a:{outcome}"
+            if data.get("status") == "PHASE_B":
+                break
+        else:
+            return "failed_phase_a"
+
+        # Phase B
+        completion_token = None
+        for _ in range(args.max_attempts):
+            answer = choose_answer(problem, rng, args.wrong_answer_ratio)
+            body = {"user_answer": answer, "points": click_points(len(answer), rng), "metadata": {}}
+            data, outcome = self._call("submit_b", "/api/v1/captcha/submit", session_headers, body)
+            payload = (data or {}).get("data") or {}
+            if data is not None and data.get("status") == "COMPLETED":
+                completion_token = payload.get("completion_token")
+                break
+            problem = payload.get("problem")
+            if problem is None:
+                return f"submit_b:{outcome}"
+        else:
+            return "failed_phase_b"
+
+        # 고객사 서버 검증 (완료 토큰)
+        data, outcome = self._call("verify", "/api/v1/captcha/verify", {}, {"token": completion_token})
+        if data is None or not data.get("success"):
+            return f"verify:{outcome}"
+        return "completed"
+
+
+def worker(base_url: str, recorder: Recorder, args: argparse.Namespace, seed: int,
+           deadline: float, budget: Optional[List[int]], budget_lock: threading.Lock):
+    with httpx.Client(base_url=base_url, timeout=args.request_timeout) as client:
+        runner = FlowRunner(client, recorder, args, seed)
+        while monotonic() < deadline:
+            if budget is not None:
+                with budget_lock:
+                    if budget[0] <= 0:
+                        return
+                    budget[0] -= 1
+            try:
+                recorder.flow(runner.run())
+            except Exception as e:
+                # 예상 못 한 응답 형식으로 스레드가 조용히 종료되지 않도록 플로우 결과로 집계
+                recorder.flow(f"error:{type(e).__name__}")
+
+
+# -----------------------
+# 대상 앱 실행
+# -----------------------
+def _free_port() -> int:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return s.getsockname()[1]
+
+
+def spawn_app(ai_url: str, args: argparse.Namespace) -> Tuple[subprocess.Popen, str]:
+    port = _free_port()
+    env = {
+        **os.environ,
+        "AI_SERVER_URLS": ai_url,
+        "LOG_LEVEL": os.environ.get("LOG_LEVEL", "warning"),
+    }
+    if not args.keep_rate_limit:
+        env["RATE_LIMIT_ENABLED"] = "0"   # 단일 IP / client_id에서 대량 요청하므로
+
+    # 여러 worker: 모든 worker가 같은 키로 토큰 서명 / 상태 봉인 (미설정 시 worker마다 임시 키)
+    # 세션 저장소는 worker별이므로 server 모드에서는 keep-alive 연결이 같은 worker에 머무는 것에 의존,
+    # 연결과 무관하게 측정하려면 SESSION_STATE_MODE=stateless REPLAY_STORE_BACKEND=redis로 실행
+    env["WEB_CONCURRENCY"] = str(args.workers)
+    env.setdefault("COMPLETION_TOKEN_KEYS", "loadtest:loadtest-completion-key")
+    env.setdefault("SESSION_STATE_KEYS", "loadtest:loadtest-session-state-key")
+
+    process = subprocess.Popen(
+        [sys.executable, "-m", "uvicorn", "app.main:app", "--host", "127.0.0.1", "--port", str(port),
+         "--workers", str(args.workers), "--log-level", "warning", "--no-access-log"],
+        env=env,
+    )
+    base_url = f"http://127.0.0.1:{port}"
+
+    deadline = monotonic() + 60
+    while monotonic() < deadline:
+        if process.poll() is not None:
+            raise RuntimeError(f"앱 프로세스 종료 (exit {process.returncode})")
+        try:
+            # warmup 완료(/ready 200) 후 측정 시작 → 첫 요청 cold 비용이 결과에 섞이지 않도록
+            if httpx.get(f"{base_url}/ready", timeout=1).status_code == 200:
+                return process, base_url
+        except httpx.HTTPError:
+            pass
+        sleep(0.2)
+
+    process.terminate()
+    raise RuntimeError("앱이 60초 안에 시작되지 않았습니다.")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--url", default=None, help="대상 앱 주소 (미지정 시 uvicorn 프로세스 실행)")
+    parser.add_argument("--ai-url", default=None, help="AI 서버 주소 (미지정 시 내장 stub 실행)")
+    parser.add_argument("--workers", type=int, default=1, help="앱을 직접 띄울 때 uvicorn worker 수")
+    parser.add_argument("--keep-rate-limit", action="store_true", help="앱을 직접 띄울 때 rate limit 유지")
+    parser.add_argument("--concurrency", type=int, default=16, help="동시 실행 플로우 수")
+    parser.add_argument("--duration", type=float, default=30.0, help="실행 시간(초)")
+    parser.add_argument("--flows", type=int, default=None, help="총 플로우 수 (지정 시 duration보다 우선 종료 가능)")
+    parser.add_argument("--client-id", default="cust_alpha")
+    parser.add_argument("--max-attempts", type=int, default=3, help="Phase별 최대 시도 수")
+    parser.add_argument("--wrong-answer-ratio", type=float, default=0.0, help="Phase B 오답 제출 비율")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    add_stub_arguments(parser)
+    args = parser.parse_args(argv)
+
+    stub_server = app_process = None
+    ai_url = args.ai_url
+    if ai_url is None:
+        stub_server, ai_url = start_stub_server(0, stub_config_from_args(args))
+        print(f"stub AI server: {ai_url}")
+
+    base_url = args.url
+    try:
+        if base_url is None:
+            app_process, base_url = spawn_app(ai_url, args)
+            print(f"app: {base_url} (workers={args.workers})")
+
+        recorder = Recorder()
+        budget = [args.flows] if args.flows is not None else None
+        budget_lock = threading.Lock()
+        started = monotonic()
+        deadline = started + args.duration
+        threads = [
+            threading.Thread(
+                target=worker,
+                args=(base_url, recorder, args, args.seed + i, deadline, budget, budget_lock),
+                daemon=True,
+            )
+            for i in range(args.concurrency)
+        ]
+        for thread in threads:
+            thread.start()
+        for thread in threads:
+            thread.join()
+
+        report = summarize(recorder, monotonic() - started)
+        report["config"] = {k: v for k, v in vars(args).items() if k != "json"}
+        print_report(report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        return 0
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            app_process.wait(timeout=10)
+        if stub_server is not None:
+            stub_server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
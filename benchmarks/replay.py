@@ -0,0 +1,307 @@
+# benchmarks/replay.py
+"""
+기록된 실제 트래픽 재생 (TRAFFIC_CAPTURE_PATH로 기록한 파일 → 로컬 빌드 + AI stub 서버)
+- 세션(seq)별 요청 순서를 그대로 재생, 요청 간격은 원래 시각 기준 (--speed 배속, 0이면 대기 없이)
+- Phase A 드래그는 새 문제의 절취선 위치로 x만 평행 이동 (기록된 reference_x → 새 guide_line 중심)
+- Phase B 답안은 기록된 개수 / 정답 여부대로 새 문제에서 다시 선택 (stub의 "t-" 정답 id 사용)
+- verify는 재생 중 발급된 완료 토큰 / 새 session_id로 요청
+- 원래 기록(latency / HTTP 상태)과 재생 결과를 단계별로 비교 출력, --json 저장 후 --compare로 빌드 간 비교
+- stub pass 비율 기본값은 1.0 (AI 판정 때문에 기록과 다른 경로로 갈라지지 않도록)
+
+실행:
+    python -m benchmarks.replay capture.jsonl.gz --speed 4 --json after.json
+    python -m benchmarks.replay capture.jsonl.gz --speed 0 --compare before.json
+"""
+
+import argparse
+import gzip
+import json
+import random
+import sys
+import threading
+from collections import Counter, defaultdict
+from concurrent.futures import ThreadPoolExecutor
+from time import monotonic, sleep
+from typing import Any, Dict, List, Optional
+
+import httpx
+
+from benchmarks.loadtest import PHASES, FlowRunner, Recorder, print_report, spawn_app, summarize
+from benchmarks.stub_ai_server import (
+    TARGET_PREFIX,
+    add_stub_arguments,
+    start_stub_server,
+    stub_config_from_args,
+)
+
+
+# -----------------------
+# 기록 파일 읽기
+# -----------------------
+def load_capture(path: str) -> Dict[str, List[Dict[str, Any]]]:
+    """seq → 시각순 요청 목록 (.gz는 batch별 gzip member가 이어진 형태)"""
+    opener = gzip.open if path.endswith(".gz") else open
+    sequences: Dict[str, List[Dict[str, Any]]] = defaultdict(list)
+    with opener(path, "rt", encoding="utf-8") as f:
+        for line in f:
+            line = line.strip()
+            if line:
+                event = json.loads(line)
+                sequences[event["seq"]].append(event)
+    for events in sequences.values():
+        events.sort(key=lambda e: e["ts"])
+    return dict(sequences)
+
+
+def original_report(sequences: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    """기록 당시 단계별 latency / HTTP 상태 분포 (재생 결과와 같은 형식)"""
+    recorder = Recorder()
+    timestamps = []
+    for events in sequences.values():
+        for event in events:
+            recorder.record(event["phase"], event["latency_ms"] / 1000, f"http_{event['status']}")
+            timestamps.append(event["ts"])
+        # 세션이 어디까지 진행됐는지 (마지막 요청 단계 / 상태)
+        recorder.flow(f"{events[-1]['phase']}:http_{events[-1]['status']}")
+    elapsed = max(timestamps) - min(timestamps) if timestamps else 0.0
+    return summarize(recorder, max(elapsed, 1e-3))
+
+
+# -----------------------
+# 요청 body 재구성
+# -----------------------
+def shift_points(points: Any, dx: float) -> Any:
+    """드래그 x 좌표 평행 이동 (리스트 / dict / 컬럼 형식, packed는 그대로)"""
+    if isinstance(points, dict):
+        if points.get("xs"):
+            return {**points, "xs": [x + dx for x in points["xs"]]}
+        return points
+    if not isinstance(points, list):
+        return points
+    shifted = []
+    for p in points:
+        if isinstance(p, list) and p:
+            shifted.append([p[0] + dx, *p[1:]])
+        elif isinstance(p, dict) and "x" in p:
+            shifted.append({**p, "x": p["x"] + dx})
+        else:
+            shifted.append(p)
+    return shifted
+
+
+def phase_a_body(captured: Dict[str, Any], problem: Dict[str, Any]) -> Dict[str, Any]:
+    body = {k: v for k, v in captured.items() if k != "reference_x"}
+    reference_x = captured.get("reference_x")
+    if reference_x is not None and "points" in body:
+        guide_x = (problem["guide_line"]["start"][0] + problem["guide_line"]["end"][0]) / 2
+        body["points"] = shift_points(body["points"], guide_x - reference_x)
+    return body
+
+
+def phase_b_answer(summary: Any, problem: Dict[str, Any], rng: random.Random) -> List[str]:
+    ids = [cell["image_id"] for cell in problem["grid"]]
+    targets = [image_id for image_id in ids if image_id.startswith(TARGET_PREFIX)]
+    summary = summary if isinstance(summary, dict) else {}
+    if summary.get("correct") is False:
+        others = [image_id for image_id in ids if image_id not in targets]
+        count = min(summary.get("count", len(targets)), len(others))
+        return rng.sample(others, count)
+    return targets
+
+
+# -----------------------
+# 세션 단위 재생
+# -----------------------
+class ReplayRunner(FlowRunner):
+
+    def __init__(self, client: httpx.Client, recorder: Recorder, args: argparse.Namespace, seed: int,
+                 status_match: Dict[str, Counter]):
+        super().__init__(client, recorder, args, seed)
+        self.status_match = status_match
+
+    def _replay_call(self, event: Dict[str, Any], headers: Dict[str, str], body: Optional[Dict[str, Any]] = None):
+        data, outcome = self._call(event["phase"], event["path"], headers, body)
+        status = int(outcome[5:8]) if outcome.startswith("http_") else (200 if data is not None else None)
+        self.status_match[event["phase"]]["same" if status == event["status"] else "different"] += 1
+        return data, outcome
+
+    def replay(self, events: List[Dict[str, Any]], start_at: float, t0: float) -> str:
+        self.session_state = None
+        session_id = problem = completion_token = None
+        status = None
+
+        for event in events:
+            if self.args.speed > 0:
+                delay = start_at + (event["ts"] - t0) / self.args.speed - monotonic()
+                if delay > 0:
+                    sleep(delay)
+
+            phase, captured = event["phase"], event.get("body") or {}
+            session_headers = {"X-Session-Id": session_id} if session_id else {}
+
+            if phase == "init":
+                headers = dict(event.get("headers") or {})
+                headers["x-client-id"] = self.args.client_id or headers.get("x-client-id", "cust_alpha")
+                headers.pop("content-type", None)
+                data, outcome = self._replay_call(event, headers)
+                if data is None or not data.get("success"):
+                    return f"init:{outcome}"
+                session_id, status = data["data"]["session_id"], data.get("status")
+                continue
+
+            if session_id is None:
+                return f"no_session:{phase}"
+
+            if phase == "request":
+                data, outcome = self._replay_call(event, session_headers)
+                if data is None or not data.get("success"):
+                    return f"request:{outcome}"
+                problem, status = data["data"]["problem"], data.get("status")
+
+            elif phase == "submit_a":
+                if problem is None or status != "PHASE_A":
+                    return "diverged:submit_a"
+                data, outcome = self._replay_call(event, session_headers, phase_a_body(captured, problem))
+                if data is None:
+                    return f"submit_a:{outcome}"
+                problem, status = (data.get("data") or {}).get("problem", problem), data.get("status") or status
+
+            elif phase == "submit_b":
+                if problem is None or status != "PHASE_B":
+                    return "diverged:submit_b"
+                body = {**captured, "user_answer": phase_b_answer(captured.get("user_answer"), problem, self.rng)}
+                data, outcome = self._replay_call(event, session_headers, body)
+                if data is None:
+                    return f"submit_b:{outcome}"
+                status = data.get("status") or status
+                payload = data.get("data") or {}
+                if status == "COMPLETED":
+                    completion_token = payload.get("completion_token")
+                else:
+                    problem = payload.get("problem", problem)
+
+            elif phase == "verify":
+                if captured.get("token"):
+                    if completion_token is None:
+                        return "diverged:verify"
+                    body = {"token": completion_token}
+                else:
+                    body = {"session_id": session_id}
+                data, outcome = self._replay_call(event, {}, body)
+                if data is None:
+                    return f"verify:{outcome}"
+
+        return "replayed"
+
+
+def _replay_worker(base_url: str, args: argparse.Namespace, recorder: Recorder, status_match: Dict[str, Counter],
+                   events: List[Dict[str, Any]], start_at: float, t0: float, seed: int, lag: List[float],
+                   lock: threading.Lock):
+    planned = start_at + ((events[0]["ts"] - t0) / args.speed if args.speed > 0 else 0.0)
+    if args.speed > 0 and planned > monotonic():
+        sleep(planned - monotonic())
+    with lock:
+        lag.append(max(0.0, monotonic() - planned))
+
+    with httpx.Client(base_url=base_url, timeout=args.request_timeout) as client:
+        runner = ReplayRunner(client, recorder, args, seed, status_match)
+        recorder.flow(runner.replay(events, start_at, t0))
+
+
+# -----------------------
+# 빌드 간 비교
+# -----------------------
+def print_comparison(previous: Dict[str, Any], current: Dict[str, Any]):
+    print(f"\n{'phase':<10} {'p50 before':>11} {'p50 after':>11} {'ratio':>7} {'p99 before':>11} {'p99 after':>11} {'ratio':>7}")
+    for phase in PHASES:
+        before, after = previous["phases"].get(phase), current["phases"].get(phase)
+        if not before or not after:
+            continue
+        p50 = after["p50_ms"] / before["p50_ms"] if before["p50_ms"] else 0.0
+        p99 = after["p99_ms"] / before["p99_ms"] if before["p99_ms"] else 0.0
+        print(
+            f"{phase:<10} {before['p50_ms']:>9.1f}ms {after['p50_ms']:>9.1f}ms {p50:>6.2f}x "
+            f"{before['p99_ms']:>9.1f}ms {after['p99_ms']:>9.1f}ms {p99:>6.2f}x"
+        )
+    if previous.get("flow_outcomes") != current.get("flow_outcomes"):
+        print(f"flow outcomes changed: {previous.get('flow_outcomes')} → {current.get('flow_outcomes')}")
+
+
+def main(argv: Optional[List[str]] = None) -> int:
+    parser = argparse.ArgumentParser()
+    parser.add_argument("capture", help="TRAFFIC_CAPTURE_PATH로 기록한 파일 (.jsonl / .jsonl.gz)")
+    parser.add_argument("--speed", type=float, default=1.0, help="재생 배속 (1: 원래 간격, 0: 대기 없이)")
+    parser.add_argument("--url", default=None, help="대상 앱 주소 (미지정 시 uvicorn 프로세스 실행)")
+    parser.add_argument("--ai-url", default=None, help="AI 서버 주소 (미지정 시 내장 stub 실행)")
+    parser.add_argument("--workers", type=int, default=1, help="앱을 직접 띄울 때 uvicorn worker 수")
+    parser.add_argument("--keep-rate-limit", action="store_true", help="앱을 직접 띄울 때 rate limit 유지")
+    parser.add_argument("--concurrency", type=int, default=64, help="동시에 재생할 최대 세션 수")
+    parser.add_argument("--client-id", default=None, help="기록된 X-Client-Id 대신 사용할 고객사 ID")
+    parser.add_argument("--request-timeout", type=float, default=30.0)
+    parser.add_argument("--seed", type=int, default=42)
+    parser.add_argument("--json", default=None, help="결과를 JSON 파일로 저장")
+    parser.add_argument("--compare", default=None, help="이전 재생 결과 JSON과 단계별 latency 비교")
+    add_stub_arguments(parser)
+    parser.set_defaults(pass_ratio_a=1.0, pass_ratio_b=1.0)
+    args = parser.parse_args(argv)
+
+    sequences = load_capture(args.capture)
+    if not sequences:
+        print(f"재생할 요청이 없습니다: {args.capture}")
+        return 1
+    ordered = sorted(sequences.values(), key=lambda events: events[0]["ts"])
+    t0 = ordered[0][0]["ts"]
+    print(f"capture: {sum(len(e) for e in ordered)} requests / {len(ordered)} sessions (speed={args.speed})")
+
+    stub_server = app_process = None
+    ai_url = args.ai_url
+    if ai_url is None:
+        stub_server, ai_url = start_stub_server(0, stub_config_from_args(args))
+        print(f"stub AI server: {ai_url}")
+
+    base_url = args.url
+    try:
+        if base_url is None:
+            app_process, base_url = spawn_app(ai_url, args)
+            print(f"app: {base_url} (workers={args.workers})")
+
+        recorder = Recorder()
+        status_match: Dict[str, Counter] = defaultdict(Counter)
+        lag: List[float] = []
+        lock = threading.Lock()
+        started = monotonic()
+        with ThreadPoolExecutor(max_workers=args.concurrency) as pool:
+            for i, events in enumerate(ordered):
+                pool.submit(_replay_worker, base_url, args, recorder, status_match,
+                            events, started, t0, args.seed + i, lag, lock)
+
+        report = summarize(recorder, monotonic() - started)
+        report["original"] = original_report(sequences)
+        report["status_match"] = {phase: dict(counts) for phase, counts in status_match.items()}
+        report["start_lag_ms_max"] = round(max(lag, default=0.0) * 1000, 2)
+        report["config"] = {k: v for k, v in vars(args).items() if k not in ("json", "compare")}
+
+        print("\n[original]")
+        print_report(report["original"])
+        print("\n[replay]")
+        print_report(report)
+        print(f"\nHTTP status same as capture: {report['status_match']}")
+        print(f"max session start lag: {report['start_lag_ms_max']}ms (--concurrency 부족 시 증가)")
+
+        if args.compare:
+            with open(args.compare, "r", encoding="utf-8") as f:
+                print_comparison(json.load(f), report)
+        if args.json:
+            with open(args.json, "w", encoding="utf-8") as f:
+                json.dump(report, f, indent=2, ensure_ascii=False)
+        return 0
+    finally:
+        if app_process is not None:
+            app_process.terminate()
+            app_process.wait(timeout=10)
+        if stub_server is not None:
+            stub_server.shutdown()
+
+
+if __name__ == "__main__":
+    sys.exit(main())
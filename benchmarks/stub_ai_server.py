@@ -0,0 +1,213 @@
+# benchmarks/stub_ai_server.py
+"""
+부하 테스트용 AI 서버 stub (tcurity-ai 대체, 표준 라이브러리만 사용)
+- GET  /health           : {"status": "ok", "wire_formats": ["json", "packed"]}
+- POST /phase-a/verify   : {"pass", "label", "confidence"} (pass 비율 설정)
+- POST /phase-b/generate : 3x3 그리드 문제 (정답 이미지 id는 "t-" 접두사 → 부하 생성기가 정답 선택 가능)
+- POST /phase-b/verify   : {"pass", "label", "confidence"}
+- 엔드포인트별 지연 분포 / 오류율(500) / 타임아웃 비율 설정
+
+지연 분포 형식:
+    fixed:<ms> | uniform:<min_ms>:<max_ms> | lognormal:<median_ms>:<sigma>
+
+실행:
+    python -m benchmarks.stub_ai_server --port 9100 --verify-latency lognormal:40:0.5 --error-rate 0.01
+"""
+
+import argparse
+import base64
+import io
+import json
+import math
+import random
+import threading
+import uuid
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from time import sleep
+from typing import Callable, Dict, Any, Optional
+
+import numpy as np
+from PIL import Image
+
+GRID_SIZE = 9
+TARGET_COUNT = 3
+TARGET_PREFIX = "t-"
+
+
+def parse_latency(spec: str) -> Callable[[random.Random], float]:
+    """지연 분포 문자열 → 샘플 함수 (초 단위 반환)"""
+    kind, *params = spec.split(":")
+    values = [float(p) for p in params]
+
+    if kind == "fixed" and len(values) == 1:
+        return lambda rng: values[0] / 1000
+    if kind == "uniform" and len(values) == 2:
+        return lambda rng: rng.uniform(values[0], values[1]) / 1000
+    if kind == "lognormal" and len(values) == 2:
+        mu = math.log(max(values[0], 1e-3))
+        return lambda rng: rng.lognormvariate(mu, values[1]) / 1000
+    raise ValueError(f"지연 분포 형식 오류: {spec} (fixed:ms | uniform:min:max | lognormal:median:sigma)")
+
+
+def _grid_images(size: int, seed: int):
+    """그리드 이미지 (실제 응답과 비슷한 크기의 PNG가 되도록 노이즈 포함)"""
+    rng = np.random.default_rng(seed)
+    images = []
+    for i in range(GRID_SIZE):
+        pixels = rng.integers(0, 256, size=(size, size, 3), dtype=np.uint8)
+        pixels[..., i % 3] = (pixels[..., i % 3] // 2) + 64
+        buffer = io.BytesIO()
+        Image.fromarray(pixels, "RGB").save(buffer, format="PNG")
+        images.append(base64.b64encode(buffer.getvalue()).decode("ascii"))
+    return images
+
+
+class StubConfig:
+
+    def __init__(
+        self,
+        verify_latency: str = "lognormal:40:0.5",
+        generate_latency: str = "lognormal:80:0.4",
+        error_rate: float = 0.0,
+        timeout_rate: float = 0.0,
+        timeout_seconds: float = 15.0,
+        pass_ratio_a: float = 0.95,
+        pass_ratio_b: float = 0.95,
+        image_size: int = 128,
+        seed: int = 1234,
+    ):
+        self.verify_latency = parse_latency(verify_latency)
+        self.generate_latency = parse_latency(generate_latency)
+        self.error_rate = error_rate
+        self.timeout_rate = timeout_rate
+        self.timeout_seconds = timeout_seconds
+        self.pass_ratio = {"/phase-a/verify": pass_ratio_a, "/phase-b/verify": pass_ratio_b}
+        self.images = _grid_images(image_size, seed)
+        self.seed = seed
+        self._local = threading.local()
+
+    def rng(self) -> random.Random:
+        # 핸들러 스레드별 RNG (seed 고정, lock 없이 사용)
+        rng = getattr(self._local, "rng", None)
+        if rng is None:
+            rng = self._local.rng = random.Random(f"{self.seed}-{threading.get_ident()}")
+        return rng
+
+
+class StubHandler(BaseHTTPRequestHandler):
+    config: StubConfig = StubConfig()
+    protocol_version = "HTTP/1.1"
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, body: Dict[str, Any], code: int = 200):
+        raw = json.dumps(body).encode("utf-8")
+        self.send_response(code)
+        self.send_header("Content-Type", "application/json")
+        self.send_header("Content-Length", str(len(raw)))
+        self.end_headers()
+        self.wfile.write(raw)
+
+    def do_GET(self):
+        if self.path == "/health":
+            self._send({"status": "ok", "wire_formats": ["json", "packed"]})
+        else:
+            self._send({"detail": "not found"}, 404)
+
+    def do_POST(self):
+        length = int(self.headers.get("Content-Length") or 0)
+        self.rfile.read(length)
+
+        config, rng = self.config, self.config.rng()
+
+        if self.path == "/phase-b/generate":
+            sleep(config.generate_latency(rng))
+        elif self.path in config.pass_ratio:
+            sleep(config.verify_latency(rng))
+        else:
+            self._send({"detail": "not found"}, 404)
+            return
+
+        roll = rng.random()
+        if roll < config.timeout_rate:
+            sleep(config.timeout_seconds)  # 백엔드 AI_REQUEST_TIMEOUT보다 길게 → 타임아웃
+        elif roll < config.timeout_rate + config.error_rate:
+            self._send({"detail": "stub injected error"}, 500)
+            return
+
+        if self.path == "/phase-b/generate":
+            self._send(self._generate(rng))
+        else:
+            passed = rng.random() < config.pass_ratio[self.path]
+            self._send({
+                "pass": passed,
+                "label": "사람" if passed else "봇",
+                "confidence": round(rng.uniform(0.7, 0.99), 3),
+            })
+
+    def _generate(self, rng: random.Random) -> Dict[str, Any]:
+        targets = set(rng.sample(range(GRID_SIZE), TARGET_COUNT))
+        images = [
+            {
+                "image_id": (TARGET_PREFIX if i in targets else "d-") + uuid.UUID(int=rng.getrandbits(128)).hex,
+                "image_base64": self.config.images[i],
+            }
+            for i in range(GRID_SIZE)
+        ]
+        return {
+            "question": "고양이 이미지를 모두 고르시오",
+            "target_class": "cat",
+            "images": images,
+            "answer_uuids": [img["image_id"] for img in images if img["image_id"].startswith(TARGET_PREFIX)],
+        }
+
+
+def start_stub_server(port: int = 0, config: Optional[StubConfig] = None, host: str = "127.0.0.1"):
+    """백그라운드 스레드에서 stub 서버 시작 → (server, "http://host:port")"""
+    handler = type("ConfiguredStubHandler", (StubHandler,), {"config": config or StubConfig()})
+    server = ThreadingHTTPServer((host, port), handler)
+    server.daemon_threads = True
+    threading.Thread(target=server.serve_forever, name="stub-ai-server", daemon=True).start()
+    return server, f"http://{host}:{server.server_address[1]}"
+
+
+def add_stub_arguments(parser: argparse.ArgumentParser):
+    parser.add_argument("--verify-latency", default="lognormal:40:0.5", help="/phase-a|b/verify 지연 분포")
+    parser.add_argument("--generate-latency", default="lognormal:80:0.4", help="/phase-b/generate 지연 분포")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="500 응답 비율")
+    parser.add_argument("--timeout-rate", type=float, default=0.0, help="응답 지연(타임아웃 유발) 비율")
+    parser.add_argument("--timeout-seconds", type=float, default=15.0)
+    parser.add_argument("--pass-ratio-a", type=float, default=0.95)
+    parser.add_argument("--pass-ratio-b", type=float, default=0.95)
+    parser.add_argument("--image-size", type=int, default=128, help="그리드 이미지 한 변 (px)")
+    parser.add_argument("--stub-seed", type=int, default=1234)
+
+
+def stub_config_from_args(args: argparse.Namespace) -> StubConfig:
+    return StubConfig(
+        verify_latency=args.verify_latency,
+        generate_latency=args.generate_latency,
+        error_rate=args.error_rate,
+        timeout_rate=args.timeout_rate,
+        timeout_seconds=args.timeout_seconds,
+        pass_ratio_a=args.pass_ratio_a,
+        pass_ratio_b=args.pass_ratio_b,
+        image_size=args.image_size,
+        seed=args.stub_seed,
+    )
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=9100)
+    add_stub_arguments(parser)
+    args = parser.parse_args()
+
+    server, url = start_stub_server(args.port, stub_config_from_args(args), args.host)
+    print(f"stub AI server: {url}")
+    try:
+        threading.Event().wait()
+    except KeyboardInterrupt:
+        server.shutdown()
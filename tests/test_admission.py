@@ -0,0 +1,91 @@
+# tests/test_admission.py
+"""
+AIMD 동시 실행 제한: 한도 + 대기열 초과 시 즉시 거절, 지연 / 과부하 신호에 한도 감소, 포화 시 한도 증가
+"""
+
+import pytest
+
+from app.core import admission
+from app.core.admission import AdaptiveLimiter, OverloadedError
+
+
+@pytest.fixture(autouse=True)
+def enabled(monkeypatch):
+    monkeypatch.setattr(admission, "ADMISSION_CONTROL_ENABLED", True)
+
+
+def _limiter(initial: int = 2, max_queue: int = 0, queue_timeout_ms: float = 10) -> AdaptiveLimiter:
+    return AdaptiveLimiter("test", initial, 1, 8, latency_target_ms=100,
+                           max_queue=max_queue, queue_timeout_ms=queue_timeout_ms)
+
+
+def _run(limiter: AdaptiveLimiter, latency_ms: float, dropped: bool = False):
+    with limiter.lock():
+        limiter.admit_locked()
+        limiter.finish_locked(latency_ms, dropped)
+
+
+def test_sheds_when_slots_and_queue_are_full():
+    limiter = _limiter(initial=1)
+
+    with limiter.acquire():
+        with pytest.raises(OverloadedError) as e:
+            with limiter.acquire():
+                pass
+
+    assert e.value.resource == "test"
+    assert e.value.retry_after >= 1
+    assert limiter.inflight == 0
+
+
+def test_queued_request_is_shed_after_timeout():
+    limiter = _limiter(initial=1, max_queue=1, queue_timeout_ms=10)
+
+    with limiter.acquire():
+        with pytest.raises(OverloadedError):
+            with limiter.acquire():
+                pass
+        assert limiter.waiting == 0
+
+
+@pytest.mark.parametrize("latency_ms, dropped", [(500, False), (10, True)])
+def test_slow_or_dropped_result_decreases_limit(latency_ms, dropped):
+    limiter = _limiter(initial=4)
+
+    _run(limiter, latency_ms, dropped)
+
+    assert limiter.limit == pytest.approx(4 * admission.BACKOFF_RATIO)
+
+
+def test_consecutive_slow_results_decrease_once_per_target_window():
+    limiter = _limiter(initial=4)
+
+    _run(limiter, 500)
+    _run(limiter, 500)
+
+    assert limiter.limit == pytest.approx(4 * admission.BACKOFF_RATIO)
+
+
+def test_limit_grows_only_when_saturated():
+    limiter = _limiter(initial=2)
+
+    _run(limiter, 10)   # inflight 1 < 한도 2: 증가 없음
+    assert limiter.limit == 2
+
+    with limiter.lock():
+        limiter.admit_locked()
+        limiter.admit_locked()
+        limiter.finish_locked(10, False)
+        limiter.finish_locked(10, False)
+    assert limiter.limit == pytest.approx(2.5)
+
+
+def test_exception_inside_block_counts_as_drop():
+    limiter = _limiter(initial=4)
+
+    with pytest.raises(RuntimeError):
+        with limiter.acquire():
+            raise RuntimeError("boom")
+
+    assert limiter.limit < 4
+    assert limiter.inflight == 0
@@ -0,0 +1,38 @@
+# tests/test_ai_endpoint_pool.py
+"""
+AI 엔드포인트 풀: 액티브 헬스체크 실패도 요청 경로와 같은 연속 실패 기준으로 eject
+"""
+
+import socket
+from time import monotonic
+
+from app.services.ai_endpoint_pool import AIEndpointPool
+
+
+def _closed_port_url() -> str:
+    with socket.socket() as s:
+        s.bind(("127.0.0.1", 0))
+        return f"http://127.0.0.1:{s.getsockname()[1]}"
+
+
+def test_single_failed_probe_does_not_eject():
+    pool = AIEndpointPool([_closed_port_url()], health_check_path="/health", health_check_interval=0, eject_failures=3)
+    ep = pool.endpoints[0]
+
+    pool.check_health_once()
+    pool.check_health_once()
+    assert ep.is_available(monotonic())
+
+    pool.check_health_once()
+    assert not ep.is_available(monotonic())
+
+
+def test_probe_failures_accumulate_with_request_failures():
+    pool = AIEndpointPool([_closed_port_url()], health_check_path="/health", health_check_interval=0, eject_failures=2)
+    ep = pool.endpoints[0]
+
+    pool.release(pool.select(), latency_ms=10.0, ok=False)
+    assert ep.is_available(monotonic())
+
+    pool.check_health_once()
+    assert not ep.is_available(monotonic())
@@ -0,0 +1,79 @@
+# tests/test_body_size_limit.py
+"""
+요청 body 크기 제한: Content-Length 유무와 관계없이 한도를 넘는 body는 413, 한도 이내는 그대로 통과
+"""
+
+import asyncio
+import json
+
+import pytest
+from fastapi import FastAPI, Request
+
+from app.core import security_layer
+from app.core.security_layer import RequestBodySizeLimit
+
+LIMIT = 1024
+
+
+@pytest.fixture(autouse=True)
+def small_limit(monkeypatch):
+    monkeypatch.setattr(security_layer, "MAX_REQUEST_BODY_BYTES", LIMIT)
+
+
+def _app() -> RequestBodySizeLimit:
+    app = FastAPI()
+
+    @app.post("/echo")
+    async def echo(request: Request):
+        return {"size": len(await request.body())}
+
+    return RequestBodySizeLimit(app)
+
+
+def _call(chunks, content_length=None):
+    """raw ASGI 호출 → (status, body). content_length가 None이면 chunked 전송과 동일"""
+    headers = [(b"content-type", b"application/json")]
+    if content_length is not None:
+        headers.append((b"content-length", str(content_length).encode()))
+    scope = {
+        "type": "http", "asgi": {"version": "3.0"}, "http_version": "1.1", "method": "POST",
+        "scheme": "http", "path": "/echo", "raw_path": b"/echo", "root_path": "", "query_string": b"",
+        "headers": headers, "client": ("127.0.0.1", 12345), "server": ("testserver", 80),
+    }
+    messages = [
+        {"type": "http.request", "body": chunk, "more_body": i < len(chunks) - 1}
+        for i, chunk in enumerate(chunks)
+    ]
+    sent = []
+
+    async def receive():
+        if messages:
+            return messages.pop(0)
+        return {"type": "http.disconnect"}
+
+    async def send(message):
+        sent.append(message)
+
+    asyncio.run(_app()(scope, receive, send))
+
+    start = next(m for m in sent if m["type"] == "http.response.start")
+    body = b"".join(m.get("body", b"") for m in sent if m["type"] == "http.response.body")
+    return start["status"], json.loads(body)
+
+
+def test_content_length_over_limit_is_rejected_before_reading():
+    status, body = _call([], content_length=LIMIT + 1)
+    assert status == 413
+    assert body["success"] is False
+
+
+def test_chunked_body_over_limit_is_rejected():
+    status, body = _call([b"x" * 512] * 4)
+    assert status == 413
+    assert body["success"] is False
+
+
+def test_body_within_limit_passes():
+    status, body = _call([b"x" * 512, b"x" * 512])
+    assert status == 200
+    assert body == {"size": LIMIT}
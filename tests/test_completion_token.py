@@ -0,0 +1,61 @@
+# tests/test_completion_token.py
+"""
+완료 토큰: 서명 / 검증, 변조 / 만료 / 알 수 없는 kid 거절, 1회용 nonce 재사용 거절
+"""
+
+from time import time
+
+import pytest
+
+from app.core import completion_token
+from app.core.completion_token import CompletionTokenError, issue_completion_token, verify_completion_token
+
+CLIENT_ID = "tenant_token_test"
+
+
+def _reason(token: str, single_use: bool = False) -> str:
+    with pytest.raises(CompletionTokenError) as e:
+        verify_completion_token(token, single_use=single_use)
+    return e.value.reason
+
+
+def test_issued_token_verifies():
+    claims = verify_completion_token(issue_completion_token("sess-1", CLIENT_ID), single_use=False)
+
+    assert claims["session_id"] == "sess-1"
+    assert claims["client_id"] == CLIENT_ID
+    assert claims["expires_at"] > time()
+
+
+def test_tampered_payload_is_rejected():
+    version, kid, body, signature = issue_completion_token("sess-1", CLIENT_ID).split(".")
+    other_body = issue_completion_token("sess-2", CLIENT_ID).split(".")[2]
+
+    assert _reason(".".join((version, kid, other_body, signature))) == "bad_signature"
+    assert _reason("v1.only.three") == "malformed"
+
+
+def test_unknown_kid_is_rejected():
+    version, _, body, signature = issue_completion_token("sess-1", CLIENT_ID).split(".")
+    assert _reason(".".join((version, "retired", body, signature))) == "unknown_kid"
+
+
+def test_expired_token_is_rejected(monkeypatch):
+    issued_at = time() - completion_token.COMPLETION_TOKEN_TTL_SECONDS - 10
+    monkeypatch.setattr(completion_token, "time", lambda: issued_at)
+    token = issue_completion_token("sess-1", CLIENT_ID)
+    monkeypatch.undo()
+
+    assert _reason(token) == "expired"
+
+
+def test_single_use_token_cannot_be_replayed():
+    token = issue_completion_token("sess-1", CLIENT_ID)
+
+    verify_completion_token(token, single_use=True)
+
+    assert _reason(token, single_use=True) == "replayed"
+    # single_use=False 조회는 nonce를 소비하지 않음
+    other = issue_completion_token("sess-2", CLIENT_ID)
+    verify_completion_token(other, single_use=False)
+    verify_completion_token(other, single_use=True)
@@ -0,0 +1,101 @@
+# tests/test_fair_scheduler.py
+"""
+AI 검증 슬롯 공정 분배(DRR): 한 고객사가 대기열을 채워도 다른 고객사가 가중치만큼 슬롯을 배정받음
+"""
+
+import threading
+import time
+
+from app.core.admission import AdaptiveLimiter
+from app.core.fair_scheduler import FairScheduler
+
+# client_validation.VALID_CLIENTS: cust_alpha weight 2, cust_beta weight 1
+
+
+def _scheduler(max_waiters: int = 64, queue_timeout_ms: float = 5000) -> FairScheduler:
+    # 한도 1 고정 (AIMD 증가 없음) → 슬롯 반환마다 정확히 한 건 배정
+    limiter = AdaptiveLimiter("test_fair", 1, 1, 1, latency_target_ms=10_000)
+    return FairScheduler(limiter, queue_timeout_ms=queue_timeout_ms, max_waiters=max_waiters)
+
+
+def _wait_until(predicate, timeout: float = 2.0):
+    deadline = time.monotonic() + timeout
+    while not predicate():
+        assert time.monotonic() < deadline, "대기 시간 초과"
+        time.sleep(0.001)
+
+
+def _enqueue(scheduler: FairScheduler, tenant: str, results: list) -> threading.Thread:
+    waiting = scheduler._waiting
+    thread = threading.Thread(target=lambda: results.append((tenant, scheduler._enter(tenant))), daemon=True)
+    thread.start()
+    _wait_until(lambda: scheduler._waiting == waiting + 1)
+    return thread
+
+
+def _occupy(scheduler: FairScheduler):
+    with scheduler.limiter.lock():
+        scheduler.limiter.admit_locked()
+
+
+def test_grants_follow_weights_while_one_tenant_bursts():
+    scheduler = _scheduler()
+    _occupy(scheduler)
+
+    results = []
+    for _ in range(6):
+        _enqueue(scheduler, "cust_alpha", results)
+    for _ in range(3):
+        _enqueue(scheduler, "cust_beta", results)
+
+    # 슬롯을 하나씩 반환하며 배정 순서 기록
+    for granted in range(1, 10):
+        scheduler._exit(latency_ms=1.0, dropped=False)
+        _wait_until(lambda: len(results) == granted)
+
+    order = [tenant for tenant, _ in results]
+    assert all(rejected is None for _, rejected in results)
+    # weight 2 : 1 → alpha가 먼저 대기열을 채웠어도 beta는 세 번째 배정마다 슬롯을 받음
+    assert order == ["cust_alpha", "cust_alpha", "cust_beta"] * 3
+
+
+def test_equal_weights_alternate():
+    scheduler = _scheduler()
+    _occupy(scheduler)
+
+    results = []
+    for _ in range(3):
+        _enqueue(scheduler, "_unregistered", results)
+    for _ in range(3):
+        _enqueue(scheduler, "cust_beta", results)
+
+    for granted in range(1, 7):
+        scheduler._exit(latency_ms=1.0, dropped=False)
+        _wait_until(lambda: len(results) == granted)
+
+    assert [tenant for tenant, _ in results] == ["_unregistered", "cust_beta"] * 3
+
+
+def test_total_waiters_cap_sheds_without_waiting():
+    scheduler = _scheduler(max_waiters=2)
+    _occupy(scheduler)
+
+    results = []
+    threads = [_enqueue(scheduler, "cust_alpha", results) for _ in range(2)]
+
+    assert scheduler._enter("cust_beta") == "shed"
+
+    for _ in threads:
+        scheduler._exit(latency_ms=1.0, dropped=False)
+    for thread in threads:
+        thread.join(2)
+    assert [rejected for _, rejected in results] == [None, None]
+
+
+def test_waiter_times_out_and_leaves_queue():
+    scheduler = _scheduler(queue_timeout_ms=20)
+    _occupy(scheduler)
+
+    assert scheduler._enter("cust_beta") == "timeout"
+    assert scheduler._waiting == 0
+    assert not scheduler._queues
@@ -0,0 +1,66 @@
+# tests/test_logging_service.py
+"""
+log_event: 큐 → listener 스레드 → "captcha" logger handler로 기록,
+호출 후 payload를 수정해도 기록 내용은 호출 시점 그대로
+"""
+
+import json
+import logging
+
+import pytest
+
+from app.services import logging_service
+from app.services.logging_service import JsonLineFormatter, LogLevel, flush_logs, log_event
+
+
+class _Capture(logging.Handler):
+    def __init__(self):
+        super().__init__()
+        self.setFormatter(JsonLineFormatter())
+        self.lines = []
+
+    def emit(self, record):
+        self.lines.append(json.loads(self.format(record)))
+
+
+@pytest.fixture
+def captured(monkeypatch):
+    monkeypatch.setattr(logging_service, "_MIN_LEVEL", logging.DEBUG)
+    handler = _Capture()
+    logging_service.logger.addHandler(handler)
+    yield handler.lines
+    logging_service.logger.removeHandler(handler)
+
+
+def _events(lines, event):
+    return [line for line in lines if line["event"] == event]
+
+
+def test_records_go_through_logger_handlers(captured):
+    log_event("TEST_EVENT", {"value": 1}, level=LogLevel.WARNING, context={"node": "a"})
+    flush_logs()
+
+    [line] = _events(captured, "TEST_EVENT")
+    assert line["level"] == "warning"
+    assert (line["value"], line["node"]) == (1, "a")
+    assert isinstance(line["timestamp"], str)
+
+
+def test_payload_mutation_after_call_does_not_change_record(captured):
+    payload = {"value": 1}
+    log_event("TEST_PAYLOAD_COPY", payload)
+    payload["value"] = 2
+    payload["extra"] = True
+    flush_logs()
+
+    [line] = _events(captured, "TEST_PAYLOAD_COPY")
+    assert line["value"] == 1
+    assert "extra" not in line
+
+
+def test_unencodable_record_is_replaced_with_failure_line(captured):
+    log_event("TEST_BAD_RECORD", {"timestamp": float("nan")})
+    flush_logs()
+
+    [line] = _events(captured, "LOG_RECORD_ENCODE_FAILED")
+    assert line["original_event"] == "TEST_BAD_RECORD"
@@ -0,0 +1,50 @@
+# tests/test_rate_limit.py
+"""
+요청 제한: 한 고객사가 자기 한도를 모두 소진해도 다른 고객사 요청은 통과해야 함
+"""
+
+import pytest
+from fastapi import HTTPException
+from starlette.requests import Request
+
+from app.core import rate_limit
+from app.core.rate_limit import LocalRateLimiter, enforce_rate_limit
+
+
+def _request(peer: str, forwarded_for: str = None) -> Request:
+    headers = [(b"x-forwarded-for", forwarded_for.encode())] if forwarded_for else []
+    return Request({"type": "http", "method": "POST", "path": "/", "headers": headers, "client": (peer, 12345)})
+
+
+@pytest.fixture(autouse=True)
+def limiter(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_ENABLED", True)
+    monkeypatch.setattr(rate_limit, "RATE_LIMITER", LocalRateLimiter())
+
+
+def _exhaust(client_id: str, request_factory) -> int:
+    """429가 날 때까지 요청 → 허용된 요청 수"""
+    for allowed in range(1000):
+        try:
+            enforce_rate_limit("init", request_factory(), client_id)
+        except HTTPException as e:
+            assert e.status_code == 429
+            return allowed
+    raise AssertionError("요청 제한이 적용되지 않았습니다.")
+
+
+@pytest.mark.parametrize("tenants", [("cust_alpha", "cust_beta"), ("tenant_unregistered_a", "tenant_unregistered_b")])
+def test_tenants_do_not_starve_each_other(tenants):
+    first, second = tenants
+    assert _exhaust(first, lambda: _request("10.0.0.1")) > 0
+
+    # 첫 고객사가 한도를 모두 썼어도 다른 고객사(다른 사용자 IP)는 통과
+    enforce_rate_limit("init", _request("10.0.0.2"), second)
+
+
+def test_tenants_behind_proxy_do_not_starve_each_other(monkeypatch):
+    monkeypatch.setattr(rate_limit, "RATE_LIMIT_TRUST_FORWARDED_FOR", True)
+
+    # 같은 프록시(peer 주소)를 거쳐도 X-Forwarded-For의 사용자 IP별 bucket
+    _exhaust("tenant_unregistered_a", lambda: _request("172.16.0.1", "203.0.113.1"))
+    enforce_rate_limit("init", _request("172.16.0.1", "203.0.113.2"), "tenant_unregistered_b")
@@ -0,0 +1,83 @@
+# tests/test_replay_cache.py
+"""
+궤적 지문 캐시: exact / near 재전송 탐지, 다른 세션 표시, TTL 만료, 용량 초과 제거
+"""
+
+import numpy as np
+import pytest
+
+from app.services import replay_cache
+from app.services.replay_cache import ReplayCache
+from app.utils.trajectory import parse_points
+
+T0 = 1_700_000_000_000
+
+
+def _drag(offset: float = 0.0, start_ms: int = T0, y: float = 0.5):
+    return parse_points([
+        [0.1 + 0.6 * i / 40 + offset, y + 0.1 * np.sin(i / 6) + offset, start_ms + i * 20, "move"]
+        for i in range(40)
+    ])
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    now = [1000.0]
+    monkeypatch.setattr(replay_cache, "monotonic", lambda: now[0])
+    return now
+
+
+def test_exact_replay_from_other_session(clock):
+    cache = ReplayCache(max_entries=10, ttl_seconds=60)
+    cache.record(_drag(), "sess-a", True)
+
+    # 절대 시각만 다른 재전송도 exact (타임스탬프는 첫 포인트 기준 상대값)
+    hit = cache.lookup(_drag(start_ms=T0 + 5_000), "sess-b")
+
+    assert hit == {"verdict": True, "match": "exact", "cross_session": True}
+
+
+def test_same_session_resubmit_is_not_cross_session(clock):
+    cache = ReplayCache(max_entries=10, ttl_seconds=60)
+    cache.record(_drag(), "sess-a", False)
+
+    hit = cache.lookup(_drag(), "sess-a")
+
+    assert hit["verdict"] is False
+    assert hit["cross_session"] is False
+
+
+def test_slightly_shifted_replay_is_near_match(clock):
+    cache = ReplayCache(max_entries=10, ttl_seconds=60)
+    cache.record(_drag(), "sess-a", True)
+
+    assert cache.lookup(_drag(offset=0.001), "sess-b")["match"] == "near"
+    assert cache.lookup(_drag(y=0.2), "sess-b") is None   # 다른 경로
+
+
+def test_entries_expire_after_ttl(clock):
+    cache = ReplayCache(max_entries=10, ttl_seconds=60)
+    cache.record(_drag(), "sess-a", True)
+
+    clock[0] += 61
+
+    assert cache.lookup(_drag(), "sess-b") is None
+    assert cache.lookup(_drag(offset=0.001), "sess-b") is None
+
+
+def test_oldest_entry_is_evicted_over_capacity(clock):
+    cache = ReplayCache(max_entries=2, ttl_seconds=60)
+    drags = [_drag(y=y) for y in (0.2, 0.4, 0.6)]
+    for i, drag in enumerate(drags):
+        cache.record(drag, f"sess-{i}", True)
+
+    assert cache.lookup(drags[0], "other") is None
+    assert cache.lookup(drags[1], "other")["match"] == "exact"
+    assert cache.lookup(drags[2], "other")["match"] == "exact"
+
+
+def test_short_trajectory_is_not_fingerprinted(clock):
+    cache = ReplayCache(max_entries=10, ttl_seconds=60)
+    short = parse_points([[0.1 + i * 0.05, 0.5, T0 + i * 20, "move"] for i in range(5)])
+    cache.record(short, "sess-a", True)
+    assert cache.lookup(short, "sess-b") is None
@@ -0,0 +1,96 @@
+# tests/test_session_state.py
+"""
+stateless 세션 상태: 봉인 / 복원, 변조 / 재제출(jti) 거절,
+처리 중 예외가 나도 새 상태 토큰을 돌려받아 재시도 가능
+"""
+
+from time import time
+
+import pytest
+from fastapi import FastAPI
+from fastapi.testclient import TestClient
+
+from app.core import session_state
+from app.core.replay_store import NonceReplaySet
+from app.core.security_layer import bind_session_state
+from app.core.session_state import SESSION_STATE_HEADER, SessionStateError, seal_session_state, unseal_session_state
+from app.core.session_store import REQUEST_SESSIONS
+
+
+@pytest.fixture(autouse=True)
+def keys(monkeypatch):
+    monkeypatch.setattr(session_state, "SESSION_STATE_KEYS", [("k1", "test-secret")])
+    monkeypatch.setattr(session_state, "_CIPHERS", None)
+    monkeypatch.setattr(session_state, "USED_STATE_IDS", NonceReplaySet())
+
+
+def _session(**overrides):
+    session = {"session_id": "sess-1", "status": "PHASE_A", "expires_at": int(time() * 1000) + 60_000, "fail_count": 0}
+    session.update(overrides)
+    return session
+
+
+def _reason(token: str) -> str:
+    with pytest.raises(SessionStateError) as e:
+        unseal_session_state(token)
+    return e.value.reason
+
+
+def test_seal_unseal_round_trip():
+    session = _session(target_path=[[0.1, 0.2], [0.3, 0.4]])
+    assert unseal_session_state(seal_session_state(session)) == session
+
+
+def test_state_cannot_be_replayed():
+    token = seal_session_state(_session())
+    unseal_session_state(token)
+    assert _reason(token) == "replayed"
+
+
+def test_tampered_state_is_rejected():
+    version, kid, blob = seal_session_state(_session()).split(".")
+    tampered = blob[:-2] + ("AA" if blob[-2:] != "AA" else "BB")
+
+    assert _reason(f"{version}.{kid}.{tampered}") == "decrypt_failed"
+    assert _reason(f"{version}.retired.{blob}") == "unknown_kid"
+    assert _reason("v1.only") == "malformed"
+
+
+def _app() -> FastAPI:
+    app = FastAPI()
+    app.middleware("http")(bind_session_state)
+
+    @app.post("/advance")
+    def advance():
+        session = next(iter(REQUEST_SESSIONS.get().values()))
+        session["status"] = "PHASE_B"
+        return {"ok": True}
+
+    @app.post("/broken")
+    def broken():
+        session = next(iter(REQUEST_SESSIONS.get().values()))
+        session["fail_count"] += 1
+        raise RuntimeError("boom")
+
+    return app
+
+
+def test_handler_error_returns_fresh_state_of_pre_request_session():
+    client = TestClient(_app())
+    token = seal_session_state(_session())
+
+    response = client.post("/broken", headers={SESSION_STATE_HEADER: token})
+
+    assert response.status_code == 500
+    assert response.json()["error"]["code"] == "INTERNAL_ERROR"
+    # 예외 전 변경(fail_count)은 버리고 요청 전 세션을 새 jti로 재발급 → 같은 단계부터 재시도
+    retry = response.headers[SESSION_STATE_HEADER]
+    restored = unseal_session_state(retry, consume=False)
+    assert (restored["status"], restored["fail_count"]) == ("PHASE_A", 0)
+
+    response = client.post("/advance", headers={SESSION_STATE_HEADER: retry})
+    assert response.status_code == 200
+    assert unseal_session_state(response.headers[SESSION_STATE_HEADER])["status"] == "PHASE_B"
+
+    # 소비된 원래 토큰은 여전히 재제출 불가
+    assert client.post("/advance", headers={SESSION_STATE_HEADER: token}).status_code == 403
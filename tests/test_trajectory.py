@@ -0,0 +1,96 @@
+# tests/test_trajectory.py
+"""
+궤적 파싱: 객체 / 배열 / 컬럼 / packed 형식이 같은 궤적을 만들고, 잘못된 컬럼은 빈 궤적으로 처리
+궤적 축소: max_points 상한과 처음 / 끝 / eventType 전환 지점 유지
+"""
+
+import base64
+
+import numpy as np
+import pytest
+
+from app.utils.trajectory import downsample, parse_points
+
+T0 = 1_700_000_000_000
+
+
+def _array_points(n: int = 20):
+    return [[0.1 + i * 0.02, 0.5, T0 + i * 16, "move"] for i in range(n)]
+
+
+def test_formats_produce_same_trajectory():
+    points = _array_points()
+    from_array = parse_points(points)
+    from_objects = parse_points([{"x": x, "y": y, "t": t, "eventType": e} for x, y, t, e in points])
+    from_columns = parse_points({
+        "xs": [p[0] for p in points],
+        "ys": [p[1] for p in points],
+        "ts": [p[2] for p in points],
+        "events": [p[3] for p in points],
+    })
+
+    for other in (from_objects, from_columns):
+        np.testing.assert_array_equal(other.xs, from_array.xs)
+        np.testing.assert_array_equal(other.ys, from_array.ys)
+        np.testing.assert_array_equal(other.ts, from_array.ts)
+        assert list(other.events) == list(from_array.events)
+
+
+def test_packed_columns_use_t0_offset():
+    xs = np.array([0.1, 0.2, 0.3], dtype="<f4")
+    ys = np.array([0.5, 0.5, 0.5], dtype="<f4")
+    ts = np.array([0, 16, 32], dtype="<f4")
+    packed = base64.b64encode(np.concatenate([xs, ys, ts]).tobytes()).decode()
+
+    trajectory = parse_points({"packed": packed, "t0": T0})
+
+    assert len(trajectory) == 3
+    np.testing.assert_array_equal(trajectory.ts, [T0, T0 + 16, T0 + 32])
+
+
+def test_out_of_range_points_are_dropped():
+    points = _array_points(5) + [[1.5, 0.5, T0 + 999, "move"], [0.5, -0.1, T0 + 1000, "move"]]
+    assert len(parse_points(points)) == 5
+
+
+@pytest.mark.parametrize("column", ["xs", "ys", "ts"])
+def test_nested_column_is_rejected(column):
+    columns = {"xs": [0.1, 0.2], "ys": [0.5, 0.5], "ts": [T0, T0 + 16]}
+    columns[column] = [[v] for v in columns[column]]
+
+    trajectory = parse_points(columns)
+
+    assert len(trajectory) == 0
+    assert trajectory.xs.ndim == trajectory.ys.ndim == trajectory.ts.ndim == 1
+
+
+def test_nested_events_are_rejected():
+    columns = {"xs": [0.1, 0.2], "ys": [0.5, 0.5], "ts": [T0, T0 + 16], "events": [["move"], ["move"]]}
+    assert len(parse_points(columns)) == 0
+
+
+def test_mismatched_column_lengths_are_rejected():
+    assert len(parse_points({"xs": [0.1, 0.2], "ys": [0.5], "ts": [T0, T0 + 16]})) == 0
+
+
+def _drag(n: int = 1000):
+    events = ["down"] + ["move"] * (n - 2) + ["up"]
+    return parse_points([[0.1 + 0.8 * i / n, 0.5 + 0.2 * np.sin(i / 50), T0 + i * 4, events[i]] for i in range(n)])
+
+
+@pytest.mark.parametrize("method", ["time_bucket", "rdp"])
+def test_downsample_caps_points_and_keeps_event_transitions(method):
+    trajectory = _drag()
+
+    reduced = downsample(trajectory, 100, method)
+
+    assert 0 < len(reduced) <= 100
+    assert reduced.events[0] == "down" and reduced.events[-1] == "up"
+    assert reduced.ts[0] == trajectory.ts[0] and reduced.ts[-1] == trajectory.ts[-1]
+    assert np.all(np.diff(reduced.ts) > 0)  # 원본 순서 / 타임스탬프 유지
+
+
+def test_downsample_keeps_short_trajectory_and_none_method():
+    trajectory = _drag(50)
+    assert downsample(trajectory, 100) is trajectory
+    assert len(downsample(_drag(), 100, "none")) == 1000
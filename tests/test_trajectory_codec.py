@@ -0,0 +1,39 @@
+# tests/test_trajectory_codec.py
+"""
+AI 서버 전송용 packed 포맷: 인코딩 → 디코딩 시 좌표 / 시간 / eventType / metadata 보존
+"""
+
+import numpy as np
+import pytest
+
+from app.services.trajectory_codec import decode_packed, encode_packed
+from app.utils.trajectory import Trajectory, parse_points
+
+
+def test_round_trip_preserves_columns_and_metadata():
+    points = [[0.1 + i * 0.01, 0.5, 1_700_000_000_000 + i * 16, "move" if i else "down"] for i in range(50)]
+    trajectory = parse_points(points, default_event="move")
+    metadata = {"deviceType": "desktop", "screenWidth": 1920}
+
+    decoded, decoded_metadata = decode_packed(encode_packed(trajectory, metadata))
+
+    assert decoded_metadata == metadata
+    assert len(decoded) == len(trajectory)
+    # float32 저장이므로 좌표는 근사, t는 t0 기준 상대값이라 ms 단위로 정확
+    np.testing.assert_allclose(decoded.xs, trajectory.xs, atol=1e-6)
+    np.testing.assert_allclose(decoded.ys, trajectory.ys, atol=1e-6)
+    np.testing.assert_allclose(decoded.ts, trajectory.ts, atol=1e-3)
+    assert list(decoded.events) == list(trajectory.events)
+
+
+def test_empty_trajectory_round_trip():
+    decoded, metadata = decode_packed(encode_packed(Trajectory.empty(), {}))
+    assert len(decoded) == 0
+    assert metadata == {}
+
+
+def test_rejects_unknown_magic():
+    data = bytearray(encode_packed(Trajectory.empty(), {}))
+    data[:4] = b"XXXX"
+    with pytest.raises(ValueError):
+        decode_packed(bytes(data))
@@ -0,0 +1,98 @@
+# tests/test_verify_phase_b.py
+"""
+Phase B 행동 검증: 파싱 / 룰 평가 오류는 FAIL, AI 서버 오류만 정답 기준 통과(fallback)
+오답 후 문제 재발급이 과부하로 거절돼도 실패는 반영되고 같은 문제로 재시도 불가
+"""
+
+from time import time
+
+import pytest
+
+from app.core.admission import OverloadedError
+from app.schemas.error_codes import ErrorCode
+from app.services import verify_service
+
+ANSWER = ["uuid-1", "uuid-2"]
+
+
+@pytest.fixture
+def outcome(monkeypatch):
+    """세션 저장소 / 토큰 발급 대신 결과만 기록"""
+    result = {}
+    session = {
+        "status": "PHASE_B",
+        "client_id": "cust_alpha",
+        "phase_b": {"issued_at": int(time() * 1000), "fail_count": 0, "correct_uuids": ANSWER},
+    }
+
+    def fail(session_id, session, fail_count, error):
+        result["error"] = error
+
+    monkeypatch.setattr(verify_service, "get_session_and_validate", lambda session_id: session)
+    monkeypatch.setattr(verify_service, "handle_phase_b_fail", fail)
+    monkeypatch.setattr(verify_service, "set_session_status", lambda session_id, status: result.setdefault("status", status))
+    monkeypatch.setattr(verify_service, "issue_completion_token", lambda session_id, client_id: "token")
+    return result
+
+
+def _submit():
+    points = [[0.1 + i * 0.1, 0.5, 1_700_000_000_000 + i * 300, "click"] for i in range(5)]
+    verify_service.verify_phase_b("sess", ANSWER, {"points": points, "metadata": {}})
+
+
+def _raise(*args, **kwargs):
+    raise RuntimeError("boom")
+
+
+@pytest.mark.parametrize("target", ["parse_points", "evaluate_bot_rules"])
+def test_parse_or_rule_error_fails_closed(monkeypatch, outcome, target):
+    monkeypatch.setattr(verify_service, target, _raise)
+    monkeypatch.setattr(verify_service, "verify_phase_b_with_ai", lambda *a: pytest.fail("AI 호출 없어야 함"))
+
+    _submit()
+
+    assert outcome.get("error") == ErrorCode.ANOMALOUS_BEHAVIOR
+    assert "status" not in outcome
+
+
+def test_ai_error_falls_back_to_pass(monkeypatch, outcome):
+    monkeypatch.setattr(verify_service, "verify_phase_b_with_ai", _raise)
+
+    _submit()
+
+    assert "error" not in outcome
+    assert outcome["status"] == verify_service.SessionStatus.COMPLETED
+
+
+def test_shed_regeneration_counts_failure_and_closes_problem(monkeypatch):
+    session = {
+        "status": "PHASE_B",
+        "client_id": "cust_alpha",
+        "phase_b": {"issued_at": int(time() * 1000), "fail_count": 0, "correct_uuids": ANSWER},
+    }
+
+    def update(session_id, data):
+        session["phase_b"].update(data["phase_b"])
+
+    def shed(fail_count):
+        raise OverloadedError("problem_generation", 1)
+
+    monkeypatch.setattr(verify_service, "get_session_and_validate", lambda session_id: session)
+    monkeypatch.setattr(verify_service, "update_session", update)
+    monkeypatch.setattr(verify_service, "generate_phase_b_both", shed)
+
+    with pytest.raises(OverloadedError):
+        verify_service.verify_phase_b("sess", ["wrong"], {"points": [], "metadata": {}})
+
+    assert session["phase_b"]["fail_count"] == 1
+    assert session["phase_b"]["correct_uuids"] == []
+
+    # 닫힌 문제에는 어떤 답(빈 답 포함)도 통과하지 않고, 실패 횟수 증가 없이 새 문제만 발급
+    monkeypatch.setattr(verify_service, "generate_phase_b_both",
+                        lambda fail_count: ({"fail_count": fail_count}, {"correct_uuids": ANSWER, "issued_at": 0}))
+    response = verify_service.verify_phase_b("sess", [], {"points": [], "metadata": {}})
+
+    assert response.error.code == ErrorCode.OVERLOADED
+    assert response.data == {"problem": {"fail_count": 1}}
+    assert session["phase_b"]["fail_count"] == 1
+    assert session["phase_b"]["correct_uuids"] == ANSWER